@@ -0,0 +1,91 @@
+"""
+Compara la compresión de las carpetas de ejemplo: un único 7z LZMA2 con los
+filtros por defecto de py7zr (comportamiento anterior) contra la selección de
+codec por tipo de archivo (comprimir_por_tipo).
+
+Uso:
+    PYTHONPATH=src python benchmarks/bench_compresor.py
+    PYTHONPATH=src python benchmarks/bench_compresor.py --carpetas documents/Carpetas --copias 10 --codec zstd
+"""
+import os
+import sys
+import time
+import shutil
+import argparse
+import tempfile
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+
+import py7zr
+from modules.compresor import comprimir_por_tipo
+
+def preparar_carpeta(origen, destino, copias):
+    """
+    Copia los archivos de la carpeta de ejemplo; con copias > 1 los replica con otro
+    nombre para simular un full set más grande.
+    """
+    os.makedirs(destino)
+    archivos = []
+    for n in range(copias):
+        for nombre in sorted(os.listdir(origen)):
+            base, extension = os.path.splitext(nombre)
+            copia = nombre if n == 0 else f'{base} ({n}){extension}'
+            shutil.copyfile(os.path.join(origen, nombre), os.path.join(destino, copia))
+            archivos.append(copia)
+    return archivos
+
+def comprimir_por_defecto(archivos, ruta_7z, ruta_base):
+    with py7zr.SevenZipFile(ruta_7z, 'w') as archive:
+        for archivo in archivos:
+            archive.write(os.path.join(ruta_base, archivo), archivo)
+
+def medir_carpeta(ruta, archivos, codec):
+    total = sum(os.path.getsize(os.path.join(ruta, archivo)) for archivo in archivos)
+
+    inicio = time.perf_counter()
+    comprimir_por_defecto(archivos, os.path.join(ruta, 'defecto.7z'), ruta)
+    tiempo_defecto = time.perf_counter() - inicio
+    tamaño_defecto = os.path.getsize(os.path.join(ruta, 'defecto.7z'))
+
+    inicio = time.perf_counter()
+    estadisticas = comprimir_por_tipo(archivos, os.path.join(ruta, 'por_tipo.7z'), ruta, codec)
+    tiempo_tipo = time.perf_counter() - inicio
+    tamaño_tipo = os.path.getsize(os.path.join(ruta, 'por_tipo.7z'))
+
+    with py7zr.SevenZipFile(os.path.join(ruta, 'por_tipo.7z')) as archive:
+        assert archive.testzip() is None
+        assert sorted(archive.getnames()) == sorted(archivos)
+    return total, (tiempo_defecto, tamaño_defecto), (tiempo_tipo, tamaño_tipo), estadisticas
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark de compresión por tipo de archivo.')
+    parser.add_argument('--carpetas', type=str, default='documents/Carpetas')
+    parser.add_argument('--copias', type=int, default=1, help='Réplicas de los archivos de cada carpeta')
+    parser.add_argument('--codec', type=str, default='lzma2', choices=['lzma2', 'zstd'])
+    parser.add_argument('--detalle', action='store_true', help='Muestra ratio y tiempo por archivo')
+    args = parser.parse_args()
+
+    acumulado = [0, 0.0, 0, 0.0, 0]
+    with tempfile.TemporaryDirectory() as temporal:
+        for indice, carpeta in enumerate(sorted(os.listdir(args.carpetas))):
+            origen = os.path.join(args.carpetas, carpeta)
+            if not os.path.isdir(origen):
+                continue
+            ruta = os.path.join(temporal, str(indice))
+            archivos = preparar_carpeta(origen, ruta, args.copias)
+            total, defecto, tipo, estadisticas = medir_carpeta(ruta, archivos, args.codec)
+            print(f"{carpeta[:60]:<60} {total / 1048576:7.2f} MB | defecto {defecto[0]:6.3f}s {defecto[1] / total:6.1%} | por tipo {tipo[0]:6.3f}s {tipo[1] / total:6.1%}")
+            if args.detalle:
+                for estadistica in estadisticas:
+                    print(f"    {estadistica['codec']:>5} {estadistica['ratio']:6.1%} {estadistica['segundos']:7.3f}s {estadistica['archivo']}")
+            for posicion, valor in enumerate((total, defecto[0], defecto[1], tipo[0], tipo[1])):
+                acumulado[posicion] += valor
+
+    total, tiempo_defecto, tamaño_defecto, tiempo_tipo, tamaño_tipo = acumulado
+    print(f"Total {total / 1048576:.2f} MB: defecto {tiempo_defecto:.3f}s ({tamaño_defecto / 1048576:.2f} MB), "
+          f"por tipo {tiempo_tipo:.3f}s ({tamaño_tipo / 1048576:.2f} MB)")
+    if tiempo_tipo:
+        print(f"Aceleración: {tiempo_defecto / tiempo_tipo:.2f}x")
+
+if __name__ == "__main__":
+    main()
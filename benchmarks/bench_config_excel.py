@@ -0,0 +1,90 @@
+"""
+Compara la carga del libro de configuración: ruta pandas (load_config) contra el
+lector selectivo en streaming (load_config_selectivo).
+
+Uso:
+    PYTHONPATH=src python benchmarks/bench_config_excel.py --recibidores 20000 --repeticiones 3
+    PYTHONPATH=src python benchmarks/bench_config_excel.py --plantilla test/Configuracion/Plantilla_de_Configuracion.xlsx
+"""
+import os
+import sys
+import time
+import argparse
+import tempfile
+import statistics
+from openpyxl import Workbook
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+
+from models.config_excel import load_config, load_config_selectivo
+
+CUERPO = 'Dear <br>\nPlease find attached The Following docs : <br>\n- Bill of Lading (SWB) <br>\n- Invoice<br>\nBest Regards!!</b><br>'
+
+def generar_libro(ruta, recibidores, distribuciones=50, hojas_extra=3, filas_extra=5000):
+    """
+    Genera un libro sintético con las cuatro hojas del bot y hojas adicionales que el bot no usa.
+    """
+    libro = Workbook(write_only=True)
+
+    hoja = libro.create_sheet('DISTRIBUCION CORREOS')
+    hoja.append(['CASOS EXPORTACION', 'PAIS', 'EMAILS PARA', 'EMAILS COPIA', 'ADJUNTOS', 'ASUNTO', 'CUERPO', 'EJEMPLOS', 'NOTAS'])
+    for i in range(1, distribuciones + 1):
+        hoja.append([f'CASO {i}', f'PAIS {i}', i, 'SANTA ELENA', 'FULL SET', 'NOMBRE DE CARPETA', CUERPO, f'OE2324{i:05d}', None])
+
+    hoja = libro.create_sheet('RECIBIDORES EMAILS')
+    hoja.append(['RECIBIDOR', 'DISTRIBUCION CORREOS', 'LISTA EMAILS'])
+    for i in range(recibidores):
+        hoja.append([f'RECIBIDOR {i}', i % distribuciones + 1, f'r{i}@example.com; r{i}.cc@example.com'])
+
+    hoja = libro.create_sheet('RESUMEN CC')
+    hoja.append(['TIPO', 'CC', 'LISTA EMAILS'])
+    hoja.append(['EXPORTADORA', 'SANTA ELENA ', 'cc@example.com'])
+
+    hoja = libro.create_sheet('EMAIL REPORTE')
+    hoja.append(['TIPO', 'LISTA EMAILS'])
+    hoja.append(['EMAIL REPORTES', 'reporte@example.com'])
+
+    for n in range(hojas_extra):
+        hoja = libro.create_sheet(f'HISTORICO {n}')
+        hoja.append([f'COL {c}' for c in range(12)])
+        for i in range(filas_extra):
+            hoja.append([f'valor {i}-{c}' for c in range(12)])
+
+    libro.save(ruta)
+
+def medir(funcion, ruta, repeticiones):
+    tiempos = []
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        modelo = funcion(ruta)
+        tiempos.append(time.perf_counter() - inicio)
+    return tiempos, modelo
+
+def comparar(ruta, repeticiones):
+    resultados = {}
+    for nombre, funcion in [('pandas', load_config), ('selectivo', load_config_selectivo)]:
+        tiempos, modelo = medir(funcion, ruta, repeticiones)
+        resultados[nombre] = statistics.median(tiempos)
+        print(f"{nombre:>10}: mediana {resultados[nombre] * 1000:9.1f} ms  (min {min(tiempos) * 1000:.1f} ms) - {len(modelo.recibidores_emails)} recibidores")
+    print(f"Aceleración: {resultados['pandas'] / resultados['selectivo']:.2f}x")
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark de carga del Excel de configuración.')
+    parser.add_argument('--recibidores', type=int, default=20000)
+    parser.add_argument('--hojas-extra', type=int, default=3)
+    parser.add_argument('--repeticiones', type=int, default=3)
+    parser.add_argument('--plantilla', type=str, help='Mide además un libro existente')
+    args = parser.parse_args()
+
+    if args.plantilla:
+        print(f"Libro existente: {args.plantilla}")
+        comparar(args.plantilla, args.repeticiones)
+
+    with tempfile.TemporaryDirectory() as carpeta:
+        ruta = os.path.join(carpeta, 'Plantilla_de_Configuracion.xlsx')
+        generar_libro(ruta, args.recibidores, hojas_extra=args.hojas_extra)
+        print(f"Libro sintético: {args.recibidores} recibidores, {args.hojas_extra} hojas extra, {os.path.getsize(ruta) / (1024 * 1024):.2f} MB")
+        comparar(ruta, args.repeticiones)
+
+if __name__ == "__main__":
+    main()
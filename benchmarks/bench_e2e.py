@@ -0,0 +1,199 @@
+"""
+Benchmark de punta a punta: genera N carpetas de Full Set sintéticas y un libro de
+configuración que las reconoce, y corre main.ejecutar() contra un sumidero SMTP y
+la API local de Gmail/Drive (benchmarks/servidores.py), sin tocar la red.
+
+Informa carpetas/s, MB/s, RSS máximo (proceso y procesos hijos) y los percentiles
+por etapa que registra modules.metricas.
+
+Uso:
+    PYTHONPATH=src python benchmarks/bench_e2e.py
+    PYTHONPATH=src python benchmarks/bench_e2e.py --carpetas 50 --archivos 6 --kb 2048 --transporte smtp
+    PYTHONPATH=src python benchmarks/bench_e2e.py --carpetas 20 --kb 20000 --sin-cuota --json resultado.json
+    PYTHONPATH=src python benchmarks/bench_e2e.py --latencia 0.05 --error-429 0.05 --error-500 0.02
+"""
+import os
+import sys
+import json
+import time
+import random
+import argparse
+import tempfile
+import threading
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(RAIZ, 'src'))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import yaml
+from bench_config_excel import generar_libro
+from servidores import SumideroSMTP, ApiLocal, iniciar
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+NAVES = ['MSC CASSANDRE', 'MAERSK BULAN', 'MSC YASHI B', 'MSC BIANCA', 'CMA CGM TAGE', 'HAPAG LIMA']
+TOKEN_FALSO = {
+    'token': 'benchmark', 'refresh_token': 'benchmark', 'client_id': 'benchmark', 'client_secret': 'benchmark',
+    'token_uri': 'https://oauth2.googleapis.com/token', 'expiry': '2099-01-01T00:00:00Z'
+}
+
+def nombre_carpeta(numero, recibidor):
+    orden = f'OE2324{numero:05d}'
+    return f'FULL SET OF DOCS {orden} - {NAVES[numero % len(NAVES)]} - {recibidor} (ETA {1 + numero % 28:02d}-{1 + numero % 12:02d}-2025)'
+
+def generar_carpetas(ruta, carpetas, archivos, kb, recibidores, semilla=0):
+    """
+    Crea las carpetas con un PDF de Full Set (contenido aleatorio, no comprimible)
+    y packing lists (texto repetitivo) por carpeta; los tamaños varían ±50 % en torno a `kb`.
+
+    Returns:
+        int: Bytes generados.
+    """
+    azar = random.Random(semilla)
+    total = 0
+    for numero in range(carpetas):
+        carpeta = os.path.join(ruta, nombre_carpeta(numero, f'RECIBIDOR {numero % recibidores}'))
+        os.makedirs(carpeta)
+        for indice in range(archivos):
+            tamaño = int(kb * 1024 * azar.uniform(0.5, 1.5))
+            if indice == 0:
+                nombre, contenido = f'FULL SET OE2324{numero:05d}.pdf', os.urandom(tamaño)
+            else:
+                nombre, contenido = f'PACKING LIST {indice} - OE2324{numero:05d}.xls', (b'PACKING LIST;CAJAS;KILOS\n' * (tamaño // 25 + 1))[:tamaño]
+            with open(os.path.join(carpeta, nombre), 'wb') as archivo:
+                archivo.write(contenido)
+            total += tamaño
+    return total
+
+def escribir_configuracion(base, args, smtp, api):
+    """
+    Configuración YAML del benchmark: la del repositorio con las rutas en `base` y
+    los transportes apuntando a los servidores locales.
+    """
+    with open(os.path.join(RAIZ, 'src', 'configuration', 'configuracion.yaml'), 'r', encoding='utf-8') as archivo:
+        datos = yaml.safe_load(archivo)
+    local = datos['path']['local']
+    local.update(main=base, source=os.path.join(RAIZ, 'src'), config=base, templates=os.path.join(RAIZ, 'src', 'templates'))
+    datos['path']['shared']['main'] = os.path.join(base, 'shared')
+    correo = datos['mail']['config']
+    correo['transport'] = args.transporte
+    correo['smtp'].update(server='127.0.0.1', port=smtp.server_address[1], starttls=False, pool_size=max(1, args.envios))
+    correo['api'].update(root_url=api.root_url, token=os.path.join(base, 'token.json'), credentials=os.path.join(base, 'credentials.json'))
+    if args.sin_cuota:
+        correo['limits'].update(quota_units_per_second=0, recipients_per_day=0)
+    datos['pipeline'].update(send_workers=args.envios, workers=args.procesos)
+    datos['metrics'] = {'summary': True, 'prometheus': False}
+    ruta = os.path.join(base, 'configuracion.yaml')
+    with open(ruta, 'w', encoding='utf-8') as archivo:
+        yaml.safe_dump(datos, archivo, allow_unicode=True)
+    with open(os.path.join(base, 'token.json'), 'w', encoding='utf-8') as archivo:
+        json.dump(TOKEN_FALSO, archivo)
+    return ruta
+
+class MedidorMemoria:
+    """
+    Muestrea el RSS del proceso y sus hijos (pool de procesos) en un hilo de fondo.
+    """
+
+    def __init__(self, intervalo=0.05):
+        self.intervalo = intervalo
+        self.maximo = 0
+        self.detener = threading.Event()
+        self.hilo = threading.Thread(target=self._muestrear, daemon=True)
+
+    def _muestrear(self):
+        proceso = psutil.Process()
+        while not self.detener.is_set():
+            try:
+                rss = proceso.memory_info().rss + sum(hijo.memory_info().rss for hijo in proceso.children(recursive=True))
+            except psutil.Error:
+                rss = 0
+            self.maximo = max(self.maximo, rss)
+            self.detener.wait(self.intervalo)
+
+    def __enter__(self):
+        if psutil is not None:
+            self.hilo.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.detener.set()
+        if psutil is not None:
+            self.hilo.join()
+        else:
+            import resource
+            self.maximo = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark de punta a punta con servidores de correo locales.')
+    parser.add_argument('--carpetas', type=int, default=20)
+    parser.add_argument('--archivos', type=int, default=4, help='Archivos por carpeta')
+    parser.add_argument('--kb', type=int, default=512, help='Tamaño medio de cada archivo, en KB')
+    parser.add_argument('--recibidores', type=int, default=50, help='Recibidores en el libro de configuración')
+    parser.add_argument('--transporte', type=str, default='api', choices=['api', 'smtp'])
+    parser.add_argument('--envios', type=int, default=2, help='Envíos simultáneos (pipeline.send_workers)')
+    parser.add_argument('--procesos', type=int, default=0, help='Pool de procesos (pipeline.workers)')
+    parser.add_argument('--latencia', type=float, default=0.0, help='Latencia por solicitud de la API local, en segundos')
+    parser.add_argument('--error-429', type=float, default=0.0, help='Probabilidad de 429 en la API local')
+    parser.add_argument('--error-500', type=float, default=0.0, help='Probabilidad de 500 en la API local')
+    parser.add_argument('--sin-cuota', action='store_true', help='Desactiva el limitador de cuota (mail.config.limits)')
+    parser.add_argument('--json', type=str, default=None, help='Guarda el resultado en este archivo')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(prefix='bench_e2e_') as base:
+        compartida = os.path.join(base, 'shared')
+        os.makedirs(os.path.join(compartida, 'Configuracion'))
+        generar_libro(os.path.join(compartida, 'Configuracion', 'Plantilla_de_Configuracion.xlsx'), args.recibidores, hojas_extra=0)
+        total = generar_carpetas(compartida, args.carpetas, args.archivos, args.kb, args.recibidores)
+
+        smtp = iniciar(SumideroSMTP())
+        api = iniciar(ApiLocal(latencia=args.latencia, error_429=args.error_429, error_500=args.error_500, retry_after=0.5, semilla=0))
+        ruta_configuracion = escribir_configuracion(base, args, smtp, api)
+
+        sys.argv = sys.argv[:1]  # main.argumentos() no debe ver los argumentos del benchmark
+        import main as bot
+        from modules.metricas import iniciar_metricas, metricas
+        bot.LOG_DIR = os.path.join(base, 'logs')
+        iniciar_metricas()
+        bot.cargar_configuracion(ruta_configuracion)
+
+        with MedidorMemoria() as memoria:
+            inicio = time.perf_counter()
+            bot.ejecutar()
+            segundos = time.perf_counter() - inicio
+        resumen = metricas().resumen()
+        smtp.shutdown()
+        api.shutdown()
+
+    recibidos = (smtp if args.transporte == 'smtp' else api).contadores.to_dict()
+    resultado = {
+        'carpetas': args.carpetas,
+        'mb': round(total / 1048576, 2),
+        'segundos': round(segundos, 3),
+        'carpetas_por_segundo': round(args.carpetas / segundos, 3),
+        'mb_por_segundo': round(total / 1048576 / segundos, 3),
+        'rss_maximo_mb': round(memoria.maximo / 1048576, 1),
+        'recibidos': recibidos,
+        'errores_inyectados': api.estadisticas()['errores'],
+        'etapas': resumen['etapas'],
+        'contadores': resumen['contadores']
+    }
+
+    print(f"\n{args.carpetas} carpetas, {resultado['mb']} MB por {args.transporte}: {segundos:.2f}s "
+          f"({resultado['carpetas_por_segundo']} carpetas/s, {resultado['mb_por_segundo']} MB/s), RSS máximo {resultado['rss_maximo_mb']} MB")
+    print(f"Recibidos por el servidor local: {recibidos['mensajes']} mensajes, {recibidos['bytes'] / 1048576:.2f} MB")
+    contadores = resumen['contadores']
+    print(f"Espera por cuota: {contadores.get('espera_cuota', 0):.2f}s, reintentos: {contadores.get('reintentos', 0)} "
+          f"({contadores.get('espera_reintentos', 0):.2f}s), errores inyectados: {resultado['errores_inyectados']}")
+    print(f"{'etapa':<18} {'n':>5} {'total':>9} {'p50':>8} {'p95':>8} {'max':>8}")
+    for etapa, datos in resumen['etapas'].items():
+        print(f"{etapa:<18} {datos['cantidad']:>5} {datos['total']:>9.3f} {datos['p50']:>8.3f} {datos['p95']:>8.3f} {datos['max']:>8.3f}")
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as archivo:
+            json.dump(resultado, archivo, ensure_ascii=False, indent=2)
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
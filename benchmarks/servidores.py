@@ -0,0 +1,380 @@
+"""
+Servidores locales para benchmarks y pruebas de carga, sin acceso a la red:
+
+- SumideroSMTP: acepta y descarta los mensajes (EHLO, AUTH PLAIN, DATA, sin TLS).
+- ApiLocal: reemplazo de las APIs de Google que usa el bot, con latencia
+  configurable, inyección de errores 429/500 y límites de tamaño.
+    Gmail v1: messages.send con cuerpo 'raw', carga simple y carga reanudable.
+    Drive v3: files.create (carga reanudable y simple), files.get, files.list y
+    permissions.create, también dentro de lotes HTTP (/batch/drive/v3).
+
+El bot se apunta a ApiLocal con mail.config.api.root_url (y un token de prueba en
+api.token). Los contenidos no se guardan: solo se cuentan y, en Drive, se calcula
+su MD5, así la memoria del servidor no crece con lo que recibe.
+
+Uso independiente:
+    python benchmarks/servidores.py --puerto 8765 --smtp 2525 --latencia 0.05 --error-429 0.02 --error-500 0.01
+"""
+import re
+import json
+import time
+import random
+import hashlib
+import argparse
+import threading
+import socketserver
+from email.parser import BytesParser
+from email import policy
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+
+class Contadores:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.mensajes = 0
+        self.destinatarios = 0
+        self.bytes = 0
+
+    def sumar(self, mensajes=0, destinatarios=0, bytes=0):
+        with self.lock:
+            self.mensajes += mensajes
+            self.destinatarios += destinatarios
+            self.bytes += bytes
+
+    def to_dict(self):
+        with self.lock:
+            return {'mensajes': self.mensajes, 'destinatarios': self.destinatarios, 'bytes': self.bytes}
+
+class ManejadorSMTP(socketserver.StreamRequestHandler):
+    """
+    Sesión SMTP mínima: EHLO, AUTH PLAIN, MAIL, RCPT, DATA, RSET, NOOP y QUIT, sin TLS.
+    """
+
+    def responder(self, *lineas):
+        self.wfile.write(''.join(f'{linea}\r\n' for linea in lineas).encode('ascii'))
+
+    def recibir_datos(self):
+        tamaño = 0
+        while True:
+            linea = self.rfile.readline()
+            if not linea or linea == b'.\r\n':
+                return tamaño
+            tamaño += len(linea)
+
+    def handle(self):
+        contadores = self.server.contadores
+        destinatarios = 0
+        self.responder('220 sumidero ESMTP')
+        while True:
+            linea = self.rfile.readline()
+            if not linea:
+                return
+            verbo = linea[:4].decode('ascii', 'replace').upper()
+            if verbo == 'EHLO':
+                self.responder('250-sumidero', '250-AUTH PLAIN', '250-8BITMIME', '250 SIZE 0')
+            elif verbo == 'AUTH':
+                self.responder('235 2.7.0 Authentication successful')
+            elif verbo == 'MAIL':
+                destinatarios = 0
+                self.responder('250 OK')
+            elif verbo == 'RCPT':
+                destinatarios += 1
+                self.responder('250 OK')
+            elif verbo == 'DATA':
+                self.responder('354 End data with <CR><LF>.<CR><LF>')
+                tamaño = self.recibir_datos()
+                contadores.sumar(1, destinatarios, tamaño)
+                self.responder('250 OK queued')
+            elif verbo in ('HELO', 'RSET', 'NOOP'):
+                self.responder('250 OK')
+            elif verbo == 'QUIT':
+                self.responder('221 Bye')
+                return
+            else:
+                self.responder('502 Command not implemented')
+
+class SumideroSMTP(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, puerto=0):
+        super().__init__(('127.0.0.1', puerto), ManejadorSMTP)
+        self.contadores = Contadores()
+
+def error_google(codigo, mensaje, razon):
+    return {'error': {'code': codigo, 'message': mensaje, 'errors': [{'message': mensaje, 'domain': 'global', 'reason': razon}]}}
+
+def partes_multipart(tipo, cuerpo):
+    """
+    Separa un cuerpo multipart (carga simple o lote HTTP) en sus partes.
+    """
+    mensaje = BytesParser(policy=policy.HTTP).parsebytes(f'Content-Type: {tipo}\r\n\r\n'.encode() + cuerpo)
+    return list(mensaje.iter_parts())
+
+class ManejadorApi(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def log_message(self, *args):
+        pass
+
+    def leer_cuerpo(self):
+        return self.rfile.read(int(self.headers.get('Content-Length', 0)))
+
+    def responder(self, estado, cuerpo=None, cabeceras=None, tipo='application/json'):
+        if isinstance(cuerpo, (dict, list)):
+            cuerpo = json.dumps(cuerpo).encode()
+        cuerpo = cuerpo or b''
+        self.send_response(estado)
+        for clave, valor in (cabeceras or {}).items():
+            self.send_header(clave, valor)
+        if cuerpo:
+            self.send_header('Content-Type', tipo)
+        self.send_header('Content-Length', str(len(cuerpo)))
+        self.end_headers()
+        self.wfile.write(cuerpo)
+
+    def responder_resultado(self, resultado):
+        self.responder(*resultado)
+
+    def _atender(self, metodo):
+        url = urlparse(self.path)
+        cuerpo = self.leer_cuerpo()
+        self.server.esperar()
+        inyectado = self.server.inyectar()
+        if inyectado is not None and not url.path.startswith('/batch'):
+            self.responder_resultado(inyectado)
+            return
+        self.responder_resultado(self.server.despachar(metodo, url, self.headers, cuerpo))
+
+    def do_POST(self):
+        self._atender('POST')
+
+    def do_PUT(self):
+        self._atender('PUT')
+
+    def do_GET(self):
+        self._atender('GET')
+
+class ApiLocal(ThreadingHTTPServer):
+    """
+    Reemplazo local de Gmail v1 y Drive v3 para medir el transporte de la API.
+
+    Args:
+        puerto (int): Puerto TCP (0 = uno libre).
+        latencia (float): Segundos de latencia por solicitud (con ±50 % de variación).
+        error_429 (float): Probabilidad de responder 429 con Retry-After.
+        error_500 (float): Probabilidad de responder 500.
+        retry_after (float): Segundos indicados en la cabecera Retry-After de los 429.
+        limite_gmail_mb (float): Tamaño máximo de un mensaje de Gmail (413 si se excede).
+        limite_drive_mb (float): Tamaño máximo de un archivo de Drive (413 si se excede).
+        semilla (int): Semilla de la latencia y los errores inyectados.
+    """
+    daemon_threads = True
+
+    def __init__(self, puerto=0, latencia=0.0, error_429=0.0, error_500=0.0, retry_after=1, limite_gmail_mb=35, limite_drive_mb=5 * 1024, semilla=None):
+        super().__init__(('127.0.0.1', puerto), ManejadorApi)
+        self.latencia = latencia
+        self.error_429 = error_429
+        self.error_500 = error_500
+        self.retry_after = retry_after
+        self.limite_gmail = int(limite_gmail_mb * 1024 * 1024)
+        self.limite_drive = int(limite_drive_mb * 1024 * 1024)
+        self.azar = random.Random(semilla)
+        self.lock = threading.Lock()
+        self.contadores = Contadores()  # mensajes enviados por Gmail
+        self.drive = Contadores()       # archivos creados en Drive
+        self.permisos = 0
+        self.inyectados = {429: 0, 500: 0, 413: 0}
+        self.sesiones = {}
+        self.archivos = {}
+        self.ultimo_id = 0
+
+    @property
+    def root_url(self):
+        host, puerto = self.server_address[:2]
+        return f'http://{host}:{puerto}/'
+
+    def nuevo_id(self):
+        with self.lock:
+            self.ultimo_id += 1
+            return f'{self.ultimo_id:016x}'
+
+    def esperar(self):
+        if self.latencia > 0:
+            with self.lock:
+                espera = self.latencia * self.azar.uniform(0.5, 1.5)
+            time.sleep(espera)
+
+    def inyectar(self):
+        """
+        Error inyectado para esta solicitud, o None.
+        """
+        with self.lock:
+            sorteo = self.azar.random()
+            if sorteo < self.error_429:
+                self.inyectados[429] += 1
+                return 429, error_google(429, 'Rate Limit Exceeded', 'rateLimitExceeded'), {'Retry-After': str(self.retry_after)}
+            if sorteo < self.error_429 + self.error_500:
+                self.inyectados[500] += 1
+                return 500, error_google(500, 'Backend Error', 'backendError')
+        return None
+
+    def excedido(self, tamaño, limite):
+        if tamaño <= limite:
+            return None
+        with self.lock:
+            self.inyectados[413] += 1
+        return 413, error_google(413, f'Request too large: {tamaño} bytes (límite {limite})', 'uploadTooLarge')
+
+    def estadisticas(self):
+        with self.lock:
+            return {'gmail': self.contadores.to_dict(), 'drive': self.drive.to_dict(), 'permisos': self.permisos, 'errores': dict(self.inyectados)}
+
+    def despachar(self, metodo, url, cabeceras, cuerpo):
+        """
+        Atiende una solicitud y devuelve (estado, cuerpo[, cabeceras[, tipo]]).
+        """
+        ruta = url.path
+        consulta = parse_qs(url.query)
+        tipo_carga = consulta.get('uploadType', [''])[0]
+        if metodo == 'PUT' and 'upload_id' in consulta:
+            return self.continuar_sesion(consulta['upload_id'][0], cabeceras, cuerpo)
+        if metodo == 'POST' and re.fullmatch(r'/gmail/v1/users/[^/]+/messages/send', ruta):
+            raw = json.loads(cuerpo or b'{}').get('raw', '')
+            return self.excedido(len(raw) * 3 // 4, self.limite_gmail) or self.enviado(len(raw) * 3 // 4)
+        if metodo == 'POST' and re.fullmatch(r'/upload/(gmail/v1/users/[^/]+/messages/send|drive/v3/files)', ruta):
+            servicio = 'gmail' if ruta.startswith('/upload/gmail') else 'drive'
+            if tipo_carga == 'resumable':
+                return self.iniciar_sesion(servicio, ruta, cabeceras, cuerpo)
+            metadatos, contenido = {}, cuerpo
+            if tipo_carga == 'multipart':
+                partes = partes_multipart(cabeceras.get('Content-Type', ''), cuerpo)
+                metadatos, contenido = json.loads(partes[0].get_content() or '{}'), partes[-1].get_payload(decode=True) or b''
+            if servicio == 'gmail':
+                return self.excedido(len(contenido), self.limite_gmail) or self.enviado(len(contenido))
+            return self.excedido(len(contenido), self.limite_drive) or self.crear_archivo(metadatos.get('name'), hashlib.md5(contenido), len(contenido))
+        if metodo == 'POST' and ruta.startswith('/batch'):
+            return self.lote(cabeceras.get('Content-Type', ''), cuerpo)
+        if metodo == 'POST' and re.fullmatch(r'/drive/v3/files/[^/]+/permissions', ruta):
+            return self.compartir(ruta.split('/')[4])
+        if metodo == 'GET' and re.fullmatch(r'/drive/v3/files/[^/]+', ruta):
+            archivo = self.archivos.get(ruta.split('/')[4])
+            if archivo is None:
+                return 404, error_google(404, 'File not found', 'notFound')
+            return 200, archivo
+        if metodo == 'GET' and ruta == '/drive/v3/files':
+            nombre = re.search(r"name = '((?:[^'\\]|\\.)*)'", consulta.get('q', [''])[0])
+            nombre = nombre.group(1).replace("\\'", "'").replace('\\\\', '\\') if nombre else None
+            with self.lock:
+                archivos = [archivo for archivo in self.archivos.values() if nombre is None or archivo['name'] == nombre]
+            return 200, {'files': archivos}
+        return 404, error_google(404, f'No encontrado: {metodo} {ruta}', 'notFound')
+
+    def enviado(self, tamaño):
+        self.contadores.sumar(1, 0, tamaño)
+        identificador = self.nuevo_id()
+        return 200, {'id': identificador, 'threadId': identificador, 'labelIds': ['SENT']}
+
+    def crear_archivo(self, nombre, md5, tamaño):
+        identificador = self.nuevo_id()
+        archivo = {'id': identificador, 'name': nombre or identificador, 'md5Checksum': md5.hexdigest(), 'size': str(tamaño), 'trashed': False}
+        with self.lock:
+            self.archivos[identificador] = archivo
+        self.drive.sumar(1, 0, tamaño)
+        return 200, archivo
+
+    def compartir(self, identificador):
+        if identificador not in self.archivos:
+            return 404, error_google(404, 'File not found', 'notFound')
+        with self.lock:
+            self.permisos += 1
+        return 200, {'kind': 'drive#permission', 'id': 'anyoneWithLink', 'type': 'anyone', 'role': 'reader'}
+
+    def iniciar_sesion(self, servicio, ruta, cabeceras, cuerpo):
+        declarado = int(cabeceras.get('X-Upload-Content-Length', 0) or 0)
+        limite = self.limite_gmail if servicio == 'gmail' else self.limite_drive
+        excedido = self.excedido(declarado, limite)
+        if excedido:
+            return excedido
+        metadatos = json.loads(cuerpo or b'{}')
+        sesion = self.nuevo_id()
+        with self.lock:
+            self.sesiones[sesion] = {'servicio': servicio, 'nombre': metadatos.get('name'), 'recibido': 0, 'md5': hashlib.md5(), 'limite': limite}
+        return 200, None, {'Location': f'{self.root_url.rstrip("/")}{ruta}?uploadType=resumable&upload_id={sesion}'}
+
+    def continuar_sesion(self, identificador, cabeceras, cuerpo):
+        with self.lock:
+            sesion = self.sesiones.get(identificador)
+        if sesion is None:
+            return 404, error_google(404, 'Upload session not found', 'notFound')
+        rango = re.match(r'bytes (?:(\d+)-\d+|\*)/(\d+|\*)', cabeceras.get('Content-Range', ''))
+        if rango and rango.group(1) is not None:
+            if int(rango.group(1)) != sesion['recibido']:
+                return 400, error_google(400, 'Invalid Content-Range offset', 'badContent')
+            sesion['recibido'] += len(cuerpo)
+            sesion['md5'].update(cuerpo)
+        excedido = self.excedido(sesion['recibido'], sesion['limite'])
+        if excedido:
+            with self.lock:
+                self.sesiones.pop(identificador, None)
+            return excedido
+        total = rango.group(2) if rango else '*'
+        if total == '*' or sesion['recibido'] < int(total):
+            return 308, None, {'Range': f"bytes=0-{sesion['recibido'] - 1}"} if sesion['recibido'] else {}
+        with self.lock:
+            self.sesiones.pop(identificador, None)
+        if sesion['servicio'] == 'gmail':
+            return self.enviado(sesion['recibido'])
+        return self.crear_archivo(sesion['nombre'], sesion['md5'], sesion['recibido'])
+
+    def lote(self, tipo, cuerpo):
+        """
+        Lote HTTP: cada parte es una solicitud completa; los errores se inyectan por parte, como en Google.
+        """
+        separador = 'lote_api_local'
+        salida = []
+        for parte in partes_multipart(tipo, cuerpo):
+            solicitud = (parte.get_payload(decode=True) or b'').replace(b'\r\n', b'\n')
+            cabecera, _, contenido = solicitud.partition(b'\n\n')
+            metodo, ruta = cabecera.split(b'\n')[0].decode().split(' ')[:2]
+            resultado = self.inyectar() or self.despachar(metodo, urlparse(ruta), {}, contenido)
+            datos = json.dumps(resultado[1]) if resultado[1] is not None else ''
+            salida.append(f"--{separador}\r\nContent-Type: application/http\r\nContent-ID: <response-{parte['Content-ID'].strip('<>')}>\r\n\r\n"
+                          f"HTTP/1.1 {resultado[0]} OK\r\nContent-Type: application/json\r\nContent-Length: {len(datos)}\r\n\r\n{datos}\r\n")
+        salida.append(f'--{separador}--')
+        return 200, ''.join(salida).encode(), None, f'multipart/mixed; boundary={separador}'
+
+def iniciar(servidor):
+    """
+    Atiende el servidor en un hilo de fondo y lo devuelve.
+    """
+    threading.Thread(target=servidor.serve_forever, daemon=True).start()
+    return servidor
+
+def main():
+    parser = argparse.ArgumentParser(description='Servidores locales de Gmail/Drive y SMTP para pruebas de carga.')
+    parser.add_argument('--puerto', type=int, default=8765, help='Puerto de la API local')
+    parser.add_argument('--smtp', type=int, default=0, help='Puerto del sumidero SMTP (0 = no se inicia)')
+    parser.add_argument('--latencia', type=float, default=0.0, help='Segundos de latencia por solicitud')
+    parser.add_argument('--error-429', type=float, default=0.0, help='Probabilidad de responder 429')
+    parser.add_argument('--error-500', type=float, default=0.0, help='Probabilidad de responder 500')
+    parser.add_argument('--retry-after', type=float, default=1, help='Segundos indicados en Retry-After')
+    parser.add_argument('--limite-gmail-mb', type=float, default=35)
+    parser.add_argument('--limite-drive-mb', type=float, default=5 * 1024)
+    args = parser.parse_args()
+
+    api = iniciar(ApiLocal(args.puerto, args.latencia, args.error_429, args.error_500, args.retry_after, args.limite_gmail_mb, args.limite_drive_mb))
+    print(f"API local en {api.root_url} (mail.config.api.root_url)")
+    smtp = None
+    if args.smtp:
+        smtp = iniciar(SumideroSMTP(args.smtp))
+        print(f"Sumidero SMTP en 127.0.0.1:{args.smtp} (mail.config.smtp, starttls: false)")
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        pass
+    print(json.dumps({'api': api.estadisticas(), 'smtp': smtp.contadores.to_dict() if smtp else None}, indent=2))
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -1,54 +1,132 @@
 import logging
+import argparse
 from modules.configuracion import Configuracion as Configuracion_Yaml
-from modules.extraer_excel import Configuracion as Configuracion_Excel
-from modules.buscar_carpeta import buscar_carpeta
-from modules.mover_carpeta import eliminar_carpetas, mover, mover_todo
-from modules.listar_archivos import listar_archivos
-from modules.estructurar_registro import estructurar
-from modules.email_sender import enviar_reciver, enviar_informe, enviar_vacio
-from modules.informe import genera_informe
-from modules.compresor import validar_archivos
+from modules.buscar_carpeta import carpetas_pendientes
+from modules.metricas import iniciar_metricas, metricas, medir, sumar
 from datetime import datetime
 from time import sleep
 from pprint import pp
 import os
 
-# Configuración del registro de log
-log_dir = "logs"
-if not os.path.exists(log_dir):
-    os.makedirs(log_dir)
+# Los módulos de cada etapa (pandas, py7zr, clientes de Google) se importan
+# dentro de las funciones que los usan, para que una ejecución sin carpetas
+# no pague su costo de importación.
 
-log_filename = os.path.join(log_dir, f"execution_{datetime.now().strftime('%Y-%m-%d_%H-%M-%S')}.log")
-logging.basicConfig(filename=log_filename, level=print, format='%(asctime)s - %(levelname)s - %(message)s')
+ARGUMENTOS    = None
+CONFIG_GLOBAL = None
+CONFIG_EXCEL  = None
+BITACORA      = None
+LOG_DIR       = "logs"
 
-CONFIG_GLOBAL = Configuracion_Yaml('src/configuration/configuracion.yaml')
-CONFIG_EXCEL  = Configuracion_Excel(CONFIG_GLOBAL.config.path.shared.config)
+def configurar_log():
+    # Configuración del registro de log
+    if not os.path.exists(LOG_DIR):
+        os.makedirs(LOG_DIR)
 
-def mover_carpetas_enproceso(ruta):
+    log_filename = os.path.join(LOG_DIR, f"execution_{datetime.now().strftime('%Y-%m-%d_%H-%M-%S')}.log")
+    logging.basicConfig(filename=log_filename, level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+def escribir_metricas():
+    """
+    Escribe el resumen de métricas de la ejecución junto a los logs (JSON y,
+    si está habilitado, el textfile de Prometheus).
+    """
+    configuracion = CONFIG_GLOBAL.config.metrics
+    try:
+        if configuracion.summary:
+            print(f"Métricas de la ejecución: {metricas().escribir_json(LOG_DIR)}")
+        if configuracion.prometheus:
+            metricas().escribir_prometheus(LOG_DIR)
+    except OSError as e:
+        logging.error(f"No se pudieron escribir las métricas: {e}")
+
+def argumentos():
+    parser = argparse.ArgumentParser(description='Envío de Full Set a Recibidores.')
+    parser.add_argument('--refrescar-config', action='store_true', help='Ignora el snapshot local y vuelve a leer el Excel de configuración')
+    parser.add_argument('--limpiar-cache', action='store_true', help='Vacía la cache de comprimidos y digestos, y termina')
+    parser.add_argument('--daemon', action='store_true', help='Queda vigilando la carpeta compartida y procesa cada Full Set apenas termina de llegar')
+    return parser.parse_known_args()[0]
+
+def cargar_configuracion(archivo='src/configuration/configuracion.yaml'):
+    global ARGUMENTOS, CONFIG_GLOBAL
+    ARGUMENTOS = ARGUMENTOS or argumentos()
+    CONFIG_GLOBAL = Configuracion_Yaml(archivo)
+    return CONFIG_GLOBAL
+
+def config_excel():
+    """
+    Devuelve la configuración Excel, cargándola en el primer uso.
+    """
+    global CONFIG_EXCEL
+    if CONFIG_EXCEL is None:
+        from modules.extraer_excel import Configuracion as Configuracion_Excel
+        refrescar = ARGUMENTOS.refrescar_config if ARGUMENTOS else False
+        with medir('configuracion'):
+            CONFIG_EXCEL = Configuracion_Excel(CONFIG_GLOBAL.config.path.shared.config, CONFIG_GLOBAL.config.path.local.cache, refrescar)
+    return CONFIG_EXCEL
+
+def bitacora():
+    """
+    Devuelve la bitácora de envíos, abriéndola en el primer uso.
+    """
+    global BITACORA
+    if BITACORA is None:
+        from modules.bitacora import Bitacora
+        BITACORA = Bitacora(CONFIG_GLOBAL.config.path.local.ledger)
+    return BITACORA
+
+def ruta_cache_archivos():
+    cache = CONFIG_GLOBAL.config.path.local.cache
+    return f"{cache}/archivos" if cache else None
+
+def limpiar_cache():
+    from modules.cache_archivos import CacheContenido
+    ruta = ruta_cache_archivos()
+    if not ruta:
+        print("No hay una carpeta de cache configurada.")
+        return
+    with CacheContenido(ruta, CONFIG_GLOBAL.config.cache.max_mb) as cache:
+        liberado = cache.limpiar()
+    print(f"Cache vaciada: {liberado / (1024 * 1024):.2f} MB liberados.")
+
+def mover_carpetas_enproceso(ruta, lista_carpetas=None):
+    from modules.mover_carpeta import mover
+    from modules.listar_archivos import recorrer_carpetas
     print(f"Iniciando el proceso de mover carpetas en la ruta: {ruta}")
-    archivos = None
     carpetas = None
-    lista_carpetas = buscar_carpeta(ruta)
-    if 'Configuracion' in lista_carpetas:
-        lista_carpetas.remove('Configuracion')
-    if 'En Proceso' in lista_carpetas:
-        lista_carpetas.remove('En Proceso')
-    if 'Listo' in lista_carpetas:
-        lista_carpetas.remove('Listo')
+    en_proceso = f'{ruta}/En Proceso'
+    if lista_carpetas is None:
+        lista_carpetas = carpetas_pendientes(ruta)
     print(f"Carpetas encontradas: {lista_carpetas}")
-    if len(lista_carpetas) > 0:
+    # Lo que quedó en En Proceso de una ejecución interrumpida se retoma, no se elimina
+    restos = carpetas_pendientes(en_proceso) if os.path.isdir(en_proceso) else []
+    if len(restos) > 0:
+        print(f"Carpetas de una ejecución anterior que se retoman: {restos}")
+    nuevas = [carpeta for carpeta in lista_carpetas if carpeta not in restos]
+    if len(nuevas) < len(lista_carpetas):
+        logging.warning(f"Carpetas con el mismo nombre que una en proceso, quedan para la próxima ejecución: {sorted(set(lista_carpetas) - set(nuevas))}")
+    if len(nuevas) > 0:
         print("Se encontraron carpetas en la ruta.")
-        eliminar_carpetas(ruta)
-        mover_carpetas = mover(ruta, lista_carpetas)
-        if mover_carpetas:
+        for carpeta in nuevas:
+            bitacora().reclamar(carpeta)
+        with medir('mover'):
+            movidas = mover(ruta, nuevas, CONFIG_GLOBAL.config.pipeline.move_workers)
+        if movidas:
             print("Carpetas movidas correctamente.")
-            carpetas = listar_archivos(f'{ruta}/En Proceso')
         else:
             logging.error("Error al mover las carpetas.")
+    if len(nuevas) > 0 or len(restos) > 0:
+        # Un solo recorrido: los tamaños y mtimes acompañan a cada carpeta durante toda la ejecución
+        with medir('escaneo'):
+            carpetas = recorrer_carpetas(en_proceso)
     if carpetas == None or len(carpetas) == 0:
         registros = None
     else:
-        registros = {'ruta': {'raiz': ruta, 'en_proceso': f'{ruta}/En Proceso'}, 'carpetas': carpetas}
+        registros = {
+            'ruta': {'raiz': ruta, 'en_proceso': en_proceso},
+            'carpetas': {carpeta: list(archivos) for carpeta, archivos in carpetas.items()},
+            'archivos': carpetas
+        }
     return registros
 
 def listar_carpetas(registros: dict):
@@ -69,62 +147,301 @@ def listar_carpetas(registros: dict):
     return ruta, carpetas
 
 def generacion_informe(registros, ruta):
+    from modules.informe import escribir_informe
     print("Generando informe.")
     nombre_archivo = f"Informe_Envio_Recibidor_{datetime.now().strftime('%Y-%m-%d_%H.%M.%S')}.xlsx"
-    for registro in registros:
-        archivo_informe = genera_informe(registro, ruta, nombre_archivo)
+    archivo_informe = escribir_informe(registros, ruta, nombre_archivo)
     return archivo_informe
 
+def rechazar_carpeta(registro, files, tamaños, compresion, error):
+    """
+    Deja la carpeta sin partes para enviar: algún archivo supera el límite del correo
+    aunque se divida la carpeta o se comprima. paso_enviar la informa como fallida
+    con la descripción del error.
+    """
+    print(f"{error}. La carpeta no se puede enviar.")
+    tamaño_total = sum(tamaños.get(archivo, 0) for archivo in files) / (1024 * 1024)
+    registro.update(archivos=files, tamaño_total=tamaño_total, compresion=compresion, partes=[], rechazo=str(error))
+    return registro
+
+def paso_validar(registro):
+    from modules.compresor import validar_archivos_detalle, comprimible
+    from modules.divisor import dividir_archivos, ArchivoExcedido
+    from modules.email_sender import limite_mensaje_mb
+    from modules.pipeline import ejecutar_en_proceso
+    print(f"Ejecutando: {registro['carpeta']}")
+    print(f"Archivos: {registro['archivos']}")
+    _, datos = bitacora().estado(registro['carpeta'])
+    tamaños = registro['tamaños']
+    if bitacora().alcanzado(registro['carpeta'], 'compressed') and all(archivo in tamaños for archivo in datos['archivos']):
+        print(f"Se retoma la validación de una ejecución anterior: {datos['archivos']}")
+        registro.update(archivos=datos['archivos'], tamaño_total=datos['tamaño_total'], compresion=datos['compresion'], partes=datos['partes'])
+        return registro
+    limite = limite_mensaje_mb(CONFIG_GLOBAL)
+    # Un comprimido a medio generar por una ejecución interrumpida no es un archivo de la carpeta
+    files, compresion = [archivo for archivo in registro['archivos'] if archivo != f"{registro['carpeta']}.7z"], []
+    try:
+        partes = dividir_archivos(files, registro['ruta'], limite, tamaños)
+    except ArchivoExcedido as e:
+        # Los PDF y demás formatos ya comprimidos van al 7z sin compresión (COPY): comprimir no los achica
+        if not all(comprimible(archivo) for archivo in e.archivos):
+            return rechazar_carpeta(registro, files, tamaños, compresion, e)
+        # Un archivo no cabe ni solo en un correo: se comprime la carpeta y se vuelve a dividir
+        print(f"{e}. Se comprime la carpeta.")
+        with medir('compresion'):
+            files, _, compresion = ejecutar_en_proceso(validar_archivos_detalle, files, registro['ruta'], registro['carpeta'], 0,
+                                                       ruta_cache=ruta_cache_archivos(), cache_mb=CONFIG_GLOBAL.config.cache.max_mb, tamaños=tamaños, mtimes=registro['mtimes'])
+        sumar('bytes_sin_comprimir', sum(estadistica['tamaño'] for estadistica in compresion))
+        sumar('bytes_comprimidos', sum(estadistica['tamaño_comprimido'] for estadistica in compresion))
+        tamaños.update((archivo, os.path.getsize(os.path.join(registro['ruta'], archivo))) for archivo in files)
+        try:
+            partes = dividir_archivos(files, registro['ruta'], limite, tamaños)
+        except ArchivoExcedido as e:
+            return rechazar_carpeta(registro, files, tamaños, compresion, e)
+    tamaño_total = sum(tamaños[archivo] for archivo in files) / (1024 * 1024)
+    print(f"Tamaño total de los archivos: {tamaño_total} MB en {len(partes)} correo(s)")
+    registro.update(archivos=files, tamaño_total=tamaño_total, compresion=compresion, partes=partes)
+    bitacora().avanzar(registro['carpeta'], 'compressed', archivos=files, tamaño_total=tamaño_total, compresion=compresion, partes=partes)
+    return registro
+
+def paso_estructurar(registro):
+    from modules.estructurar_registro import estructurar
+    estructura = estructurar(registro['carpeta'], registro['archivos'], config_excel())
+    print(f"Estructura: {estructura.to_dict()}")
+    registro['estructura'] = estructura
+    bitacora().avanzar(registro['carpeta'], 'structured')
+    return registro
+
+def paso_enviar(registro):
+    from modules.email_sender import enviar_reciver
+    from modules.divisor import asunto_parte, combinar_estados
+    estructura = registro['estructura']
+    carpeta = registro['carpeta']
+    _, datos = bitacora().estado(carpeta)
+    if bitacora().alcanzado(carpeta, 'sent'):
+        print(f"Carpeta ya enviada en una ejecución anterior, no se reenvía: {carpeta}")
+        registro['estado_correo'] = datos['estado_correo']
+        return registro
+    if estructura.emails_para not in (None, '') and registro.get('rechazo'):
+        status = {'estado': False, 'descripcion': registro['rechazo']}
+        print(f"Estado Correo: {status}")
+    elif estructura.emails_para not in (None, ''):
+        # Una carpeta sin archivos se envía igual, como un solo correo sin adjuntos
+        partes = registro['partes'] or [[]]
+        enviadas = set(datos.get('partes_enviadas', []))
+        estados = []
+        for numero, parte in enumerate(partes, 1):
+            if numero in enviadas:
+                estados.append({'estado': True, 'descripcion': 'Correo enviado correctamente.'})
+                continue
+            asunto = asunto_parte(estructura.asunto, numero, len(partes))
+            estado = enviar_reciver(CONFIG_GLOBAL, registro['ruta'], parte, estructura, CONFIG_GLOBAL.config.mail.config.transport, asunto=asunto, tamaños=registro['tamaños'])
+            if estado['estado']:
+                enviadas.add(numero)
+                bitacora().avanzar(carpeta, partes_enviadas=sorted(enviadas))
+                sumar('correos')
+                sumar('bytes_adjuntos', sum(registro['tamaños'].get(archivo, 0) for archivo in parte))
+            for contador in ('reintentos', 'limitados', 'espera_cuota', 'espera_reintentos'):
+                sumar(contador, estado.get(contador, 0))
+            estados.append(estado)
+        status = combinar_estados(estados)
+        print(f"Estado Correo: {status}")
+        if status['estado']:
+            bitacora().avanzar(carpeta, 'sent', estado_correo=status)
+    else:
+        print(f"Correo para: {estructura.emails_para}")
+        status = {'estado': False, 'descripcion': f'Correos de Recibidor o Recibidor no encontrado.'}
+    registro['estado_correo'] = status
+    return registro
+
+def paso_reporte(registro):
+    from models import CasoExportacion
+    if 'error' in registro:
+        error = registro['error']
+        registro['estado_correo'] = {'estado': False, 'descripcion': f"Error en la etapa {error['etapa']}: {error['descripcion']}"}
+    estructura = registro.get('estructura') or CasoExportacion(asunto=registro['carpeta'], adjuntos=registro['archivos'])
+    registro['fila'] = {
+        'carpeta': registro['carpeta'],
+        'ruta': registro['ruta'],
+        'archivos': registro['archivos'],
+        'estructura': estructura.to_dict(),
+        'estado_correo': registro['estado_correo'],
+        'partes': len(registro.get('partes') or [registro['archivos']]),
+        'metricas': metricas().carpeta(registro['carpeta'])
+    }
+    return registro
+
+def resumen_limites():
+    from modules.email_sender import resumen_limitadores
+    resumen = resumen_limitadores()
+    if resumen['reintentos'] or resumen['espera_cuota']:
+        print(f"Límites de envío: {resumen['reintentos']} reintentos ({resumen['limitados']} por límite de tasa), "
+              f"{resumen['espera_cuota']:.1f} s esperando cuota y {resumen['espera_reintentos']:.1f} s en backoff.")
+    return resumen
+
+def tamaños_carpetas(carpetas):
+    """
+    Bytes por carpeta según el escaneo de la ejecución.
+    """
+    return {carpeta: sum(archivo.tamaño for archivo in archivos.values()) for carpeta, archivos in carpetas['archivos'].items()}
+
 def registros(carpetas: dict):
-    lista_ejecucion = []
+    from modules.email_sender import enviar_informe
+    from modules.mover_carpeta import mover_todo
+    from modules.pipeline import ejecutar_pipeline, Etapa, configurar_procesos
     print("Iniciando el proceso de registros.")
-    for folder, files in carpetas['carpetas'].items():
-        print(f"Ejecutando: {folder}")
-        print(f"Archivos: {files}")
-        ruta = f"{carpetas['ruta']['en_proceso']}/{folder}"
-        files, tamaño_total = validar_archivos(files, ruta, folder)
-        print(f"Tamaño total de los archivos: {tamaño_total} MB")
-        estructura = estructurar(folder, files, CONFIG_EXCEL)
-        print(f"Estructura: {estructura.to_dict()}")
-        if estructura.emails_para not in (None, ''):
-            if tamaño_total <= 25:
-                status = enviar_reciver(CONFIG_GLOBAL, ruta, files, estructura, 'api')
-            else:
-                status = {'estado': False, 'descripcion': f'Archivos mayores a 25MB, tamaño total {tamaño_total} MB'}
-            print(f"Estado Correo: {status}")
-        else:
-            print(f"Correo para: {estructura.emails_para}")
-            status = {'estado': False, 'descripcion': f'Correos de Recibidor o Recibidor no encontrado.'}
-
-        lista_ejecucion.append({
-            'carpeta': folder,
-            'ruta': ruta,
-            'archivos': files,
-            'estructura': estructura.to_dict(),
-            'estado_correo': status
-        })
+    config_excel()  # se carga antes de que las etapas la usen desde varios hilos
+    pipeline = CONFIG_GLOBAL.config.pipeline
+    configurar_procesos(pipeline.workers)
+    # Las carpetas ya informadas en una ejecución interrumpida solo falta moverlas a Listo
+    pendientes = {folder: files for folder, files in carpetas['carpetas'].items() if bitacora().retomar(folder)[0] != 'reported'}
+    entrada = ({
+        'indice': indice,
+        'carpeta': folder,
+        'ruta': f"{carpetas['ruta']['en_proceso']}/{folder}",
+        'archivos': files,
+        'tamaños': {nombre: archivo.tamaño for nombre, archivo in carpetas['archivos'][folder].items()},
+        'mtimes': {nombre: archivo.mtime_ns for nombre, archivo in carpetas['archivos'][folder].items()}
+    } for indice, (folder, files) in enumerate(pendientes.items()))
+    etapas = [
+        Etapa('validar_archivos', paso_validar, pipeline.validate_workers),
+        Etapa('estructurar', paso_estructurar, pipeline.structure_workers),
+        Etapa('enviar', paso_enviar, pipeline.send_workers),
+        Etapa('reporte', paso_reporte, 1)
+    ]
+    procesados = ejecutar_pipeline(entrada, etapas, pipeline.queue_size)
+    lista_ejecucion = [registro['fila'] for registro in procesados]
+    resumen_limites()
 
     if len(lista_ejecucion) > 0:
         sleep(1)
-        archivo_informe = generacion_informe(lista_ejecucion, carpetas['ruta']['en_proceso'])
-        enviar_informe(CONFIG_GLOBAL, CONFIG_EXCEL, archivo_informe, lista_ejecucion, 'api')
-        mover_todo(CONFIG_GLOBAL.config.path.shared.main)
+        with medir('informe'):
+            archivo_informe = generacion_informe(lista_ejecucion, carpetas['ruta']['en_proceso'])
+            enviar_informe(CONFIG_GLOBAL, config_excel(), archivo_informe, lista_ejecucion, CONFIG_GLOBAL.config.mail.config.transport)
+        # Los envíos que quedaron pendientes (cuota agotada o error temporal) siguen
+        # en En Proceso y se retoman en la próxima ejecución desde la bitácora
+        diferidas = {registro['carpeta'] for registro in procesados if registro['estado_correo'].get('pendiente')}
+        for registro in procesados:
+            if registro['carpeta'] not in diferidas:
+                bitacora().avanzar(registro['carpeta'], 'reported')
+        if diferidas:
+            print(f"{len(diferidas)} carpeta(s) con envío pendiente quedan en En Proceso para la próxima ejecución.")
+        with medir('mover'):
+            mover_todo(CONFIG_GLOBAL.config.path.shared.main, CONFIG_GLOBAL.config.pipeline.move_workers, diferidas, tamaños_carpetas(carpetas))
+    elif len(carpetas['carpetas']) > 0:
+        with medir('mover'):
+            mover_todo(CONFIG_GLOBAL.config.path.shared.main, CONFIG_GLOBAL.config.pipeline.move_workers, tamaños=tamaños_carpetas(carpetas))
+    sumar('carpetas', len(lista_ejecucion))
+    sumar('errores', sum(1 for fila in lista_ejecucion if not fila['estado_correo']['estado']))
 
     return lista_ejecucion
 
+def procesar_pendientes(ruta, pendientes):
+    """
+    Mueve las carpetas pendientes a En Proceso (retomando las que quedaron de una
+    ejecución anterior) y las procesa.
+
+    Returns:
+        bool: True si hubo carpetas para procesar.
+    """
+    en_proceso = f'{ruta}/En Proceso'
+    hay_restos = os.path.isdir(en_proceso) and len(carpetas_pendientes(en_proceso)) > 0
+    carpetas = mover_carpetas_enproceso(ruta, pendientes) if pendientes or hay_restos else None
+    if carpetas != None and len(carpetas['carpetas']) > 0:
+        registros(carpetas)
+        return True
+    return False
+
+def cerrar_recursos():
+    global BITACORA
+    from modules.email_sender import cerrar_sesion, cerrar_transporte
+    from modules.pipeline import cerrar_procesos
+    cerrar_sesion()
+    cerrar_transporte()
+    cerrar_procesos()
+    if BITACORA is not None:
+        BITACORA.cerrar()
+        BITACORA = None
+
 def ejecutar():
+    from modules.email_sender import enviar_vacio
     print("Ejecutando el proceso principal.")
-    carpetas = mover_carpetas_enproceso(CONFIG_GLOBAL.config.path.shared.main)
-    if carpetas != None:
-        if len(carpetas['carpetas']) > 0:
-            registros(carpetas)
-        else:
-            enviar_vacio(CONFIG_GLOBAL, CONFIG_EXCEL, 'api')
-    else:
-        enviar_vacio(CONFIG_GLOBAL, CONFIG_EXCEL, 'api')
+    try:
+        ruta = CONFIG_GLOBAL.config.path.shared.main
+        # Sondeo: un único escaneo del directorio decide si hay trabajo
+        with medir('escaneo'):
+            pendientes = carpetas_pendientes(ruta)
+        if not procesar_pendientes(ruta, pendientes):
+            enviar_vacio(CONFIG_GLOBAL, config_excel(), CONFIG_GLOBAL.config.mail.config.transport)
+    finally:
+        escribir_metricas()
+        cerrar_recursos()
+
+def refrescar_config_excel(firma_anterior):
+    """
+    Descarta la configuración Excel en memoria si el libro cambió desde la firma dada.
+
+    Returns:
+        tuple: Firma (mtime_ns, tamaño) actual del libro.
+    """
+    global CONFIG_EXCEL
+    try:
+        info = os.stat(CONFIG_GLOBAL.config.path.shared.config)
+        firma = (info.st_mtime_ns, info.st_size)
+    except FileNotFoundError:
+        return firma_anterior
+    if firma_anterior is not None and firma != firma_anterior:
+        print("La configuración Excel cambió, se vuelve a cargar.")
+        CONFIG_EXCEL = None
+    return firma
+
+def ejecutar_daemon():
+    """
+    Modo daemon: vigila la carpeta compartida y procesa cada lote de carpetas apenas
+    sus archivos dejan de cambiar. La configuración, las plantillas, las sesiones de
+    correo y el pool de procesos quedan cargados entre un lote y otro.
+    """
+    from modules.vigilante import Vigilante
+    daemon = CONFIG_GLOBAL.config.daemon
+    ruta = CONFIG_GLOBAL.config.path.shared.main
+    print(f"Vigilando {ruta} (silencio {daemon.quiet_seconds}s, modo {daemon.watcher}).")
+    vigilante = Vigilante(ruta, daemon.quiet_seconds, daemon.poll_seconds, daemon.watcher, reintento=daemon.retry_seconds)
+    firma_excel = refrescar_config_excel(None)
+    try:
+        config_excel()
+        if procesar_pendientes(ruta, []):  # retoma lo que haya quedado en En Proceso
+            escribir_metricas()
+        for carpetas in vigilante.lotes():
+            if carpetas:
+                print(f"Carpetas listas para procesar: {carpetas}")
+            iniciar_metricas()  # cada lote es una ejecución con su propio resumen
+            firma_excel = refrescar_config_excel(firma_excel)
+            try:
+                # Un lote vacío es el reintento periódico: solo retoma lo que quedó en En Proceso
+                procesado = procesar_pendientes(ruta, carpetas)
+            except Exception as e:
+                logging.error(f"Error al procesar el lote {carpetas}: {e}")
+                procesado = True
+            if procesado:
+                escribir_metricas()
+    except KeyboardInterrupt:
+        print("Modo daemon detenido.")
+    finally:
+        vigilante.cerrar()
+        cerrar_recursos()
 
 def main():
     print("Iniciando el programa.")
+    configurar_log()
+    iniciar_metricas()
+    with medir('configuracion'):
+        cargar_configuracion()
+    if ARGUMENTOS.limpiar_cache:
+        limpiar_cache()
+        return
+    if ARGUMENTOS.daemon:
+        ejecutar_daemon()
+        return
     ejecutar()
 
 if __name__ == "__main__":
@@ -1,6 +1,6 @@
 from .replace_placeholders import replace_placeholders
 from .config_yaml import load_config as load_config_yaml
-from .config_excel import load_config as load_config_excel
+from .config_excel import load_config as load_config_excel, load_config_cached as load_config_excel_cached, load_config_selectivo as load_config_excel_selectivo
 from .caso_exportacion import CasoExportacion
 
-__all__ = ['replace_placeholders', 'load_config_yaml', 'load_config_excel', 'CasoExportacion']
\ No newline at end of file
+__all__ = ['replace_placeholders', 'load_config_yaml', 'load_config_excel', 'load_config_excel_cached', 'load_config_excel_selectivo', 'CasoExportacion']
\ No newline at end of file
@@ -1,5 +1,5 @@
 class CasoExportacion:
-    def __init__(self, recibidor='', pais='', emails_para='', emails_copia='', adjuntos='', asunto='', cuerpo=''):
+    def __init__(self, recibidor='', pais='', emails_para='', emails_copia='', adjuntos='', asunto='', cuerpo='', destinatarios=(), copia=()):
         self.recibidor = recibidor
         self.pais = pais
         self.emails_para = emails_para
@@ -7,6 +7,8 @@ class CasoExportacion:
         self.adjuntos = adjuntos
         self.asunto = asunto
         self.cuerpo = cuerpo
+        self.destinatarios = destinatarios
+        self.copia = copia
 
     def __repr__(self):
         return (f"CasoExportacion(recibidor={self.recibidor}, pais={self.pais}, emails_para={self.emails_para}, "
@@ -24,7 +26,7 @@ class CasoExportacion:
             'cuerpo': self.cuerpo
         }
 
-    def set(self, recibidor=None, pais=None, emails_para=None, emails_copia=None, adjuntos=None, asunto=None, cuerpo=None):
+    def set(self, recibidor=None, pais=None, emails_para=None, emails_copia=None, adjuntos=None, asunto=None, cuerpo=None, destinatarios=None, copia=None):
         if recibidor is not None:
             self.recibidor = recibidor
         if pais is not None:
@@ -39,6 +41,10 @@ class CasoExportacion:
             self.asunto = asunto
         if cuerpo is not None:
             self.cuerpo = cuerpo
+        if destinatarios is not None:
+            self.destinatarios = destinatarios
+        if copia is not None:
+            self.copia = copia
 
 '''
 # Ejemplo de uso
@@ -1,6 +1,32 @@
-import pandas as pd
+import os
+import pickle
+import hashlib
+import tempfile
+from .lector_xlsx import LectorXlsx
 from pprint import pp
 
+VERSION_SNAPSHOT = 2
+
+def normalizar_clave(valor):
+    """
+    Normaliza una clave de búsqueda: texto sin espacios en los extremos y en mayúsculas.
+    Los flags numéricos leídos como float (1.0) se tratan igual que los enteros (1).
+    """
+    if isinstance(valor, float) and valor.is_integer():
+        valor = int(valor)
+    return str(valor).strip().upper()
+
+def separar_emails(lista_emails):
+    """
+    Convierte una lista de correos separada por ',' o ';' en una tupla limpia.
+    """
+    if not isinstance(lista_emails, str):
+        return ()
+    return tuple(email.strip() for email in lista_emails.replace(';', ',').split(',') if email.strip())
+
+def sin_derivados(objeto):
+    return {k: v for k, v in objeto.__dict__.items() if k != 'emails'}
+
 class DistribucionCorreos:
     def __init__(self, casos_exportacion, pais, emails_para, emails_copia, adjuntos, asunto, cuerpo, ejemplos, notas):
         self.casos_exportacion = casos_exportacion
@@ -21,26 +47,29 @@ class RecibidoresEmails:
         self.recibidor = recibidor
         self.distribucion_correos = distribucion_correos
         self.lista_emails = lista_emails
+        self.emails = separar_emails(lista_emails)
 
     def to_dict(self):
-        return self.__dict__
+        return sin_derivados(self)
 
 class ResumenCC:
     def __init__(self, tipo, cc, lista_emails):
         self.tipo = tipo
         self.cc = cc
         self.lista_emails = lista_emails
+        self.emails = separar_emails(lista_emails)
 
     def to_dict(self):
-        return self.__dict__
+        return sin_derivados(self)
 
 class EmailReporte:
     def __init__(self, tipo, lista_emails):
         self.tipo = tipo
         self.lista_emails = lista_emails
+        self.emails = separar_emails(lista_emails)
 
     def to_dict(self):
-        return self.__dict__
+        return sin_derivados(self)
 
 class Modelo:
     def __init__(self, distribucion_correos, recibidores_emails, resumen_cc, email_reporte):
@@ -48,6 +77,44 @@ class Modelo:
         self.recibidores_emails = [RecibidoresEmails(**self._convert_keys(re)) for re in recibidores_emails]
         self.resumen_cc = [ResumenCC(**self._convert_keys(rc)) for rc in resumen_cc]
         self.email_reporte = [EmailReporte(**self._convert_keys(er)) for er in email_reporte]
+        self._indexar()
+
+    def _indexar(self):
+        """
+        Construye índices por recibidor, flag de distribución y tipo de CC.
+        Ante claves repetidas se conserva el primer registro, como en la búsqueda lineal.
+        """
+        self.indice_recibidores = {}
+        for item in self.recibidores_emails:
+            self.indice_recibidores.setdefault(normalizar_clave(item.recibidor), item)
+        self.indice_distribucion = {}
+        for item in self.distribucion_correos:
+            self.indice_distribucion.setdefault(normalizar_clave(item.emails_para), item)
+        self.indice_cc = {}
+        for item in self.resumen_cc:
+            self.indice_cc.setdefault(normalizar_clave(item.cc), item)
+
+    def buscar_recibidor(self, recibidor):
+        return self.indice_recibidores.get(normalizar_clave(recibidor))
+
+    def buscar_distribucion(self, distribucion):
+        return self.indice_distribucion.get(normalizar_clave(distribucion))
+
+    def buscar_copia(self, cc):
+        return self.indice_cc.get(normalizar_clave(cc))
+
+    @classmethod
+    def desde_objetos(cls, distribucion_correos, recibidores_emails, resumen_cc, email_reporte):
+        """
+        Construye el modelo a partir de objetos ya creados, sin conversión de claves.
+        """
+        modelo = cls.__new__(cls)
+        modelo.distribucion_correos = distribucion_correos
+        modelo.recibidores_emails = recibidores_emails
+        modelo.resumen_cc = resumen_cc
+        modelo.email_reporte = email_reporte
+        modelo._indexar()
+        return modelo
 
     def _convert_keys(self, data):
         return {self._convert_key(k): v for k, v in data.items()}
@@ -71,7 +138,54 @@ def cargar_modelo(data):
         email_reporte=data['EMAIL REPORTE']
     )
 
+HOJAS = {
+    'DISTRIBUCION CORREOS': (DistribucionCorreos, ['casos_exportacion', 'pais', 'emails_para', 'emails_copia', 'adjuntos', 'asunto', 'cuerpo', 'ejemplos', 'notas']),
+    'RECIBIDORES EMAILS': (RecibidoresEmails, ['recibidor', 'distribucion_correos', 'lista_emails']),
+    'RESUMEN CC': (ResumenCC, ['tipo', 'cc', 'lista_emails']),
+    'EMAIL REPORTE': (EmailReporte, ['tipo', 'lista_emails'])
+}
+
+def leer_hoja(filas, clase, campos):
+    """
+    Crea directamente los objetos del modelo a partir de las filas de una hoja.
+    Solo se toman las columnas que el modelo necesita; las filas vacías se omiten.
+    """
+    encabezado = next(filas, None)
+    if encabezado is None:
+        return []
+    columnas = {str(valor).strip().lower().replace(' ', '_'): indice for indice, valor in encabezado.items()}
+    indices = {campo: columnas[campo] for campo in campos if campo in columnas}
+    objetos = []
+    for fila in filas:
+        valores = {campo: fila.get(indice) for campo, indice in indices.items()}
+        if all(valor is None for valor in valores.values()):
+            continue
+        for campo in campos:
+            valores.setdefault(campo, None)
+        objetos.append(clase(**valores))
+    return objetos
+
+def load_config_selectivo(archivo_excel):
+    """
+    Carga el modelo leyendo solo las cuatro hojas requeridas, en streaming y en modo solo lectura.
+
+    Args:
+        archivo_excel (str): Ruta del libro de configuración.
+
+    Returns:
+        Modelo: Modelo de configuración.
+    """
+    with LectorXlsx(archivo_excel) as lector:
+        datos = {nombre: leer_hoja(lector.filas(nombre), clase, campos) for nombre, (clase, campos) in HOJAS.items()}
+    return Modelo.desde_objetos(
+        distribucion_correos=datos['DISTRIBUCION CORREOS'],
+        recibidores_emails=datos['RECIBIDORES EMAILS'],
+        resumen_cc=datos['RESUMEN CC'],
+        email_reporte=datos['EMAIL REPORTE']
+    )
+
 def load_config(archivo_excel):
+    import pandas as pd
     xls = pd.ExcelFile(archivo_excel)
     datos = {}
     for sheet_name in xls.sheet_names:
@@ -80,6 +194,91 @@ def load_config(archivo_excel):
     modelo = cargar_modelo(datos)
     return modelo
 
+def hash_archivo(archivo_excel):
+    """
+    Hash SHA-256 del contenido del libro, leído por bloques.
+    """
+    sha = hashlib.sha256()
+    with open(archivo_excel, 'rb') as archivo:
+        for bloque in iter(lambda: archivo.read(1024 * 1024), b''):
+            sha.update(bloque)
+    return sha.hexdigest()
+
+def firma_archivo(archivo_excel, contenido=True):
+    """
+    Devuelve la firma del libro: ruta absoluta, mtime, tamaño y, si `contenido`,
+    el hash SHA-256 del contenido (que obliga a leer el libro completo).
+    """
+    estado = os.stat(archivo_excel)
+    firma = {
+        'ruta': os.path.abspath(archivo_excel),
+        'mtime': estado.st_mtime_ns,
+        'tamaño': estado.st_size
+    }
+    if contenido:
+        firma['hash'] = hash_archivo(archivo_excel)
+    return firma
+
+def ruta_snapshot(archivo_excel, ruta_cache):
+    nombre = hashlib.sha1(os.path.abspath(archivo_excel).encode('utf-8')).hexdigest()
+    return os.path.join(ruta_cache, f'config_excel_{nombre}.pickle')
+
+def leer_snapshot(ruta):
+    try:
+        with open(ruta, 'rb') as archivo:
+            return pickle.load(archivo)
+    except (OSError, pickle.UnpicklingError, EOFError, AttributeError, ImportError):
+        return None
+
+def guardar_snapshot(ruta, firma, modelo):
+    # Temporal único en la misma carpeta: dos procesos que regeneran el snapshot a la vez no se pisan
+    carpeta = os.path.dirname(ruta) or '.'
+    os.makedirs(carpeta, exist_ok=True)
+    descriptor, temporal = tempfile.mkstemp(suffix='.tmp', dir=carpeta)
+    try:
+        with os.fdopen(descriptor, 'wb') as archivo:
+            pickle.dump({'version': VERSION_SNAPSHOT, 'firma': firma, 'modelo': modelo}, archivo, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(temporal, ruta)
+    except BaseException:
+        os.remove(temporal)
+        raise
+
+def load_config_cached(archivo_excel, ruta_cache, refrescar=False):
+    """
+    Carga el modelo desde un snapshot local si el libro no ha cambiado.
+
+    El snapshot se indexa por la ruta del libro y guarda su mtime, tamaño y hash.
+    Si el mtime y el tamaño coinciden se reutiliza sin leer el libro; solo cuando
+    difieren se calcula el hash, y un mtime distinto con el mismo contenido solo
+    actualiza la firma. En cualquier otro caso se regenera.
+
+    Args:
+        archivo_excel (str): Ruta del libro de configuración.
+        ruta_cache (str): Carpeta donde se guardan los snapshots.
+        refrescar (bool): Fuerza la lectura del libro y la regeneración del snapshot.
+
+    Returns:
+        Modelo: Modelo de configuración.
+    """
+    ruta = ruta_snapshot(archivo_excel, ruta_cache)
+    firma = firma_archivo(archivo_excel, contenido=False)
+    if not refrescar:
+        snapshot = leer_snapshot(ruta)
+        if snapshot and snapshot.get('version') == VERSION_SNAPSHOT:
+            anterior = snapshot['firma']
+            if anterior['tamaño'] == firma['tamaño'] and anterior['mtime'] == firma['mtime']:
+                return snapshot['modelo']
+            if anterior['tamaño'] == firma['tamaño']:
+                firma['hash'] = hash_archivo(archivo_excel)
+                if anterior['hash'] == firma['hash']:
+                    guardar_snapshot(ruta, firma, snapshot['modelo'])
+                    return snapshot['modelo']
+    if 'hash' not in firma:
+        firma['hash'] = hash_archivo(archivo_excel)
+    modelo = load_config_selectivo(archivo_excel)
+    guardar_snapshot(ruta, firma, modelo)
+    return modelo
+
 def main(archivo_excel):
     datos = load_config(archivo_excel)
     pp(datos.to_dict())
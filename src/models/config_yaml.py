@@ -1,6 +1,6 @@
 from .replace_placeholders import replace_placeholders
 from pydantic import BaseModel, Field
-from typing import List
+from typing import List, Optional
 import yaml
 import pprint
 
@@ -12,6 +12,8 @@ class LocalPathConfig(BaseModel):
     models: str
     templates: str
     logs: str
+    cache: Optional[str] = None
+    ledger: Optional[str] = None
 
 class SharedPathConfig(BaseModel):
     main: str
@@ -28,11 +30,30 @@ class SMTPConfig(BaseModel):
     password: str
     server: str
     port: int
+    pool_size: int = 1
+    max_messages: int = 50
+    starttls: bool = True
+    data_chunk_kb: int = 64
 
 class APIConfig(BaseModel):
     scopes: List[str]
     credentials: str
     token: str
+    discovery_cache: Optional[str] = None
+    root_url: Optional[str] = None
+    upload_mode: str = 'resumable'
+    upload_chunk_mb: int = 8
+    drive_chunk_mb: int = 8
+    drive_workers: int = 4
+
+class LimitsConfig(BaseModel):
+    quota_units_per_second: float = 250
+    recipients_per_day: int = 2000
+    send_units: int = 100
+    retries: int = 5
+    backoff_seconds: float = 1
+    backoff_max_seconds: float = 64
+    max_wait_seconds: float = 300
 
 class MailTemplateConfig(BaseModel):
     report: str
@@ -50,15 +71,43 @@ class MailSenderConfig(BaseModel):
 class MailConfigBase(BaseModel):
     smtp: SMTPConfig
     api: APIConfig
+    transport: str = 'api'
+    limit_mb: float = 0
+    limits: LimitsConfig = LimitsConfig()
 
 class MailConfig(BaseModel):
     config: MailConfigBase
     template: MailTemplateConfig
     sender: MailSenderConfig
 
+class PipelineConfig(BaseModel):
+    validate_workers: int = 2
+    structure_workers: int = 1
+    send_workers: int = 2
+    queue_size: int = 4
+    workers: int = 0
+    move_workers: int = 4
+
+class DaemonConfig(BaseModel):
+    quiet_seconds: float = 60
+    poll_seconds: float = 10
+    watcher: str = 'auto'
+    retry_seconds: float = 900
+
+class CacheConfig(BaseModel):
+    max_mb: int = 2048
+
+class MetricsConfig(BaseModel):
+    summary: bool = True
+    prometheus: bool = False
+
 class Configuration(BaseModel):
     path: PathConfig
     mail: MailConfig
+    pipeline: PipelineConfig = PipelineConfig()
+    cache: CacheConfig = CacheConfig()
+    daemon: DaemonConfig = DaemonConfig()
+    metrics: MetricsConfig = MetricsConfig()
 
 def load_config(file_path: str):
     with open(file_path, 'r') as file:
@@ -0,0 +1,95 @@
+import zipfile
+import posixpath
+import xml.etree.ElementTree as ET
+
+NS = '{http://schemas.openxmlformats.org/spreadsheetml/2006/main}'
+NS_REL = '{http://schemas.openxmlformats.org/officeDocument/2006/relationships}'
+
+def indice_columna(referencia):
+    """
+    Convierte la referencia de una celda ('C12') en el índice de columna base 0.
+    """
+    indice = 0
+    for caracter in referencia:
+        if not caracter.isalpha():
+            break
+        indice = indice * 26 + ord(caracter.upper()) - 64
+    return indice - 1
+
+def valor_celda(celda, cadenas):
+    tipo = celda.get('t')
+    if tipo == 'inlineStr':
+        return ''.join(texto.text or '' for texto in celda.iter(f'{NS}t'))
+    valor = celda.find(f'{NS}v')
+    if valor is None or valor.text is None:
+        return None
+    texto = valor.text
+    if tipo == 's':
+        return cadenas[int(texto)]
+    if tipo == 'b':
+        return texto == '1'
+    if tipo in (None, 'n'):
+        return int(texto) if texto.lstrip('-').isdigit() else float(texto)
+    return texto
+
+class LectorXlsx:
+    """
+    Lector mínimo de .xlsx en modo solo lectura.
+
+    Abre el libro una vez, carga las cadenas compartidas y recorre en streaming
+    únicamente las hojas que se le piden, sin construir celdas ni DataFrames.
+    """
+
+    def __init__(self, archivo):
+        self.zip = zipfile.ZipFile(archivo)
+        self.hojas = self._rutas_hojas()
+        self.cadenas = self._cadenas_compartidas()
+
+    def _rutas_hojas(self):
+        libro = ET.fromstring(self.zip.read('xl/workbook.xml'))
+        relaciones = ET.fromstring(self.zip.read('xl/_rels/workbook.xml.rels'))
+        destinos = {relacion.get('Id'): relacion.get('Target') for relacion in relaciones}
+        rutas = {}
+        for hoja in libro.iter(f'{NS}sheet'):
+            destino = destinos[hoja.get(f'{NS_REL}id')]
+            rutas[hoja.get('name')] = destino.lstrip('/') if destino.startswith('/') else posixpath.join('xl', destino)
+        return rutas
+
+    def _cadenas_compartidas(self):
+        cadenas = []
+        if 'xl/sharedStrings.xml' not in self.zip.namelist():
+            return cadenas
+        with self.zip.open('xl/sharedStrings.xml') as archivo:
+            for _, elemento in ET.iterparse(archivo):
+                if elemento.tag == f'{NS}si':
+                    cadenas.append(''.join(texto.text or '' for texto in elemento.iter(f'{NS}t')))
+                    elemento.clear()
+        return cadenas
+
+    def filas(self, nombre_hoja):
+        """
+        Itera las filas de una hoja como diccionarios {índice de columna: valor}.
+        Las celdas sin valor (p. ej. solo con estilo) no se incluyen.
+        """
+        with self.zip.open(self.hojas[nombre_hoja]) as archivo:
+            for _, elemento in ET.iterparse(archivo):
+                if elemento.tag == f'{NS}row':
+                    fila = {}
+                    columna = -1
+                    for celda in elemento.iter(f'{NS}c'):
+                        referencia = celda.get('r')
+                        columna = indice_columna(referencia) if referencia else columna + 1
+                        valor = valor_celda(celda, self.cadenas)
+                        if valor is not None:
+                            fila[columna] = valor
+                    elemento.clear()
+                    yield fila
+
+    def cerrar(self):
+        self.zip.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.cerrar()
@@ -0,0 +1,3 @@
+from .main import Bitacora, ESTADOS
+
+__all__ = ['Bitacora', 'ESTADOS']
\ No newline at end of file
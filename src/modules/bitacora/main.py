@@ -0,0 +1,86 @@
+import os
+import json
+import time
+import sqlite3
+import threading
+
+# Estados de una carpeta, en el orden en que el pipeline los alcanza
+ESTADOS = ('claimed', 'compressed', 'structured', 'sent', 'reported')
+RANGO = {estado: posicion for posicion, estado in enumerate(ESTADOS)}
+
+ESQUEMA = """
+CREATE TABLE IF NOT EXISTS carpetas (
+    carpeta TEXT PRIMARY KEY,
+    estado TEXT NOT NULL,
+    datos TEXT NOT NULL,
+    actualizado REAL NOT NULL
+);
+"""
+
+class Bitacora:
+    """
+    Bitácora de envíos en SQLite (modo WAL), a prueba de caídas.
+
+    Registra el estado de cada carpeta en transacciones cortas, así una ejecución
+    que se reinicia retoma cada carpeta desde la última etapa completada y no
+    vuelve a enviar las que ya salieron. Las consultas son por clave primaria.
+
+    Args:
+        ruta (str): Archivo de la base de datos; None la mantiene solo en memoria.
+    """
+
+    def __init__(self, ruta=None):
+        if ruta:
+            os.makedirs(os.path.dirname(ruta) or '.', exist_ok=True)
+        self.lock = threading.Lock()
+        self.conexion = sqlite3.connect(ruta or ':memory:', timeout=30, check_same_thread=False)
+        self.conexion.execute('PRAGMA journal_mode=WAL')
+        self.conexion.execute('PRAGMA synchronous=NORMAL')
+        self.conexion.executescript(ESQUEMA)
+
+    def _leer(self, carpeta):
+        fila = self.conexion.execute('SELECT estado, datos FROM carpetas WHERE carpeta = ?', (carpeta,)).fetchone()
+        return (fila[0], json.loads(fila[1])) if fila else (None, {})
+
+    def estado(self, carpeta):
+        """
+        Returns:
+            tuple: (estado o None si la carpeta no está registrada, datos guardados).
+        """
+        with self.lock:
+            return self._leer(carpeta)
+
+    def alcanzado(self, carpeta, estado):
+        actual, _ = self.estado(carpeta)
+        return actual is not None and RANGO[actual] >= RANGO[estado]
+
+    def reclamar(self, carpeta):
+        """
+        Registra la carpeta como una entrega nueva (estado 'claimed'), descartando lo anterior.
+        """
+        with self.lock, self.conexion:
+            self.conexion.execute('INSERT OR REPLACE INTO carpetas VALUES (?, ?, ?, ?)', (carpeta, 'claimed', '{}', time.time()))
+
+    def retomar(self, carpeta):
+        """
+        Estado de una carpeta que quedó en proceso; si no estaba registrada, la reclama.
+        """
+        with self.lock, self.conexion:
+            self.conexion.execute('INSERT OR IGNORE INTO carpetas VALUES (?, ?, ?, ?)', (carpeta, 'claimed', '{}', time.time()))
+            return self._leer(carpeta)
+
+    def avanzar(self, carpeta, estado=None, **datos):
+        """
+        Pasa la carpeta al estado indicado (nunca retrocede) y agrega los datos dados.
+        """
+        with self.lock, self.conexion:
+            actual, guardados = self._leer(carpeta)
+            nuevo = actual or 'claimed'
+            if estado is not None and RANGO[estado] > RANGO[nuevo]:
+                nuevo = estado
+            guardados.update(datos)
+            self.conexion.execute('INSERT OR REPLACE INTO carpetas VALUES (?, ?, ?, ?)',
+                                  (carpeta, nuevo, json.dumps(guardados, ensure_ascii=False), time.time()))
+
+    def cerrar(self):
+        self.conexion.close()
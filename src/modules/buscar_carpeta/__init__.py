@@ -1,3 +1,3 @@
-from .main import buscar_carpeta
+from .main import buscar_carpeta, carpetas_pendientes
 
-__all__ = ['buscar_carpeta']
\ No newline at end of file
+__all__ = ['buscar_carpeta', 'carpetas_pendientes']
\ No newline at end of file
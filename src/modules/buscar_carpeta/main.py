@@ -26,6 +26,24 @@ def listar_carpetas(ruta):
     logging.info(f"Carpetas listadas en la ruta {ruta}: {carpetas}")
     carpetas = sorted(carpetas)
     return carpetas
+
+CARPETAS_SISTEMA = ('Configuracion', 'En Proceso', 'Listo')
+
+def carpetas_pendientes(ruta, excluidas=CARPETAS_SISTEMA):
+    """
+    Devuelve, ordenadas, las carpetas por procesar en la ruta con un único escaneo (os.scandir).
+    Omite las carpetas de trabajo del bot; si la ruta no existe devuelve una lista vacía.
+    """
+    try:
+        with os.scandir(ruta) as entradas:
+            carpetas = [entrada.name for entrada in entradas if entrada.name not in excluidas and entrada.is_dir()]
+    except FileNotFoundError:
+        logging.warning(f"No se encontró la carpeta en la ruta: {ruta}")
+        return []
+    carpetas = sorted(carpetas)
+    logging.info(f"Carpetas pendientes en la ruta {ruta}: {carpetas}")
+    return carpetas
+
 def buscar_carpeta(ruta):
     logging.info(f"Ruta proporcionada: {ruta}")
     if buscar_existencia(ruta):
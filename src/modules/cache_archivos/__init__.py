@@ -0,0 +1,3 @@
+from .main import CacheContenido, calcular_sha256
+
+__all__ = ['CacheContenido', 'calcular_sha256']
\ No newline at end of file
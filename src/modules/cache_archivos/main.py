@@ -0,0 +1,180 @@
+import os
+import json
+import time
+import shutil
+import sqlite3
+import hashlib
+
+BLOQUE_LECTURA = 1024 * 1024
+MAX_DIGESTOS = 100000
+
+ESQUEMA = """
+CREATE TABLE IF NOT EXISTS digestos (
+    nombre TEXT NOT NULL,
+    tamaño INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    sha256 TEXT NOT NULL,
+    usado REAL NOT NULL,
+    PRIMARY KEY (nombre, tamaño, mtime_ns)
+);
+CREATE TABLE IF NOT EXISTS objetos (
+    clave TEXT PRIMARY KEY,
+    tamaño INTEGER NOT NULL,
+    estadisticas TEXT NOT NULL,
+    usado REAL NOT NULL
+);
+"""
+
+def calcular_sha256(ruta):
+    digesto = hashlib.sha256()
+    with open(ruta, 'rb') as archivo:
+        for bloque in iter(lambda: archivo.read(BLOQUE_LECTURA), b''):
+            digesto.update(bloque)
+    return digesto.hexdigest()
+
+class CacheContenido:
+    """
+    Cache local direccionada por contenido para los comprimidos y los digestos de archivos.
+
+    Los digestos se indexan por (nombre, tamaño, mtime_ns), así un archivo sin cambios
+    no se vuelve a leer aunque se haya movido de carpeta. Los comprimidos se guardan
+    bajo una clave derivada de los nombres, tamaños y digestos de sus archivos, y se
+    desalojan por LRU cuando la cache supera `tamaño_maximo_mb`.
+
+    El índice es SQLite en modo WAL, por lo que varios procesos del pool pueden usarla a la vez.
+
+    Args:
+        ruta (str): Carpeta de la cache.
+        tamaño_maximo_mb (int): Tamaño máximo de los comprimidos guardados, en MB.
+    """
+
+    def __init__(self, ruta, tamaño_maximo_mb=2048):
+        self.ruta = ruta
+        self.objetos = os.path.join(ruta, 'objetos')
+        self.tamaño_maximo = tamaño_maximo_mb * 1024 * 1024
+        os.makedirs(self.objetos, exist_ok=True)
+        self.conexion = sqlite3.connect(os.path.join(ruta, 'indice.sqlite3'), timeout=30)
+        self.conexion.execute('PRAGMA journal_mode=WAL')
+        self.conexion.executescript(ESQUEMA)
+
+    def digesto(self, ruta_archivo, tamaño=None, mtime_ns=None):
+        """
+        SHA-256 del archivo; solo se calcula si no está en la cache para su nombre, tamaño y mtime.
+        Con `tamaño` y `mtime_ns` del escaneo la búsqueda no consulta el disco.
+        """
+        if tamaño is None or mtime_ns is None:
+            info = os.stat(ruta_archivo)
+            tamaño, mtime_ns = info.st_size, info.st_mtime_ns
+        llave = (os.path.basename(ruta_archivo), tamaño, mtime_ns)
+        with self.conexion:
+            fila = self.conexion.execute(
+                'SELECT sha256 FROM digestos WHERE nombre = ? AND tamaño = ? AND mtime_ns = ?', llave).fetchone()
+            if fila:
+                self.conexion.execute(
+                    'UPDATE digestos SET usado = ? WHERE nombre = ? AND tamaño = ? AND mtime_ns = ?', (time.time(), *llave))
+                return fila[0]
+        sha256 = calcular_sha256(ruta_archivo)
+        with self.conexion:
+            self.conexion.execute('INSERT OR REPLACE INTO digestos VALUES (?, ?, ?, ?, ?)', (*llave, sha256, time.time()))
+        return sha256
+
+    def clave(self, rutas, *parametros, tamaños=None, mtimes=None):
+        """
+        Clave de un conjunto de archivos: nombres, tamaños y digestos ordenados, más los
+        parámetros que cambian el resultado (codec, nivel).
+
+        `tamaños` y `mtimes` (por nombre de archivo, del escaneo de la carpeta) se usan
+        para buscar los digestos sin un stat por archivo; solo los archivos que no
+        figuran en ellos se consultan en disco.
+        """
+        tamaños, mtimes = tamaños or {}, mtimes or {}
+        entradas = []
+        for ruta in rutas:
+            nombre = os.path.basename(ruta)
+            if nombre in tamaños and nombre in mtimes:
+                tamaño, mtime_ns = tamaños[nombre], mtimes[nombre]
+            else:
+                info = os.stat(ruta)
+                tamaño, mtime_ns = info.st_size, info.st_mtime_ns
+            entradas.append((nombre, tamaño, self.digesto(ruta, tamaño, mtime_ns)))
+        entradas.sort()
+        contenido = json.dumps([entradas, parametros], ensure_ascii=False)
+        return hashlib.sha256(contenido.encode('utf-8')).hexdigest()
+
+    def _ruta_objeto(self, clave):
+        return os.path.join(self.objetos, f'{clave}.7z')
+
+    def obtener(self, clave, destino):
+        """
+        Copia (o enlaza) el comprimido de la clave en `destino`.
+
+        Returns:
+            list: Las estadísticas guardadas con el comprimido, o None si no está en la cache.
+        """
+        fila = self.conexion.execute('SELECT estadisticas FROM objetos WHERE clave = ?', (clave,)).fetchone()
+        objeto = self._ruta_objeto(clave)
+        if fila is None or not os.path.exists(objeto):
+            return None
+        if os.path.exists(destino):
+            os.remove(destino)
+        try:
+            os.link(objeto, destino)
+        except OSError:
+            shutil.copyfile(objeto, destino)
+        with self.conexion:
+            self.conexion.execute('UPDATE objetos SET usado = ? WHERE clave = ?', (time.time(), clave))
+        return json.loads(fila[0])
+
+    def guardar(self, clave, origen, estadisticas):
+        """
+        Guarda una copia del comprimido bajo la clave y desaloja lo necesario.
+        """
+        objeto = self._ruta_objeto(clave)
+        temporal = f'{objeto}.{os.getpid()}.tmp'
+        shutil.copyfile(origen, temporal)
+        os.replace(temporal, objeto)
+        with self.conexion:
+            self.conexion.execute('INSERT OR REPLACE INTO objetos VALUES (?, ?, ?, ?)',
+                                  (clave, os.path.getsize(objeto), json.dumps(estadisticas, ensure_ascii=False), time.time()))
+        self.desalojar()
+
+    def desalojar(self):
+        """
+        Elimina los comprimidos menos usados hasta quedar bajo el tamaño máximo
+        y recorta los digestos más antiguos.
+        """
+        with self.conexion:
+            total = self.conexion.execute('SELECT COALESCE(SUM(tamaño), 0) FROM objetos').fetchone()[0]
+            for clave, tamaño in self.conexion.execute('SELECT clave, tamaño FROM objetos ORDER BY usado').fetchall():
+                if total <= self.tamaño_maximo:
+                    break
+                self.conexion.execute('DELETE FROM objetos WHERE clave = ?', (clave,))
+                if os.path.exists(self._ruta_objeto(clave)):
+                    os.remove(self._ruta_objeto(clave))
+                total -= tamaño
+            self.conexion.execute(
+                'DELETE FROM digestos WHERE rowid NOT IN (SELECT rowid FROM digestos ORDER BY usado DESC LIMIT ?)', (MAX_DIGESTOS,))
+
+    def limpiar(self):
+        """
+        Vacía la cache por completo.
+
+        Returns:
+            int: Bytes liberados.
+        """
+        with self.conexion:
+            liberado = self.conexion.execute('SELECT COALESCE(SUM(tamaño), 0) FROM objetos').fetchone()[0]
+            self.conexion.execute('DELETE FROM objetos')
+            self.conexion.execute('DELETE FROM digestos')
+        for nombre in os.listdir(self.objetos):
+            os.remove(os.path.join(self.objetos, nombre))
+        return liberado
+
+    def cerrar(self):
+        self.conexion.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.cerrar()
@@ -1,3 +1,3 @@
-from .main import validar_archivos
+from .main import validar_archivos, validar_archivos_detalle, comprimir_por_tipo, comprimible
 
-__all__ = ['validar_archivos']
\ No newline at end of file
+__all__ = ['validar_archivos', 'validar_archivos_detalle', 'comprimir_por_tipo', 'comprimible']
\ No newline at end of file
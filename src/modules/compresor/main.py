@@ -1,5 +1,4 @@
 import os
-import py7zr
 
 def obtener_tamaño_total(archivos):
     tamaño_total = 0
@@ -7,24 +6,136 @@ def obtener_tamaño_total(archivos):
         tamaño_total += os.path.getsize(archivo) / (1024 * 1024)  # Convertir a MB
     return tamaño_total
 
-def comprimir_archivos(archivos, archivo_7z, ruta_base):
-    ruta_completa_7z = os.path.join(ruta_base, archivo_7z)
-    with py7zr.SevenZipFile(ruta_completa_7z, 'w') as archive:
-        for archivo in archivos:
-            ruta_completa = os.path.join(ruta_base, archivo)
+# Formatos que ya vienen comprimidos: se guardan tal cual (recomprimirlos solo gasta CPU)
+ALMACENAR = {'.pdf', '.jpg', '.jpeg', '.png', '.xlsx', '.xlsm', '.docx', '.zip', '.7z', '.rar', '.gz'}
+
+def filtros_codec(codec, nivel=None):
+    """
+    Filtros de py7zr para los archivos comprimibles.
+
+    'lzma2' (por defecto, preset rápido) se abre con cualquier 7-Zip; 'zstd' es más
+    rápido pero el receptor necesita un 7-Zip con soporte zstd.
+    """
+    import py7zr
+    if codec == 'zstd':
+        return [{'id': py7zr.FILTER_ZSTD, 'level': 3 if nivel is None else nivel}]
+    if codec == 'lzma2':
+        return [{'id': py7zr.FILTER_LZMA2, 'preset': 1 if nivel is None else nivel}]
+    raise ValueError(f"Codec de compresión no soportado: {codec}")
+
+def comprimible(archivo):
+    """
+    Indica si comprimir el archivo lo achica; los formatos de ALMACENAR van al 7z sin compresión.
+    """
+    return os.path.splitext(archivo.strip())[1].lower() not in ALMACENAR
+
+def codec_archivo(archivo, codec):
+    return codec if comprimible(archivo) else 'copy'
+
+def comprimir_por_tipo(archivos, ruta_7z, ruta_base, codec='lzma2', nivel=None):
+    """
+    Comprime los archivos en un único .7z eligiendo el codec por tipo de archivo.
+
+    Los formatos ya comprimidos se guardan sin compresión en un primer bloque; cada
+    archivo comprimible se agrega después en su propio bloque con el codec indicado,
+    así el tamaño comprimido y el tiempo de cada archivo quedan medidos.
+
+    Returns:
+        list: Un dict por archivo con archivo, codec, tamaño, tamaño_comprimido, ratio y segundos.
+    """
+    import py7zr
+    import time
+    almacenados = [archivo for archivo in archivos if codec_archivo(archivo, codec) == 'copy']
+    comprimibles = [archivo for archivo in archivos if codec_archivo(archivo, codec) != 'copy']
+    estadisticas = []
+    modo = 'w'
+
+    def registrar(archivo, codec_usado, tamaño_comprimido, segundos):
+        tamaño = os.path.getsize(os.path.join(ruta_base, archivo))
+        estadisticas.append({
+            'archivo': archivo,
+            'codec': codec_usado,
+            'tamaño': tamaño,
+            'tamaño_comprimido': tamaño_comprimido,
+            'ratio': tamaño_comprimido / tamaño if tamaño else 1.0,
+            'segundos': segundos
+        })
+
+    if almacenados:
+        with py7zr.SevenZipFile(ruta_7z, 'w', filters=[{'id': py7zr.FILTER_COPY}]) as archive:
+            for archivo in almacenados:
+                ruta_completa = os.path.join(ruta_base, archivo)
+                inicio = time.perf_counter()
+                archive.write(ruta_completa, os.path.basename(ruta_completa))
+                registrar(archivo, 'copy', os.path.getsize(ruta_completa), time.perf_counter() - inicio)
+        modo = 'a'
+
+    filtros = filtros_codec(codec, nivel)
+    for archivo in comprimibles:
+        ruta_completa = os.path.join(ruta_base, archivo)
+        tamaño_previo = os.path.getsize(ruta_7z) if modo == 'a' else 0
+        inicio = time.perf_counter()
+        with py7zr.SevenZipFile(ruta_7z, modo, filters=filtros) as archive:
             archive.write(ruta_completa, os.path.basename(ruta_completa))
+        segundos = time.perf_counter() - inicio
+        # La diferencia incluye la cabecera reescrita; es despreciable frente al contenido
+        registrar(archivo, codec, os.path.getsize(ruta_7z) - tamaño_previo, segundos)
+        modo = 'a'
+    return estadisticas
+
+def comprimir_archivos(archivos, archivo_7z, ruta_base, codec='lzma2', nivel=None):
+    comprimir_por_tipo(archivos, os.path.join(ruta_base, archivo_7z), ruta_base, codec, nivel)
     return archivo_7z
 
-def validar_archivos(archivos, ruta_base, nombre_comprimido, tamaño_maximo=25):
-    tamaño_total = obtener_tamaño_total([os.path.join(ruta_base, archivo) for archivo in archivos])
+def comprimir_con_cache(archivos, ruta_7z, ruta_base, codec, nivel, ruta_cache, cache_mb, tamaños=None, mtimes=None):
+    """
+    Comprime usando la cache de contenido: si los mismos archivos ya se comprimieron
+    con el mismo codec, se reutiliza el comprimido en vez de volver a generarlo.
+    """
+    from modules.cache_archivos import CacheContenido
+    with CacheContenido(ruta_cache, cache_mb) as cache:
+        clave = cache.clave([os.path.join(ruta_base, archivo) for archivo in archivos], codec, nivel, tamaños=tamaños, mtimes=mtimes)
+        estadisticas = cache.obtener(clave, ruta_7z)
+        if estadisticas is not None:
+            print(f"Comprimido reutilizado desde la cache: {os.path.basename(ruta_7z)}")
+            return estadisticas
+        estadisticas = comprimir_por_tipo(archivos, ruta_7z, ruta_base, codec, nivel)
+        cache.guardar(clave, ruta_7z, estadisticas)
+        return estadisticas
+
+def validar_archivos_detalle(archivos, ruta_base, nombre_comprimido, tamaño_maximo=25, codec='lzma2', nivel=None, ruta_cache=None, cache_mb=2048, tamaños=None, mtimes=None):
+    """
+    Igual que validar_archivos, pero devuelve además las estadísticas de compresión por archivo.
+
+    Con `ruta_cache` los comprimidos se guardan en la cache de contenido y se reutilizan
+    entre ejecuciones mientras los archivos no cambien. `tamaños` (bytes por nombre de
+    archivo, del recorrido inicial) evita volver a consultar el tamaño en disco; con
+    `mtimes` (mtime_ns por nombre) la cache busca los digestos sin consultar el disco.
+
+    Returns:
+        tuple: (archivos a enviar, tamaño total en MB, estadísticas; lista vacía si no se comprimió).
+    """
+    if tamaños and all(archivo in tamaños for archivo in archivos):
+        tamaño_total = sum(tamaños[archivo] for archivo in archivos) / (1024 * 1024)
+    else:
+        tamaño_total = obtener_tamaño_total([os.path.join(ruta_base, archivo) for archivo in archivos])
     if tamaño_total > tamaño_maximo:
         archivo_7z = f'{nombre_comprimido}.7z'
-        archivo_comprimido = [comprimir_archivos(archivos, archivo_7z, ruta_base)]
-        tamaño_comprimido = obtener_tamaño_total([os.path.join(ruta_base, archivo) for archivo in archivo_comprimido])
-        return archivo_comprimido, tamaño_comprimido
+        ruta_7z = os.path.join(ruta_base, archivo_7z)
+        if ruta_cache:
+            estadisticas = comprimir_con_cache(archivos, ruta_7z, ruta_base, codec, nivel, ruta_cache, cache_mb, tamaños, mtimes)
+        else:
+            estadisticas = comprimir_por_tipo(archivos, ruta_7z, ruta_base, codec, nivel)
+        for estadistica in estadisticas:
+            print(f"  {estadistica['codec']:>5} {estadistica['ratio']:6.1%} {estadistica['segundos']:7.3f}s {estadistica['archivo']}")
+        tamaño_comprimido = obtener_tamaño_total([ruta_7z])
+        return [archivo_7z], tamaño_comprimido, estadisticas
     else:
-        return archivos, tamaño_total
-    #return archivos, tamaño_total
+        return archivos, tamaño_total, []
+
+def validar_archivos(archivos, ruta_base, nombre_comprimido, tamaño_maximo=25):
+    archivos_validados, tamaño_total, _ = validar_archivos_detalle(archivos, ruta_base, nombre_comprimido, tamaño_maximo)
+    return archivos_validados, tamaño_total
 
 def main():
     asunto = 'FULL SET OF DOCS OE232400596 -OE232400597 -OE232400598 -OE232400599- MAERSK BULAN - TROPME (ETA 01-05-2024)'
@@ -0,0 +1,3 @@
+from .main import dividir_archivos, asunto_parte, combinar_estados, ArchivoExcedido
+
+__all__ = ['dividir_archivos', 'asunto_parte', 'combinar_estados', 'ArchivoExcedido']
\ No newline at end of file
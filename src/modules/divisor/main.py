@@ -0,0 +1,99 @@
+import os
+from modules.email_sender.mime_spool import tamaño_base64
+
+CABECERAS_MENSAJE = 64 * 1024  # reserva para cabeceras y cuerpo HTML del mensaje
+CABECERAS_ADJUNTO = 512        # cabeceras MIME y separador de cada adjunto
+
+class ArchivoExcedido(ValueError):
+    """
+    Un archivo no cabe en un mensaje aunque se envíe solo.
+
+    Args:
+        mensaje (str): Descripción del error.
+        archivos (list): Nombres de los archivos que superan el límite.
+    """
+
+    def __init__(self, mensaje, archivos=()):
+        super().__init__(mensaje)
+        self.archivos = list(archivos)
+
+def tamaño_adjunto(tamaño):
+    """
+    Tamaño real que ocupa un archivo de `tamaño` bytes dentro del mensaje (base64 más sus cabeceras MIME).
+    """
+    return tamaño_base64(tamaño) + CABECERAS_ADJUNTO
+
+def dividir_archivos(archivos, ruta_base, limite_mb=25, tamaños=None):
+    """
+    Reparte los archivos de la carpeta en la menor cantidad de mensajes bajo el límite.
+
+    Usa first-fit decreasing sobre el tamaño codificado de cada adjunto; dentro de cada
+    parte los archivos conservan el orden original de la carpeta.
+
+    Args:
+        archivos (list): Nombres de los archivos de la carpeta.
+        ruta_base (str): Ruta de la carpeta.
+        limite_mb (float): Tamaño máximo de cada mensaje ya codificado, en MB.
+        tamaños (dict): Tamaños en bytes ya conocidos por nombre de archivo; evita consultar el disco.
+
+    Returns:
+        list: Lista de partes; cada parte es una lista de nombres de archivo.
+
+    Raises:
+        ArchivoExcedido: Si un archivo supera el límite por sí solo.
+    """
+    capacidad = int(limite_mb * 1024 * 1024) - CABECERAS_MENSAJE
+    conocidos = tamaños or {}
+    tamaños = {archivo: tamaño_adjunto(conocidos[archivo] if archivo in conocidos else os.path.getsize(os.path.join(ruta_base, archivo)))
+               for archivo in archivos}
+    excedidos = [archivo for archivo, tamaño in tamaños.items() if tamaño > capacidad]
+    if excedidos:
+        raise ArchivoExcedido(f"Archivos mayores al límite de {limite_mb} MB por correo: {', '.join(excedidos)}", excedidos)
+
+    partes = []
+    libres = []
+    for archivo in sorted(archivos, key=lambda nombre: tamaños[nombre], reverse=True):
+        for indice, libre in enumerate(libres):
+            if tamaños[archivo] <= libre:
+                partes[indice].append(archivo)
+                libres[indice] -= tamaños[archivo]
+                break
+        else:
+            partes.append([archivo])
+            libres.append(capacidad - tamaños[archivo])
+
+    orden = {archivo: posicion for posicion, archivo in enumerate(archivos)}
+    partes = [sorted(parte, key=orden.get) for parte in partes]
+    return sorted(partes, key=lambda parte: orden[parte[0]])
+
+def asunto_parte(asunto, numero, total):
+    """
+    Asunto de cada parte: sin cambios si hay una sola, "Asunto (1/3)" si hay varias.
+    """
+    return asunto if total <= 1 else f"{asunto} ({numero}/{total})"
+
+def combinar_estados(estados):
+    """
+    Resume el estado de las partes de un envío como una sola entrega lógica.
+
+    Los contadores numéricos de cada parte (reintentos, esperas) se suman y el
+    envío queda pendiente si alguna parte lo quedó. Sin estados no hubo envío,
+    y el resultado es un fallo.
+    """
+    if not estados:
+        return {'estado': False, 'descripcion': 'No se envió ningún correo.'}
+    if len(estados) == 1:
+        return estados[0]
+    total = len(estados)
+    fallidos = [f"Parte {numero}/{total}: {estado['descripcion']}" for numero, estado in enumerate(estados, 1) if not estado['estado']]
+    if not fallidos:
+        resultado = {'estado': True, 'descripcion': f'Correo enviado correctamente en {total} partes.'}
+    else:
+        resultado = {'estado': False, 'descripcion': '; '.join(fallidos)}
+    for estado in estados:
+        for clave, valor in estado.items():
+            if clave not in ('estado', 'descripcion', 'pendiente') and isinstance(valor, (int, float)):
+                resultado[clave] = resultado.get(clave, 0) + valor
+    if any(estado.get('pendiente') for estado in estados):
+        resultado['pendiente'] = True
+    return resultado
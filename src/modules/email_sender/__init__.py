@@ -1,4 +1,9 @@
 from .email_reciver import enviar_reciver
 from .email_informe import enviar_informe
 from .email_vacio import enviar_vacio
-__all__ = ['enviar_reciver', 'enviar_informe', 'enviar_vacio']
\ No newline at end of file
+from .sesion import SesionCorreo, obtener_sesion, cerrar_sesion
+from .smtp_pool import TransporteSMTP, obtener_transporte, cerrar_transporte
+from .plantillas import RegistroPlantillas, renderizar
+from .email_sender import limite_mensaje_mb
+from .limitador import LimitadorEnvios, CuotaExcedida, obtener_limitador, resumen_limitadores
+__all__ = ['enviar_reciver', 'enviar_informe', 'enviar_vacio', 'SesionCorreo', 'obtener_sesion', 'cerrar_sesion', 'TransporteSMTP', 'obtener_transporte', 'cerrar_transporte', 'RegistroPlantillas', 'renderizar', 'LimitadorEnvios', 'CuotaExcedida', 'obtener_limitador', 'resumen_limitadores', 'limite_mensaje_mb']
\ No newline at end of file
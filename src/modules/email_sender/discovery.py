@@ -0,0 +1,89 @@
+import os
+import json
+import tempfile
+from googleapiclient.discovery import build_from_document
+from googleapiclient.discovery_cache import DISCOVERY_DOC_DIR
+
+DISCOVERY_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'discovery')
+
+def nombre_documento(api, version):
+    return f'{api}.{version}.json'
+
+def leer_documento(ruta):
+    with open(ruta, 'r', encoding='utf-8') as archivo:
+        return json.load(archivo)
+
+def origen_documento(api, version):
+    """
+    Ruta del documento de descubrimiento de origen: el incluido en el proyecto o,
+    si no existe, el documento estático de googleapiclient.
+
+    Returns:
+        str: Ruta del documento, o None si no hay ninguno.
+    """
+    nombre = nombre_documento(api, version)
+    for carpeta in (DISCOVERY_PATH, DISCOVERY_DOC_DIR):
+        ruta = os.path.join(carpeta, nombre)
+        if os.path.isfile(ruta):
+            return ruta
+    return None
+
+def cargar_documento(api, version, ruta_cache=None):
+    """
+    Obtiene el documento de descubrimiento sin acceder a la red.
+
+    Orden de búsqueda: caché en disco (si se indica), documento incluido en el
+    proyecto y, por último, el documento estático de googleapiclient. Lo que se
+    obtenga fuera de la caché se guarda en ella, indexado por API y versión. Una
+    copia en caché más antigua que el documento de origen (por ejemplo, tras
+    actualizar el incluido o googleapiclient) se descarta y se vuelve a generar.
+
+    Args:
+        api (str): Nombre de la API ('gmail', 'drive').
+        version (str): Versión de la API ('v1', 'v3').
+        ruta_cache (str): Carpeta de caché opcional.
+
+    Returns:
+        dict: Documento de descubrimiento.
+    """
+    nombre = nombre_documento(api, version)
+    origen = origen_documento(api, version)
+    if ruta_cache:
+        ruta_documento = os.path.join(ruta_cache, nombre)
+        if os.path.isfile(ruta_documento) and (origen is None or os.path.getmtime(ruta_documento) >= os.path.getmtime(origen)):
+            return leer_documento(ruta_documento)
+
+    if origen is None:
+        raise FileNotFoundError(f"No existe documento de descubrimiento para {api} {version}.")
+    documento = leer_documento(origen)
+
+    if ruta_cache:
+        # Escritura atómica: varios hilos pueden poblar la caché a la vez y ninguno debe leer un documento a medias
+        os.makedirs(ruta_cache, exist_ok=True)
+        descriptor, temporal = tempfile.mkstemp(suffix='.tmp', dir=ruta_cache)
+        with os.fdopen(descriptor, 'w', encoding='utf-8') as archivo:
+            json.dump(documento, archivo)
+        os.replace(temporal, os.path.join(ruta_cache, nombre))
+    return documento
+
+def construir_servicio(api, version, http, ruta_cache=None, root_url=None):
+    """
+    Construye el cliente de la API con build_from_document.
+
+    Args:
+        api (str): Nombre de la API.
+        version (str): Versión de la API.
+        http: Transporte HTTP autorizado.
+        ruta_cache (str): Carpeta de caché opcional de documentos.
+        root_url (str): URL raíz alternativa (p. ej. un servidor local de pruebas).
+
+    Returns:
+        Resource: Cliente de la API.
+    """
+    documento = cargar_documento(api, version, ruta_cache)
+    if root_url:
+        documento = dict(documento)
+        documento['rootUrl'] = root_url.rstrip('/') + '/'
+        documento['mtlsRootUrl'] = documento['rootUrl']
+        documento['baseUrl'] = documento['rootUrl'] + documento.get('servicePath', '')
+    return build_from_document(documento, http=http)
@@ -0,0 +1,268 @@
+import os
+import json
+import time
+import hashlib
+import tempfile
+import mimetypes
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from googleapiclient.errors import HttpError
+from googleapiclient.http import MediaIoBaseUpload
+from modules.metricas import medir, sumar
+from .limitador import reintentable, retry_after
+
+VIGENCIA_SESION = 6 * 24 * 3600  # Drive mantiene una URI reanudable por una semana
+MAX_LOTE = 100                   # solicitudes por lote HTTP de la API de Drive
+PERMISO_PUBLICO = {'type': 'anyone', 'role': 'reader'}
+
+_estados = {}
+_lock = threading.Lock()
+
+def calcular_md5(ruta):
+    digesto = hashlib.md5()
+    with open(ruta, 'rb') as archivo:
+        for bloque in iter(lambda: archivo.read(1024 * 1024), b''):
+            digesto.update(bloque)
+    return digesto.hexdigest()
+
+def enlace_drive(file_id):
+    return f"https://drive.google.com/file/d/{file_id}/view?usp=sharing"
+
+class EstadoSubidas:
+    """
+    Estado persistente de las subidas a Drive, en un JSON local.
+
+    Guarda las URI de sesión reanudable de las subidas en curso y el file ID de
+    cada contenido ya subido (por MD5 y tamaño), junto con si ya se compartió.
+    """
+
+    def __init__(self, ruta):
+        self.ruta = ruta
+        self.lock = threading.Lock()
+        self.datos = {'sesiones': {}, 'archivos': {}}
+        if ruta and os.path.exists(ruta):
+            try:
+                with open(ruta, 'r', encoding='utf-8') as archivo:
+                    self.datos.update(json.load(archivo))
+            except (OSError, ValueError):
+                pass
+
+    def _guardar(self):
+        if not self.ruta:
+            return
+        carpeta = os.path.dirname(self.ruta) or '.'
+        os.makedirs(carpeta, exist_ok=True)
+        descriptor, temporal = tempfile.mkstemp(suffix='.tmp', dir=carpeta)
+        try:
+            with os.fdopen(descriptor, 'w', encoding='utf-8') as archivo:
+                json.dump(self.datos, archivo)
+            os.replace(temporal, self.ruta)
+        except BaseException:
+            os.remove(temporal)
+            raise
+
+    def sesion(self, clave):
+        with self.lock:
+            sesion = self.datos['sesiones'].get(clave)
+        if sesion and time.time() - sesion['inicio'] < VIGENCIA_SESION:
+            return sesion['uri']
+        return None
+
+    def guardar_sesion(self, clave, uri):
+        with self.lock:
+            self.datos['sesiones'][clave] = {'uri': uri, 'inicio': time.time()}
+            self._guardar()
+
+    def archivo(self, clave):
+        with self.lock:
+            return self.datos['archivos'].get(clave)
+
+    def guardar_archivo(self, clave, file_id, compartido=False):
+        with self.lock:
+            self.datos['sesiones'].pop(clave, None)
+            self.datos['archivos'][clave] = {'id': file_id, 'compartido': compartido}
+            self._guardar()
+
+    def olvidar(self, clave):
+        with self.lock:
+            self.datos['sesiones'].pop(clave, None)
+            self.datos['archivos'].pop(clave, None)
+            self._guardar()
+
+def obtener_estado(ruta):
+    """
+    Devuelve el estado de subidas del archivo `ruta`, creándolo en el primer uso.
+
+    Todos los SubidorDrive del proceso que usan el mismo archivo comparten el
+    objeto y su lock, así los envíos simultáneos no se pisan las entradas.
+    """
+    if not ruta:
+        return EstadoSubidas(None)
+    clave = os.path.abspath(ruta)
+    with _lock:
+        if clave not in _estados:
+            _estados[clave] = EstadoSubidas(ruta)
+        return _estados[clave]
+
+class SubidorDrive:
+    """
+    Sube archivos a Drive en paralelo y los comparte con permisos agrupados en lotes.
+
+    Cada archivo se sube con carga reanudable por bloques de `chunk_mb`; la URI de la
+    sesión se persiste, así una subida interrumpida continúa desde el último byte
+    confirmado en la siguiente ejecución. Un contenido ya subido (mismo MD5 y tamaño)
+    reutiliza su file ID en lugar de subirse otra vez. El pool de hilos de subida se
+    crea una vez y se reutiliza en cada envío hasta llamar a `cerrar`.
+
+    Args:
+        sesion (SesionCorreo): Sesión con clientes de Drive por hilo.
+        ruta_estado (str): Archivo JSON donde se persiste el estado de las subidas.
+        chunk_mb (int): Tamaño de cada bloque de la carga reanudable, en MB.
+        workers (int): Subidas simultáneas.
+        limitador (LimitadorEnvios): Reintenta los errores temporales y de límite; opcional.
+    """
+
+    def __init__(self, sesion, ruta_estado=None, chunk_mb=8, workers=4, limitador=None):
+        self.sesion = sesion
+        self.estado = obtener_estado(ruta_estado)
+        self.chunk = max(1, chunk_mb) * 1024 * 1024
+        self.workers = max(1, workers)
+        self.limitador = limitador
+        self.executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix='drive')
+
+    def _ejecutar(self, funcion, *args, medicion=None):
+        if self.limitador is None:
+            return funcion(*args)
+        return self.limitador.ejecutar(funcion, *args, medicion=medicion)
+
+    def _existente(self, archivo, clave, md5):
+        """
+        File ID de un contenido ya subido con el mismo MD5: primero el registrado
+        localmente (verificando que siga en Drive) y si no, uno con el mismo nombre.
+        """
+        drive = self.sesion.drive
+        registro = self.estado.archivo(clave)
+        if registro:
+            try:
+                encontrado = drive.files().get(fileId=registro['id'], fields='id, md5Checksum, trashed').execute()
+            except HttpError:
+                encontrado = None
+            if encontrado and not encontrado.get('trashed') and encontrado.get('md5Checksum') == md5:
+                return registro['id']
+            self.estado.olvidar(clave)
+
+        nombre = os.path.basename(archivo).replace('\\', '\\\\').replace("'", "\\'")
+        encontrados = drive.files().list(q=f"name = '{nombre}' and trashed = false", fields='files(id, md5Checksum)').execute()
+        for encontrado in encontrados.get('files', []):
+            if encontrado.get('md5Checksum') == md5:
+                self.estado.guardar_archivo(clave, encontrado['id'])
+                return encontrado['id']
+        return None
+
+    def _reanudar(self, request, uri, tamaño):
+        """
+        Consulta al servidor cuántos bytes de la sesión reanudable `uri` ya recibió y
+        deja `request` listo para continuar desde ahí.
+
+        Returns:
+            dict: La respuesta de Drive si la subida ya había terminado, o None.
+        """
+        resp, contenido = request.http.request(uri, 'PUT', headers={'Content-Range': f'bytes */{tamaño}', 'Content-Length': '0'})
+        if resp.status in (200, 201):
+            return request.postproc(resp, contenido)
+        if resp.status != 308:
+            raise HttpError(resp, contenido, uri=uri)
+        request.resumable_uri = uri
+        rango = resp.get('range')
+        request.resumable_progress = int(rango.split('-')[1]) + 1 if rango else 0
+        return None
+
+    def _subir(self, archivo, reintentar=True):
+        md5 = calcular_md5(archivo)
+        clave = f'{md5}:{os.path.getsize(archivo)}'
+        file_id = self._existente(archivo, clave, md5)
+        if file_id:
+            print(f"Archivo ya presente en Drive, se reutiliza: {os.path.basename(archivo)}")
+            return clave, file_id
+
+        tipo = mimetypes.guess_type(archivo)[0] or 'application/octet-stream'
+        try:
+            with open(archivo, 'rb') as contenido:
+                media = MediaIoBaseUpload(contenido, tipo, chunksize=self.chunk, resumable=True)
+                request = self.sesion.drive.files().create(body={'name': os.path.basename(archivo)}, media_body=media, fields='id, md5Checksum')
+                uri = self.estado.sesion(clave)
+                respuesta = self._reanudar(request, uri, media.size()) if uri else None
+                try:
+                    while respuesta is None:
+                        _, respuesta = request.next_chunk()
+                        if respuesta is None and request.resumable_uri != uri:
+                            uri = request.resumable_uri
+                            self.estado.guardar_sesion(clave, uri)
+                finally:
+                    if respuesta is None and request.resumable_uri and request.resumable_uri != uri:
+                        # Subida interrumpida: la sesión queda guardada para continuar en la próxima ejecución
+                        self.estado.guardar_sesion(clave, request.resumable_uri)
+        except HttpError as error:
+            if error.resp.status not in (404, 410) or not reintentar:
+                raise
+            # La sesión guardada expiró: se empieza una subida nueva
+            self.estado.olvidar(clave)
+            return self._subir(archivo, reintentar=False)
+        self.estado.guardar_archivo(clave, respuesta['id'])
+        return clave, respuesta['id']
+
+    def _compartir(self, subidos, medicion=None):
+        """
+        Crea los permisos de lectura pública en lotes HTTP de hasta MAX_LOTE solicitudes.
+
+        Cada solicitud de un lote puede fallar por separado; con limitador, solo las
+        que fallaron por errores temporales o de límite se reintentan en un lote nuevo.
+        """
+        pendientes = [(clave, file_id) for clave, file_id in subidos if not (self.estado.archivo(clave) or {}).get('compartido')]
+        drive = self.sesion.drive
+        intento = 0
+        while pendientes:
+            errores = {}
+
+            def respuesta(request_id, _, excepcion):
+                if excepcion is not None:
+                    errores[request_id] = excepcion
+
+            for inicio in range(0, len(pendientes), MAX_LOTE):
+                lote = drive.new_batch_http_request(callback=respuesta)
+                for clave, file_id in pendientes[inicio:inicio + MAX_LOTE]:
+                    lote.add(drive.permissions().create(fileId=file_id, body=PERMISO_PUBLICO), request_id=file_id)
+                self._ejecutar(lote.execute, medicion=medicion)
+            for clave, file_id in pendientes:
+                if file_id not in errores:
+                    self.estado.guardar_archivo(clave, file_id, compartido=True)
+            pendientes = [(clave, file_id) for clave, file_id in pendientes if file_id in errores]
+            if not errores:
+                break
+            # Se respeta el Retry-After más largo del lote antes de reintentar los fallidos
+            error = max(errores.values(), key=lambda excepcion: retry_after(excepcion) or 0)
+            reintentar = self.limitador is not None and all(reintentable(excepcion) for excepcion in errores.values())
+            if not reintentar or not self.limitador.esperar_reintento(intento, error, medicion):
+                raise RuntimeError(f"No se pudieron compartir archivos de Drive: {'; '.join(f'{file_id}: {excepcion}' for file_id, excepcion in errores.items())}")
+            intento += 1
+
+    def subir(self, archivos, medicion=None):
+        """
+        Sube y comparte los archivos.
+
+        Args:
+            archivos (list): Rutas de los archivos a subir.
+            medicion (dict): Acumula reintentos y esperas del limitador; opcional.
+
+        Returns:
+            list: Enlaces de Drive, en el mismo orden que `archivos`.
+        """
+        with medir('drive'):
+            # Un reintento de _subir continúa la sesión reanudable guardada, no empieza de cero
+            subidos = list(self.executor.map(lambda archivo: self._ejecutar(self._subir, archivo, medicion=medicion), archivos))
+            self._compartir(subidos, medicion)
+        sumar('archivos_drive', len(archivos))
+        return [enlace_drive(file_id) for _, file_id in subidos]
+
+    def cerrar(self):
+        self.executor.shutdown(wait=True)
@@ -1,8 +1,9 @@
 from .email_sender import enviar_correo_api, envio_correo_smtp
+from .plantillas import renderizar
 from datetime import datetime
 import os
 
-def enviar_informe(configuracion, excel, archivo_informe, lista_ejecucion, tipo='api'):
+def enviar_informe(configuracion, excel, archivo_informe, lista_ejecucion, tipo='api', sesion=None, transporte=None):
     if tipo not in ['smtp', 'api']:
         raise ValueError("El tipo de envío debe ser 'smtp' o 'api'.")
 
@@ -12,19 +13,16 @@ def enviar_informe(configuracion, excel, archivo_informe, lista_ejecucion, tipo=
 
     asunto = f'Informe de ejecucion Envio Correo a Recibidores - {datetime.now().strftime("%Y-%m-%d %H:%M:%S")}'
 
-    with open(configuracion.config.mail.template.report, 'r') as file:
-        cuerpo_html = file.read()
+    cuerpo_html = renderizar(configuracion.config.mail.template.report, asuntos_exitosos=''.join(asuntos_exitosos))
 
-    cuerpo_html = str(cuerpo_html).replace('{asuntos_exitosos}', ''.join(asuntos_exitosos))
-
-    destinatarios = [email.strip() for email in excel.config.email_reporte[0].lista_emails.replace(';', ',').split(',')]
+    destinatarios = list(excel.config.email_reporte[0].emails)
     copia = [email.strip() for email in configuracion.config.mail.sender.report.cc.replace(';', ',').split(',')]
     oculto = [email.strip() for email in configuracion.config.mail.sender.report.cco.replace(';', ',').split(',')]
 
     if tipo == 'api':
-        status = enviar_correo_api(configuracion, destinatarios, asunto, cuerpo_html, [archivo_informe], copia, oculto)
+        status = enviar_correo_api(configuracion, destinatarios, asunto, cuerpo_html, [archivo_informe], copia, oculto, sesion)
     else:
-        status = envio_correo_smtp(configuracion, configuracion.config.mail.config.smtp, destinatarios, asunto, cuerpo_html, [archivo_informe], copia, oculto)
+        status = envio_correo_smtp(configuracion, configuracion.config.mail.config.smtp, destinatarios, asunto, cuerpo_html, [archivo_informe], copia, oculto, transporte)
     
     return status
 '''
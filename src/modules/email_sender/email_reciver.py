@@ -1,26 +1,27 @@
 from .email_sender import enviar_correo_api, envio_correo_smtp
+from .plantillas import renderizar
 from datetime import datetime
 import os
 
-def enviar_reciver(configuracion, ruta, files, estructura, tipo='api'):
+def enviar_reciver(configuracion, ruta, files, estructura, tipo='api', sesion=None, transporte=None, asunto=None, tamaños=None):
     if tipo not in ['smtp', 'api']:
         raise ValueError("El tipo de envío debe ser 'smtp' o 'api'.")
 
-    with open(configuracion.config.mail.template.receiver, 'r') as file:
-        cuerpo_html = file.read()
-
-    cuerpo_html = str(cuerpo_html).replace('{cuerpo}', ''.join(estructura.cuerpo))
+    cuerpo_html = renderizar(configuracion.config.mail.template.receiver, cuerpo=''.join(estructura.cuerpo))
 
     archivos = [os.path.join(ruta, file) for file in files]
+    tamaños = {os.path.join(ruta, file): tamaños[file] for file in files if file in tamaños} if tamaños else None
 
-    destinatarios = [email.strip() for email in estructura.emails_para.replace(';', ',').split(',')]
-    copia = [email.strip() for email in estructura.emails_copia.replace(';', ',').split(',')]
+    destinatarios = list(estructura.destinatarios) or [email.strip() for email in estructura.emails_para.replace(';', ',').split(',')]
+    copia = list(estructura.copia) or [email.strip() for email in estructura.emails_copia.replace(';', ',').split(',')]
     oculto = [email.strip() for email in configuracion.config.mail.sender.report.cco.replace(';', ',').split(',')]
 
+    asunto = asunto or estructura.asunto
+
     if tipo == 'api':
-        status = enviar_correo_api(configuracion, destinatarios, estructura.asunto, cuerpo_html, archivos, copia, oculto)
+        status = enviar_correo_api(configuracion, destinatarios, asunto, cuerpo_html, archivos, copia, oculto, sesion, tamaños)
     else:
-        status = envio_correo_smtp(configuracion, configuracion.config.mail.config.smtp, destinatarios, estructura.asunto, cuerpo_html, archivos, copia, oculto)
+        status = envio_correo_smtp(configuracion, configuracion.config.mail.config.smtp, destinatarios, asunto, cuerpo_html, archivos, copia, oculto, transporte)
 
     return status
 '''
@@ -1,69 +1,96 @@
-import smtplib
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 from datetime import datetime
 import os
 import base64
-from google.oauth2.credentials import Credentials
-from google_auth_oauthlib.flow import InstalledAppFlow
-from googleapiclient.discovery import build
+from contextlib import contextmanager
 from googleapiclient.errors import HttpError
 from email.mime.base import MIMEBase
 from email import encoders
-from google.auth.transport.requests import Request
-from google.auth.exceptions import RefreshError
-from googleapiclient.http import MediaFileUpload
+from googleapiclient.http import MediaIoBaseUpload
 from email.header import Header  # Importar Header
+from .sesion import obtener_sesion
+from .smtp_pool import obtener_transporte
+from .limitador import obtener_limitador, nueva_medicion, pendiente
+from .mime_spool import mensaje_en_spool, mensaje_en_archivo, tamaño_base64
+from modules.pipeline.procesos import ejecutar_en_proceso, procesos_activos
 
-SCOPES = ['https://www.googleapis.com/auth/gmail.send', 'https://www.googleapis.com/auth/drive.file']
-CONFIG_PATH = 'src/configuration'
+LIMITE_API = 35 * 1024 * 1024     # Tamaño máximo de mensaje en messages.send con carga de medios
+LIMITE_CORREO = 25 * 1024 * 1024  # Tamaño máximo de mensaje por SMTP y en messages.send con raw
 
-def autenticar():
+def limite_mensaje_mb(configuracion):
     """
-    Autentica al usuario con OAuth 2.0 y devuelve las credenciales.
+    Tamaño máximo de cada correo ya codificado, en MB, según el transporte activo:
+    35 MB con la carga reanudable de la API y 25 MB por SMTP o con la API en modo raw.
+    Un mail.config.limit_mb mayor que 0 lo reduce.
     """
-    creds = None
-    token_path = os.path.join(CONFIG_PATH, 'token.json')
-    credentials_path = os.path.join(CONFIG_PATH, 'credentials.json')
-
-    if os.path.exists(token_path):
-        creds = Credentials.from_authorized_user_file(token_path, SCOPES)
-
-    if not creds or not creds.valid:
-        if creds and creds.expired and creds.refresh_token:
-            try:
-                creds.refresh(Request())
-            except RefreshError as error:
-                print(f"Error al refrescar el token: {error}")
-                os.remove(token_path)  # Delete the token file to force re-authentication
-                return autenticar()  # Retry authentication
-        else:
-            flow = InstalledAppFlow.from_client_secrets_file(credentials_path, SCOPES)
-            auth_url, _ = flow.authorization_url(access_type='offline', prompt='consent')
-            print(f"Visita esta URL para autorizar la aplicación: {auth_url}")
-            creds = flow.run_local_server(port=8989)
-
-        with open(token_path, 'w') as token_file:
-            token_file.write(creds.to_json())
-
-    return creds
-
-def subir_archivo_a_drive(service, archivo):
-    file_metadata = {'name': os.path.basename(archivo)}
-    media = MediaFileUpload(archivo, resumable=True)
-    file = service.files().create(body=file_metadata, media_body=media, fields='id').execute()
-    return file.get('id')
-
-def obtener_enlace_drive(service, file_id):
-    permission = {
-        'type': 'anyone',
-        'role': 'reader'
-    }
-    service.permissions().create(fileId=file_id, body=permission).execute()
-    link = f"https://drive.google.com/file/d/{file_id}/view?usp=sharing"
-    return link
-
-def enviar_correo_api(configuracion, destinatarios, asunto, cuerpo_html, archivos_adjuntos=None, cc=None, bcc=None):
+    mail = configuracion.config.mail.config
+    limite = LIMITE_API if mail.transport == 'api' and mail.api.upload_mode == 'resumable' else LIMITE_CORREO
+    limite /= 1024 * 1024
+    return min(limite, mail.limit_mb) if mail.limit_mb > 0 else limite
+
+def subir_mensaje(service, archivo, tamaño, chunk_mb):
+    if tamaño > LIMITE_API:
+        raise ValueError(f"El mensaje supera el límite de la API: {tamaño / (1024 * 1024):.2f} MB")
+    media = MediaIoBaseUpload(archivo, mimetype='message/rfc822', chunksize=chunk_mb * 1024 * 1024, resumable=True)
+    request = service.users().messages().send(userId="me", body={}, media_body=media)
+    send = None
+    while send is None:
+        _, send = request.next_chunk()
+    return send
+
+def enviar_mensaje_resumable(service, cabeceras, cuerpo_html, archivos_adjuntos, chunk_mb=8):
+    """
+    Envía el mensaje con la carga reanudable de messages.send (uploadType=resumable).
+
+    El mensaje RFC 822 se genera en un archivo temporal y se sube por bloques, de
+    modo que la memoria usada no depende del tamaño de los adjuntos. Si hay pool
+    de procesos, el armado MIME (base64) se hace en un proceso trabajador que
+    devuelve solo la ruta del archivo generado.
+    """
+    if procesos_activos():
+        ruta, tamaño = ejecutar_en_proceso(mensaje_en_archivo, cabeceras, cuerpo_html, archivos_adjuntos)
+        try:
+            with open(ruta, 'rb') as archivo:
+                return subir_mensaje(service, archivo, tamaño, chunk_mb)
+        finally:
+            os.remove(ruta)
+    spool, tamaño = mensaje_en_spool(cabeceras, cuerpo_html, archivos_adjuntos)
+    with spool:
+        return subir_mensaje(service, spool, tamaño, chunk_mb)
+
+@contextmanager
+def mensaje_smtp(cabeceras, cuerpo_html, archivos_adjuntos):
+    """
+    Genera el mensaje RFC 822 para SMTP en un archivo temporal, con los adjuntos
+    codificados en base64 por bloques, y lo entrega abierto junto con su tamaño.
+
+    Igual que en la carga reanudable de la API, si hay pool de procesos el armado
+    MIME se hace en un proceso trabajador; el archivo se borra al salir del bloque.
+    """
+    if procesos_activos():
+        ruta, tamaño = ejecutar_en_proceso(mensaje_en_archivo, cabeceras, cuerpo_html, archivos_adjuntos)
+        try:
+            with open(ruta, 'rb') as archivo:
+                yield archivo, tamaño
+        finally:
+            os.remove(ruta)
+    else:
+        spool, tamaño = mensaje_en_spool(cabeceras, cuerpo_html, archivos_adjuntos)
+        with spool:
+            yield spool, tamaño
+
+def resultado_envio(send, medicion):
+    if 'SENT' in send.get('labelIds', []):
+        descripcion = "Correo enviado correctamente."
+        print(descripcion)
+        return {'estado': True, 'descripcion': descripcion, **medicion}
+    else:
+        descripcion = "El correo no pudo ser enviado."
+        print(descripcion)
+        return {'estado': False, 'descripcion': descripcion, **medicion}
+
+def enviar_correo_api(configuracion, destinatarios, asunto, cuerpo_html, archivos_adjuntos=None, cc=None, bcc=None, sesion=None, tamaños=None):
     """
     Envía un correo utilizando la API de Gmail con OAuth 2.0.
 
@@ -74,14 +101,27 @@ def enviar_correo_api(configuracion, destinatarios, asunto, cuerpo_html, archivo
         archivos_adjuntos (list): Lista de rutas de archivos adjuntos.
         cc (list): Lista de destinatarios en copia.
         bcc (list): Lista de destinatarios en copia oculta.
+        sesion (SesionCorreo): Sesión compartida; por defecto la del proceso.
+        tamaños (dict): Tamaños en bytes ya conocidos por ruta de adjunto; esos archivos no se vuelven a consultar en disco.
 
     Returns:
-        dict: Diccionario con el estado y la descripción del resultado.
+        dict: Diccionario con el estado y la descripción del resultado, más los
+            reintentos y segundos de espera por límites de la API. En un fallo,
+            'pendiente' indica si el envío se retoma en la próxima ejecución.
     """
-    creds = autenticar()
+    conocidos = tamaños or {}
+    medicion = nueva_medicion()
+
+    def tamaño(archivo):
+        return conocidos[archivo] if archivo in conocidos else os.path.getsize(archivo)
+
+    def validar(archivo):
+        if archivo not in conocidos and not os.path.isfile(archivo):
+            raise ValueError(f"Archivo no encontrado: {archivo}")
+
     try:
-        service = build('gmail', 'v1', credentials=creds)
-        drive_service = build('drive', 'v3', credentials=creds)
+        sesion = sesion or obtener_sesion(configuracion)
+        service = sesion.gmail
         message = MIMEMultipart()
 
         # Validación y asignación de destinatarios
@@ -104,16 +144,34 @@ def enviar_correo_api(configuracion, destinatarios, asunto, cuerpo_html, archivo
 
         # Asignar asunto y contenido del mensaje
         message['Subject'] = asunto
+
+        # Cuota compartida por todos los hilos que envían con la cuenta de la API
+        limites = configuracion.config.mail.config.limits
+        limitador = obtener_limitador('api', limites)
+        cantidad_destinatarios = sum(len(valor.split(', ')) for clave, valor in message.items() if clave in ('To', 'Cc', 'Bcc'))
+
+        # Carga reanudable: el mensaje se genera en disco y se sube por bloques
+        api = configuracion.config.mail.config.api
+        if archivos_adjuntos and api.upload_mode == 'resumable':
+            for archivo in archivos_adjuntos:
+                validar(archivo)
+            archivos = [str(archivo).replace('\\', '/') for archivo in archivos_adjuntos]
+            tamaño_estimado = sum(tamaño_base64(tamaño(archivo)) for archivo in archivos_adjuntos)
+            if tamaño_estimado < LIMITE_API:
+                cabeceras = {clave: valor for clave, valor in message.items() if clave not in ('Content-Type', 'MIME-Version')}
+                send = limitador.ejecutar(enviar_mensaje_resumable, service, cabeceras, cuerpo_html, archivos, api.upload_chunk_mb,
+                                          unidades=limites.send_units, destinatarios=cantidad_destinatarios, medicion=medicion)
+                return resultado_envio(send, medicion)
+
         message.attach(MIMEText(cuerpo_html, 'html'))
 
         # Adjuntar archivos o subir a Drive si son mayores a 25 MB
         if archivos_adjuntos:
-            total_size = sum(os.path.getsize(archivo) for archivo in archivos_adjuntos)
+            total_size = sum(tamaño(archivo) for archivo in archivos_adjuntos)
             if total_size <= 25 * 1024 * 1024:  # 25 MB
                 for archivo in archivos_adjuntos:
+                    validar(archivo)
                     archivo_normalizado = str(archivo).replace('\\', '/')
-                    if not os.path.isfile(archivo_normalizado):
-                        raise ValueError(f"Archivo no encontrado: {archivo_normalizado}")
 
                     with open(archivo_normalizado, 'rb') as adjunto:
                         mime_base = MIMEBase('application', 'octet-stream')
@@ -123,87 +181,72 @@ def enviar_correo_api(configuracion, destinatarios, asunto, cuerpo_html, archivo
                         mime_base.add_header('Content-Disposition', f'attachment; filename="{nombre_archivo}"')
                         message.attach(mime_base)
             else:
-                enlaces_drive = []
-                for archivo in archivos_adjuntos:
-                    file_id = subir_archivo_a_drive(drive_service, archivo)
-                    enlace = obtener_enlace_drive(drive_service, file_id)
-                    enlaces_drive.append(enlace)
+                cache = configuracion.config.path.local.cache
+                subidor = sesion.subidor(f"{cache}/drive/subidas.json" if cache else None, api.drive_chunk_mb, api.drive_workers, limitador)
+                enlaces_drive = subidor.subir(archivos_adjuntos, medicion)
                 cuerpo_html += "<br><br>Archivos adjuntos:<br>" + "<br>".join(enlaces_drive)
 
         raw_message = base64.urlsafe_b64encode(message.as_bytes()).decode()
         send_message = {'raw': raw_message}
 
-        send = service.users().messages().send(userId="me", body=send_message).execute()
-        if 'SENT' in send.get('labelIds', []):
-            descripcion = "Correo enviado correctamente."
-            print(descripcion)
-            return {'estado': True, 'descripcion': descripcion}
-        else:
-            descripcion = "El correo no pudo ser enviado."
-            print(descripcion)
-            return {'estado': False, 'descripcion': descripcion}
+        send = limitador.ejecutar(service.users().messages().send(userId="me", body=send_message).execute,
+                                  unidades=limites.send_units, destinatarios=cantidad_destinatarios, medicion=medicion)
+        return resultado_envio(send, medicion)
 
     except HttpError as error:
         descripcion = f"Un error ocurrió: {error}"
         print(descripcion)
-        return {'estado': False, 'descripcion': descripcion}
+        return {'estado': False, 'descripcion': descripcion, 'pendiente': pendiente(error), **medicion}
     except Exception as e:
         descripcion = f"Ocurrió un error inesperado: {e}"
         print(descripcion)
-        return {'estado': False, 'descripcion': descripcion}
+        return {'estado': False, 'descripcion': descripcion, 'pendiente': pendiente(e), **medicion}
 
-def envio_correo_smtp(config_global, configuracion, destinatarios, asunto, cuerpo_html, archivos_adjuntos=None, cc=None, bcc=None):
+def envio_correo_smtp(config_global, configuracion, destinatarios, asunto, cuerpo_html, archivos_adjuntos=None, cc=None, bcc=None, transporte=None):
     """
     Envía un correo usando Gmail.
 
     Args:
+        configuracion (SMTPConfig): Configuración del servidor SMTP.
         destinatarios (list): Lista de correos electrónicos de los destinatarios principales.
         asunto (str): Asunto del correo.
         cuerpo_html (str): Contenido del correo en formato HTML.
         archivos_adjuntos (list): Lista de rutas de archivos a adjuntar (opcional).
         cc (list): Lista de correos electrónicos en copia (opcional).
         bcc (list): Lista de correos electrónicos en copia oculta (opcional).
+        transporte (TransporteSMTP): Pool de conexiones; por defecto el del proceso.
 
     Returns:
-        dict: Diccionario con el estado y la descripción del resultado.
+        dict: Diccionario con el estado y la descripción del resultado, más los
+            reintentos y segundos de espera por límites del servidor. En un fallo,
+            'pendiente' indica si el envío se retoma en la próxima ejecución.
     """
-    GMAIL_USER = configuracion['gmail_user']
-    GMAIL_PASSWORD = configuracion['gmail_password']
-    SMTP_SERVER = configuracion['smtp_server']
-    SMTP_PORT = configuracion['smtp_port']
+    GMAIL_USER = configuracion.user
+    medicion = nueva_medicion()
 
     try:
-        # Configurar el correo
-        msg = MIMEMultipart()
-        msg['From'] = GMAIL_USER
-        msg['To'] = ", ".join(destinatarios)
-        msg['Cc'] = ", ".join(cc) if cc else ""
-        msg['Bcc'] = ", ".join(bcc) if bcc else ""
-        msg['Subject'] = asunto
-
-        # Adjuntar contenido HTML
-        msg.attach(MIMEText(cuerpo_html, 'html'))
-
-        # Adjuntar archivos
-        if archivos_adjuntos:
-            for archivo in archivos_adjuntos:
-                with open(archivo, 'rb') as f:
-                    part = MIMEBase('application', 'octet-stream')
-                    part.set_payload(f.read())
-                    encoders.encode_base64(part)
-                    part.add_header('Content-Disposition', f'attachment; filename={os.path.basename(archivo)}')
-                    msg.attach(part)
-
-        # Conectar al servidor y enviar el correo
-        with smtplib.SMTP(SMTP_SERVER, SMTP_PORT) as server:
-            server.starttls()
-            server.login(GMAIL_USER, GMAIL_PASSWORD)
-            server.sendmail(GMAIL_USER, destinatarios + (cc or []) + (bcc or []), msg.as_string())
-            descripcion = "Correo enviado correctamente."
-            print(descripcion)
-            return {'estado': True, 'descripcion': descripcion}
+        cabeceras = {
+            'From': GMAIL_USER,
+            'To': ", ".join(destinatarios),
+            'Cc': ", ".join(cc) if cc else "",
+            'Bcc': ", ".join(bcc) if bcc else "",
+            'Subject': asunto
+        }
+        for archivo in archivos_adjuntos or []:
+            if not os.path.isfile(archivo):
+                raise ValueError(f"Archivo no encontrado: {archivo}")
+
+        # Enviar por una conexión persistente del pool
+        transporte = transporte or obtener_transporte(configuracion)
+        destinos = [correo for correo in destinatarios + (cc or []) + (bcc or []) if correo]
+        limitador = obtener_limitador(GMAIL_USER, config_global.config.mail.config.limits)
+        with mensaje_smtp(cabeceras, cuerpo_html, archivos_adjuntos) as (archivo, tamaño):
+            limitador.ejecutar(transporte.enviar_archivo, GMAIL_USER, destinos, archivo, tamaño, destinatarios=len(destinos), medicion=medicion)
+        descripcion = "Correo enviado correctamente."
+        print(descripcion)
+        return {'estado': True, 'descripcion': descripcion, **medicion}
 
     except Exception as e:
         descripcion = f"Error al enviar el correo: {e}"
         print(descripcion)
-        return {'estado': False, 'descripcion': descripcion}
\ No newline at end of file
+        return {'estado': False, 'descripcion': descripcion, 'pendiente': pendiente(e), **medicion}
\ No newline at end of file
@@ -4,45 +4,14 @@ from email.mime.multipart import MIMEMultipart
 from datetime import datetime
 import os
 import base64
-from google.oauth2.credentials import Credentials
-from google_auth_oauthlib.flow import InstalledAppFlow
-from googleapiclient.discovery import build
 from googleapiclient.errors import HttpError
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 from email.mime.base import MIMEBase
 from email import encoders
-from google.auth.transport.requests import Request
+from .sesion import obtener_sesion
 
-SCOPES = ['https://www.googleapis.com/auth/gmail.send']
-CONFIG_PATH = 'src/configuration'
-
-def autenticar():
-    """
-    Autentica al usuario con OAuth 2.0 y devuelve las credenciales.
-    """
-    creds = None
-    token_path = os.path.join(CONFIG_PATH, 'token.json')
-    credentials_path = os.path.join(CONFIG_PATH, 'credentials.json')
-
-    if os.path.exists(token_path):
-        creds = Credentials.from_authorized_user_file(token_path, SCOPES)
-
-    if not creds or not creds.valid:
-            if creds and creds.expired and creds.refresh_token:
-                creds.refresh(Request())
-            else:
-                flow = InstalledAppFlow.from_client_secrets_file(credentials_path, SCOPES)
-                auth_url, _ = flow.authorization_url(access_type='offline', prompt='consent')
-                print(f"Visita esta URL para autorizar la aplicación: {auth_url}")
-                creds = flow.run_local_server(port=8989)
-
-            with open(token_path, 'w') as token_file:
-                token_file.write(creds.to_json())
-
-    return creds
-
-def enviar_correo_api(configuracion, destinatarios, asunto, cuerpo_html, archivos_adjuntos=None,  cc=None, bcc=None):
+def enviar_correo_api(configuracion, destinatarios, asunto, cuerpo_html, archivos_adjuntos=None,  cc=None, bcc=None, sesion=None):
     """
     Envía un correo utilizando la API de Gmail con OAuth 2.0.
 
@@ -52,13 +21,14 @@ def enviar_correo_api(configuracion, destinatarios, asunto, cuerpo_html, archivo
         cuerpo_html (str): Contenido HTML del correo.
         archivos_adjuntos (list): Lista de rutas de archivos adjuntos.
         cc (list): Lista de destinatarios en copia.
+        sesion (SesionCorreo): Sesión compartida; por defecto la del proceso.
 
     Returns:
         bool: True si el correo se envió correctamente, False en caso contrario.
     """
-    creds = autenticar()
     try:
-        service = build('gmail', 'v1', credentials=creds)
+        sesion = sesion or obtener_sesion(configuracion)
+        service = sesion.gmail
         message = MIMEMultipart()
 
         # Validación y asignación de destinatarios
@@ -1,25 +1,23 @@
-from .email_sender_vacio import enviar_correo_api, envio_correo_smtp
+from .email_sender import enviar_correo_api, envio_correo_smtp
+from .plantillas import renderizar
 from datetime import datetime
 import os
 
-def enviar_vacio(configuracion, excel, tipo='api'):
+def enviar_vacio(configuracion, excel, tipo='api', sesion=None, transporte=None):
     if tipo not in ['smtp', 'api']:
         raise ValueError("El tipo de envío debe ser 'smtp' o 'api'.")
 
     asunto = f'Informe de ejecucion Envio Correo a Recibidores - {datetime.now().strftime("%Y-%m-%d %H:%M:%S")}'
 
-    with open(configuracion.config.mail.template.empty, 'r') as file:
-        cuerpo_html = file.read()
+    cuerpo_html = renderizar(configuracion.config.mail.template.empty)
 
-    cuerpo_html = str(cuerpo_html)
-
-    destinatarios = [email.strip() for email in excel.config.email_reporte[0].lista_emails.replace(';', ',').split(',')]
+    destinatarios = list(excel.config.email_reporte[0].emails)
     copia = [email.strip() for email in configuracion.config.mail.sender.report.cc.replace(';', ',').split(',')]
     oculto = [email.strip() for email in configuracion.config.mail.sender.report.cco.replace(';', ',').split(',')]
 
     if tipo == 'api':
-        status = enviar_correo_api(configuracion, destinatarios, asunto, cuerpo_html, [], copia, oculto)
+        status = enviar_correo_api(configuracion, destinatarios, asunto, cuerpo_html, [], copia, oculto, sesion)
     else:
-        status = envio_correo_smtp(configuracion, configuracion.config.mail.config.smtp, destinatarios, asunto, cuerpo_html, [], copia, oculto)
+        status = envio_correo_smtp(configuracion, configuracion.config.mail.config.smtp, destinatarios, asunto, cuerpo_html, [], copia, oculto, transporte)
     
     return status
\ No newline at end of file
@@ -0,0 +1,232 @@
+import time
+import random
+import smtplib
+import threading
+from email.utils import parsedate_to_datetime
+from googleapiclient.errors import HttpError
+
+ESTADOS_REINTENTABLES = {429, 500, 502, 503, 504}
+RAZONES_LIMITE = {'rateLimitExceeded', 'userRateLimitExceeded', 'RATE_LIMIT_EXCEEDED'}
+CODIGOS_SMTP_TEMPORALES = {421, 450, 451, 452, 454}
+SEGUNDOS_DIA = 24 * 3600
+
+_limitadores = {}
+_lock = threading.Lock()
+
+class CuotaExcedida(RuntimeError):
+    """
+    La cuota disponible no alcanza dentro de la espera máxima; el envío queda
+    pendiente para la próxima ejecución.
+    """
+
+def nueva_medicion():
+    return {'reintentos': 0, 'limitados': 0, 'espera_cuota': 0.0, 'espera_reintentos': 0.0}
+
+class CuboTokens:
+    """
+    Cubo de tokens con recarga continua y seguro entre hilos.
+
+    Las reservas pueden dejar el cubo en negativo: cada hilo descuenta lo que usa
+    y espera fuera del lock el tiempo que tarde en recargarse su parte, de modo
+    que los envíos concurrentes se reparten la cuota en orden de llegada.
+    """
+
+    def __init__(self, capacidad, recarga):
+        self.capacidad = float(capacidad)
+        self.recarga = float(recarga)
+        self.tokens = float(capacidad)
+        self.ultimo = time.monotonic()
+        self.lock = threading.Lock()
+
+    def _recargar(self):
+        ahora = time.monotonic()
+        self.tokens = min(self.capacidad, self.tokens + (ahora - self.ultimo) * self.recarga)
+        self.ultimo = ahora
+
+    def reservar(self, cantidad):
+        """
+        Descuenta `cantidad` tokens y devuelve los segundos a esperar antes de usarlos.
+        """
+        cantidad = min(float(cantidad), self.capacidad)
+        with self.lock:
+            self._recargar()
+            self.tokens -= cantidad
+            return 0.0 if self.tokens >= 0 else -self.tokens / self.recarga
+
+    def devolver(self, cantidad):
+        with self.lock:
+            self._recargar()
+            self.tokens = min(self.capacidad, self.tokens + min(float(cantidad), self.capacidad))
+
+def retry_after(error):
+    """
+    Segundos indicados por la cabecera Retry-After de una respuesta HTTP, si viene.
+    """
+    resp = getattr(error, 'resp', None)
+    valor = resp.get('retry-after') if resp is not None else None
+    if not valor:
+        return None
+    try:
+        return max(0.0, float(valor))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(valor).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+def es_limite(error):
+    """
+    Indica si el error es un rechazo por límite de tasa (429 o 403 rateLimitExceeded).
+    """
+    if not isinstance(error, HttpError):
+        return isinstance(error, smtplib.SMTPResponseException) and error.smtp_code == 421
+    if error.resp.status == 429:
+        return True
+    detalles = error.error_details if isinstance(error.error_details, list) else []
+    return error.resp.status == 403 and any(isinstance(detalle, dict) and detalle.get('reason') in RAZONES_LIMITE for detalle in detalles)
+
+def reintentable(error):
+    if isinstance(error, HttpError):
+        return error.resp.status in ESTADOS_REINTENTABLES or es_limite(error)
+    if isinstance(error, smtplib.SMTPResponseException):
+        return error.smtp_code in CODIGOS_SMTP_TEMPORALES
+    return isinstance(error, (ConnectionError, TimeoutError, smtplib.SMTPServerDisconnected))
+
+def pendiente(error):
+    """
+    Indica si un envío que falló con este error debe retomarse en la próxima
+    ejecución: cuota agotada o error temporal con los reintentos agotados.
+    """
+    return isinstance(error, CuotaExcedida) or reintentable(error)
+
+class LimitadorEnvios:
+    """
+    Limitador de envíos de una cuenta: cuota de unidades de la API por segundo y
+    destinatarios por día, con reintentos con backoff exponencial y jitter.
+
+    Los cubos viven en memoria del proceso: en modo daemon la cuota diaria se
+    respeta entre lotes, y en ejecuciones sueltas el servidor sigue siendo el
+    árbitro final (sus 429 se reintentan respetando Retry-After).
+
+    Args:
+        unidades_por_segundo (float): Unidades de cuota de la API por segundo (0 = sin límite).
+        destinatarios_por_dia (int): Destinatarios por día (0 = sin límite).
+        reintentos (int): Reintentos ante errores temporales o de límite.
+        espera_base (float): Espera base del backoff exponencial, en segundos.
+        espera_maxima (float): Tope del backoff exponencial, en segundos.
+        espera_cuota_maxima (float): Espera máxima aceptada por cuota o Retry-After;
+            si hay que esperar más, el envío falla y se retoma en la próxima ejecución.
+    """
+
+    def __init__(self, unidades_por_segundo=250, destinatarios_por_dia=2000, reintentos=5, espera_base=1, espera_maxima=64, espera_cuota_maxima=300):
+        self.unidades = CuboTokens(unidades_por_segundo, unidades_por_segundo) if unidades_por_segundo > 0 else None
+        self.destinatarios = CuboTokens(destinatarios_por_dia, destinatarios_por_dia / SEGUNDOS_DIA) if destinatarios_por_dia > 0 else None
+        self.reintentos = reintentos
+        self.espera_base = espera_base
+        self.espera_maxima = espera_maxima
+        self.espera_cuota_maxima = espera_cuota_maxima
+        self.contadores = dict(nueva_medicion(), llamadas=0)
+        self.lock = threading.Lock()
+
+    def _sumar(self, medicion, **valores):
+        with self.lock:
+            for clave, valor in valores.items():
+                self.contadores[clave] += valor
+                if medicion is not None:
+                    medicion[clave] = medicion.get(clave, 0) + valor
+
+    def _adquirir(self, unidades, destinatarios, medicion):
+        reservas = [(cubo, cantidad) for cubo, cantidad in ((self.unidades, unidades), (self.destinatarios, destinatarios)) if cubo is not None and cantidad > 0]
+        espera = max([cubo.reservar(cantidad) for cubo, cantidad in reservas], default=0.0)
+        if espera > self.espera_cuota_maxima:
+            for cubo, cantidad in reservas:
+                cubo.devolver(cantidad)
+            raise CuotaExcedida(f"Cuota de envío agotada: habría que esperar {espera:.0f} s (máximo {self.espera_cuota_maxima:.0f} s).")
+        if espera > 0:
+            time.sleep(espera)
+            self._sumar(medicion, espera_cuota=espera)
+
+    def espera_reintento(self, intento, error):
+        """
+        Backoff exponencial con jitter completo; si el servidor indica Retry-After, se espera al menos eso.
+        """
+        espera = random.uniform(0, min(self.espera_maxima, self.espera_base * 2 ** intento))
+        indicada = retry_after(error)
+        return max(espera, indicada) if indicada is not None else espera
+
+    def esperar_reintento(self, intento, error, medicion=None):
+        """
+        Espera antes del reintento número `intento` + 1 y la registra en los contadores.
+
+        Returns:
+            bool: False si el error no se reintenta (agotados los reintentos, no
+                temporal, o Retry-After mayor que la espera máxima).
+        """
+        if intento >= self.reintentos or not reintentable(error):
+            return False
+        espera = self.espera_reintento(intento, error)
+        if espera > self.espera_cuota_maxima:
+            return False
+        print(f"Error temporal o de límite ({error}); reintento {intento + 1}/{self.reintentos} en {espera:.1f} s.")
+        time.sleep(espera)
+        self._sumar(medicion, reintentos=1, limitados=int(es_limite(error)), espera_reintentos=espera)
+        return True
+
+    def ejecutar(self, funcion, *args, unidades=0, destinatarios=0, medicion=None, **kwargs):
+        """
+        Ejecuta la llamada descontando la cuota y reintentando los errores temporales.
+
+        Args:
+            funcion (callable): Llamada que envía o sube.
+            unidades (int): Unidades de cuota de la API que consume cada intento.
+            destinatarios (int): Destinatarios del mensaje; se descuentan una sola vez.
+            medicion (dict): Acumula esperas y reintentos de esta llamada (ver nueva_medicion).
+
+        Returns:
+            El resultado de `funcion`.
+        """
+        intento = 0
+        while True:
+            self._adquirir(unidades, destinatarios, medicion)
+            destinatarios = 0  # un intento rechazado no llegó a los destinatarios
+            self._sumar(None, llamadas=1)
+            try:
+                return funcion(*args, **kwargs)
+            except Exception as error:
+                if not self.esperar_reintento(intento, error, medicion):
+                    raise
+                intento += 1
+
+def crear_limitador(limites):
+    return LimitadorEnvios(
+        limites.quota_units_per_second,
+        limites.recipients_per_day,
+        reintentos=limites.retries,
+        espera_base=limites.backoff_seconds,
+        espera_maxima=limites.backoff_max_seconds,
+        espera_cuota_maxima=limites.max_wait_seconds
+    )
+
+def obtener_limitador(cuenta, limites):
+    """
+    Devuelve el limitador de la cuenta, creándolo en el primer uso; todos los hilos
+    que envían con la misma cuenta comparten sus cubos.
+    """
+    with _lock:
+        if cuenta not in _limitadores:
+            _limitadores[cuenta] = crear_limitador(limites)
+        return _limitadores[cuenta]
+
+def resumen_limitadores():
+    """
+    Suma los contadores de todos los limitadores del proceso.
+    """
+    resumen = dict(nueva_medicion(), llamadas=0)
+    with _lock:
+        limitadores = list(_limitadores.values())
+    for limitador in limitadores:
+        with limitador.lock:
+            for clave, valor in limitador.contadores.items():
+                resumen[clave] += valor
+    return resumen
\ No newline at end of file
@@ -0,0 +1,116 @@
+import os
+import base64
+import tempfile
+from email import policy
+from email.header import Header
+from email.mime.base import MIMEBase
+from email.mime.text import MIMEText
+from email.generator import _make_boundary
+
+LINEA_BASE64 = 57                      # bytes de entrada por línea de 76 caracteres
+BLOQUE_LECTURA = LINEA_BASE64 * 18396  # ~1 MB, siempre líneas completas
+MEMORIA_SPOOL = 1024 * 1024
+CABECERAS_DIRECCION = {'from', 'to', 'cc', 'bcc', 'reply-to'}
+COMPAT32_SMTP = policy.compat32.clone(linesep='\r\n')
+
+def tamaño_base64(tamaño):
+    """
+    Tamaño exacto en bytes de un adjunto codificado en base64 con líneas CRLF de 76 caracteres.
+    """
+    if tamaño <= 0:
+        return 0
+    lineas = -(-tamaño // LINEA_BASE64)
+    return 4 * (-(-tamaño // 3)) + 2 * lineas
+
+def cabecera(nombre, valor):
+    """
+    Cabecera plegada con CRLF y codificada en ASCII. En las de direcciones solo los
+    nombres no ASCII van como encoded-words RFC 2047; en el resto (asunto) el valor
+    se codifica completo, como lo hace email.header.Header.
+    """
+    if nombre.lower() in CABECERAS_DIRECCION:
+        return policy.SMTP.fold(nombre, policy.SMTP.header_factory(nombre, valor)).encode('ascii')
+    return COMPAT32_SMTP.fold(nombre, valor).encode('ascii')
+
+def escribir_base64(origen, destino):
+    """
+    Codifica un archivo en base64 por bloques, sin cargarlo completo en memoria.
+    """
+    with open(origen, 'rb') as archivo:
+        while True:
+            bloque = archivo.read(BLOQUE_LECTURA)
+            if not bloque:
+                break
+            codificado = base64.b64encode(bloque)
+            for inicio in range(0, len(codificado), 76):
+                destino.write(codificado[inicio:inicio + 76])
+                destino.write(b'\r\n')
+
+def escribir_mensaje(destino, cabeceras, cuerpo_html, archivos_adjuntos=None):
+    """
+    Escribe un mensaje RFC 822 multipart/mixed en un archivo abierto en modo binario.
+
+    Args:
+        destino: Archivo binario de salida.
+        cabeceras (dict): Cabeceras de nivel superior (To, Cc, Bcc, Subject, ...).
+        cuerpo_html (str): Contenido HTML del correo.
+        archivos_adjuntos (list): Rutas de los archivos a adjuntar.
+
+    Returns:
+        int: Bytes escritos.
+    """
+    inicio = destino.tell()
+    limite = _make_boundary()
+    separador = f'--{limite}\r\n'.encode()
+
+    destino.write(cabecera('Content-Type', f'multipart/mixed; boundary="{limite}"'))
+    destino.write(cabecera('MIME-Version', '1.0'))
+    for nombre, valor in cabeceras.items():
+        if valor:
+            destino.write(cabecera(nombre, valor))
+    destino.write(b'\r\n')
+
+    destino.write(separador)
+    destino.write(MIMEText(cuerpo_html, 'html').as_bytes(policy=policy.SMTP))
+    destino.write(b'\r\n')
+
+    for archivo in archivos_adjuntos or []:
+        parte = MIMEBase('application', 'octet-stream')
+        parte['Content-Transfer-Encoding'] = 'base64'
+        nombre_archivo = Header(os.path.basename(archivo), 'utf-8').encode()
+        parte.add_header('Content-Disposition', f'attachment; filename="{nombre_archivo}"')
+        destino.write(separador)
+        for nombre, valor in parte.items():
+            destino.write(cabecera(nombre, valor))
+        destino.write(b'\r\n')
+        escribir_base64(archivo, destino)
+
+    destino.write(f'--{limite}--\r\n'.encode())
+    return destino.tell() - inicio
+
+def mensaje_en_archivo(cabeceras, cuerpo_html, archivos_adjuntos=None, carpeta=None):
+    """
+    Construye el mensaje en un archivo temporal en disco.
+
+    Pensada para ejecutarse en un proceso trabajador: devuelve solo la ruta y el
+    tamaño, y quien la llama se encarga de borrar el archivo.
+
+    Returns:
+        tuple: (ruta del archivo .eml, tamaño en bytes).
+    """
+    descriptor, ruta = tempfile.mkstemp(suffix='.eml', dir=carpeta)
+    with os.fdopen(descriptor, 'wb') as destino:
+        tamaño = escribir_mensaje(destino, cabeceras, cuerpo_html, archivos_adjuntos)
+    return ruta, tamaño
+
+def mensaje_en_spool(cabeceras, cuerpo_html, archivos_adjuntos=None, memoria=MEMORIA_SPOOL):
+    """
+    Construye el mensaje en un archivo temporal que solo pasa a disco al superar `memoria`.
+
+    Returns:
+        tuple: (SpooledTemporaryFile posicionado al inicio, tamaño en bytes).
+    """
+    spool = tempfile.SpooledTemporaryFile(max_size=memoria)
+    tamaño = escribir_mensaje(spool, cabeceras, cuerpo_html, archivos_adjuntos)
+    spool.seek(0)
+    return spool, tamaño
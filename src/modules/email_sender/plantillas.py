@@ -0,0 +1,94 @@
+import os
+import re
+import threading
+from collections import OrderedDict
+
+MARCADOR = re.compile(r'\{([A-Za-z_][A-Za-z0-9_]*)\}')
+MAX_RENDERIZADOS = 128
+
+class Plantilla:
+    """
+    Plantilla HTML precompilada.
+
+    El texto se divide una sola vez en tramos literales y marcadores {nombre};
+    renderizar solo une los tramos. Los marcadores sin valor se dejan tal cual,
+    igual que con str.replace, y las llaves del CSS no se tocan.
+    """
+
+    def __init__(self, ruta):
+        self.ruta = ruta
+        self.mtime = os.stat(ruta).st_mtime_ns
+        with open(ruta, 'r', encoding='utf-8') as archivo:
+            self.texto = archivo.read()
+        self.plan = self._compilar(self.texto)
+
+    @staticmethod
+    def _compilar(texto):
+        plan = []
+        posicion = 0
+        for marcador in MARCADOR.finditer(texto):
+            plan.append((False, texto[posicion:marcador.start()]))
+            plan.append((True, marcador.group(1)))
+            posicion = marcador.end()
+        plan.append((False, texto[posicion:]))
+        return plan
+
+    def renderizar(self, **valores):
+        partes = []
+        for es_marcador, parte in self.plan:
+            if not es_marcador:
+                partes.append(parte)
+            elif parte in valores:
+                partes.append(str(valores[parte]))
+            else:
+                partes.append(f'{{{parte}}}')
+        return ''.join(partes)
+
+class RegistroPlantillas:
+    """
+    Registro de plantillas del proceso.
+
+    Carga cada plantilla una vez, la recarga si cambia su mtime y memoriza los
+    cuerpos renderizados (p. ej. uno por caso de distribución) con desalojo LRU.
+    """
+
+    def __init__(self, max_renderizados=MAX_RENDERIZADOS):
+        self.plantillas = {}
+        self.renderizados = OrderedDict()
+        self.max_renderizados = max_renderizados
+        self.lock = threading.Lock()
+
+    def obtener(self, ruta):
+        with self.lock:
+            plantilla = self.plantillas.get(ruta)
+            if plantilla is None or plantilla.mtime != os.stat(ruta).st_mtime_ns:
+                plantilla = Plantilla(ruta)
+                self.plantillas[ruta] = plantilla
+            return plantilla
+
+    def renderizar(self, ruta, **valores):
+        plantilla = self.obtener(ruta)
+        clave = (ruta, plantilla.mtime, tuple(sorted(valores.items())))
+        with self.lock:
+            if clave in self.renderizados:
+                self.renderizados.move_to_end(clave)
+                return self.renderizados[clave]
+        cuerpo = plantilla.renderizar(**valores)
+        with self.lock:
+            self.renderizados[clave] = cuerpo
+            if len(self.renderizados) > self.max_renderizados:
+                self.renderizados.popitem(last=False)
+        return cuerpo
+
+    def limpiar(self):
+        with self.lock:
+            self.plantillas.clear()
+            self.renderizados.clear()
+
+REGISTRO = RegistroPlantillas()
+
+def renderizar(ruta, **valores):
+    """
+    Renderiza la plantilla de `ruta` con el registro del proceso.
+    """
+    return REGISTRO.renderizar(ruta, **valores)
@@ -0,0 +1,184 @@
+import os
+import weakref
+import threading
+from google.oauth2.credentials import Credentials
+from google_auth_oauthlib.flow import InstalledAppFlow
+from google_auth_httplib2 import AuthorizedHttp
+from googleapiclient.http import build_http
+from google.auth.transport.requests import Request
+from google.auth.exceptions import RefreshError
+from .discovery import construir_servicio
+from .drive import SubidorDrive
+
+SCOPES = ['https://www.googleapis.com/auth/gmail.send', 'https://www.googleapis.com/auth/drive.file']
+CONFIG_PATH = 'src/configuration'
+TIMEOUT_HTTP = 120
+
+_sesion = None
+_lock = threading.Lock()
+
+def autenticar(token_path=None, credentials_path=None):
+    """
+    Autentica al usuario con OAuth 2.0 y devuelve las credenciales.
+
+    Args:
+        token_path (str): Archivo del token; por defecto token.json en CONFIG_PATH.
+        credentials_path (str): Secreto del cliente OAuth; por defecto credentials.json en CONFIG_PATH.
+    """
+    creds = None
+    token_path = token_path or os.path.join(CONFIG_PATH, 'token.json')
+    credentials_path = credentials_path or os.path.join(CONFIG_PATH, 'credentials.json')
+
+    if os.path.exists(token_path):
+        creds = Credentials.from_authorized_user_file(token_path, SCOPES)
+
+    if not creds or not creds.valid:
+        if creds and creds.expired and creds.refresh_token:
+            try:
+                creds.refresh(Request())
+            except RefreshError as error:
+                print(f"Error al refrescar el token: {error}")
+                os.remove(token_path)  # Delete the token file to force re-authentication
+                return autenticar(token_path, credentials_path)  # Retry authentication
+        else:
+            flow = InstalledAppFlow.from_client_secrets_file(credentials_path, SCOPES)
+            auth_url, _ = flow.authorization_url(access_type='offline', prompt='consent')
+            print(f"Visita esta URL para autorizar la aplicación: {auth_url}")
+            creds = flow.run_local_server(port=8989)
+
+        with open(token_path, 'w') as token_file:
+            token_file.write(creds.to_json())
+
+    return creds
+
+class ClientesHilo:
+    """
+    Transporte HTTP y servicios de Gmail y Drive de un hilo.
+    """
+
+    def __init__(self, creds, ruta_cache, root_url):
+        http = build_http()  # no trata el 308 de las cargas reanudables como redirección
+        http.timeout = TIMEOUT_HTTP
+        self.http = AuthorizedHttp(creds, http=http)
+        self.gmail = construir_servicio('gmail', 'v1', self.http, ruta_cache, root_url)
+        self.drive = construir_servicio('drive', 'v3', self.http, ruta_cache, root_url)
+
+    def cerrar(self):
+        for conexion in self.http.http.connections.values():
+            conexion.close()
+        self.http.http.connections.clear()
+
+class SesionCorreo:
+    """
+    Sesión de correo compartida durante toda la ejecución.
+
+    Mantiene las credenciales, los servicios de Gmail y Drive y un transporte
+    HTTP persistente (keep-alive), de modo que cada envío solo paga la llamada
+    a la API. httplib2 no es seguro entre hilos, así que cada hilo que envía
+    obtiene su propio transporte y servicios; las credenciales se comparten.
+
+    El pipeline crea hilos nuevos en cada ejecución (en modo daemon, en cada
+    lote): los clientes de los hilos que ya terminaron se cierran y se descartan
+    al crear los de un hilo nuevo, así las conexiones abiertas no se acumulan.
+    """
+
+    def __init__(self, creds=None, ruta_cache=None, root_url=None):
+        self.creds = creds or autenticar()
+        self.ruta_cache = ruta_cache
+        self.root_url = root_url
+        self._local = threading.local()
+        self._clientes = []
+        self._subidores = {}
+        self._lock = threading.Lock()
+
+    def _clientes_hilo(self):
+        clientes = getattr(self._local, 'clientes', None)
+        if clientes is None:
+            clientes = ClientesHilo(self.creds, self.ruta_cache, self.root_url)
+            self._local.clientes = clientes
+            with self._lock:
+                self._podar()
+                self._clientes.append((weakref.ref(threading.current_thread()), clientes))
+        return clientes
+
+    def _podar(self):
+        """
+        Cierra los clientes de los hilos que ya terminaron. Se llama con el lock tomado.
+        """
+        vivos = []
+        for hilo, clientes in self._clientes:
+            actual = hilo()
+            if actual is not None and actual.is_alive():
+                vivos.append((hilo, clientes))
+            else:
+                clientes.cerrar()
+        self._clientes = vivos
+
+    @property
+    def http(self):
+        return self._clientes_hilo().http
+
+    @property
+    def gmail(self):
+        return self._clientes_hilo().gmail
+
+    @property
+    def drive(self):
+        return self._clientes_hilo().drive
+
+    def subidor(self, ruta_estado=None, chunk_mb=8, workers=4, limitador=None):
+        """
+        Devuelve el SubidorDrive de la sesión para esta configuración, creándolo en el
+        primer uso; así su pool de hilos (y los clientes de cada hilo) se reutiliza
+        entre envíos en lugar de crearse en cada uno.
+        """
+        clave = (os.path.abspath(ruta_estado) if ruta_estado else None, chunk_mb, workers, limitador)
+        with self._lock:
+            if clave not in self._subidores:
+                self._subidores[clave] = SubidorDrive(self, ruta_estado, chunk_mb, workers, limitador)
+            return self._subidores[clave]
+
+    def cerrar(self):
+        with self._lock:
+            subidores = list(self._subidores.values())
+            self._subidores.clear()
+        for subidor in subidores:
+            subidor.cerrar()  # espera las subidas en curso antes de cerrar sus clientes
+        with self._lock:
+            for _, clientes in self._clientes:
+                clientes.cerrar()
+            self._clientes.clear()
+        self._local = threading.local()
+
+def obtener_sesion(configuracion=None):
+    """
+    Devuelve la sesión de correo del proceso, creándola en el primer uso.
+
+    Args:
+        configuracion (Configuracion): Configuración YAML; de ella se toman el
+            token y las credenciales, la caché de descubrimiento y la URL raíz
+            alternativa de la API.
+    """
+    global _sesion
+    with _lock:
+        if _sesion is None:
+            creds = None
+            ruta_cache = None
+            root_url = None
+            if configuracion is not None:
+                api = configuracion.config.mail.config.api
+                creds = autenticar(api.token or None, api.credentials or None)
+                ruta_cache = api.discovery_cache or None
+                root_url = api.root_url or None
+            _sesion = SesionCorreo(creds=creds, ruta_cache=ruta_cache, root_url=root_url)
+        return _sesion
+
+def cerrar_sesion():
+    """
+    Cierra las conexiones de la sesión del proceso, si existe.
+    """
+    global _sesion
+    with _lock:
+        if _sesion is not None:
+            _sesion.cerrar()
+            _sesion = None
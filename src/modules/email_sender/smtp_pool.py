@@ -0,0 +1,244 @@
+import time
+import queue
+import smtplib
+import threading
+
+ERRORES_CONEXION = (smtplib.SMTPServerDisconnected, smtplib.SMTPConnectError, ConnectionError, TimeoutError, OSError)
+BLOQUE_DATA = 64 * 1024
+
+def error_conexion(error):
+    """
+    Indica si el error es de la conexión (caída, timeout, socket) y no una
+    respuesta del servidor. smtplib.SMTPException hereda de OSError, así que
+    los rechazos (remitente, destinatarios, DATA) se excluyen explícitamente.
+    """
+    if isinstance(error, (smtplib.SMTPServerDisconnected, smtplib.SMTPConnectError)):
+        return True
+    return isinstance(error, ERRORES_CONEXION) and not isinstance(error, smtplib.SMTPException)
+
+_transporte = None
+_lock = threading.Lock()
+
+class ConexionSMTP:
+    """
+    Conexión SMTP autenticada que cuenta los mensajes enviados por ella.
+    """
+
+    def __init__(self, servidor, puerto, usuario, clave, timeout=60, starttls=True):
+        self.servidor = servidor
+        self.puerto = puerto
+        self.usuario = usuario
+        self.clave = clave
+        self.timeout = timeout
+        self.starttls = starttls
+        self.smtp = None
+        self.mensajes = 0
+        self.ultimo_uso = 0
+
+    def abrir(self):
+        self.smtp = smtplib.SMTP(self.servidor, self.puerto, timeout=self.timeout)
+        if self.starttls:
+            self.smtp.starttls()
+        self.smtp.login(self.usuario, self.clave)
+        self.mensajes = 0
+        self.ultimo_uso = time.monotonic()
+
+    def cerrar(self):
+        if self.smtp is not None:
+            try:
+                self.smtp.quit()
+            except Exception:
+                self.smtp.close()
+        self.smtp = None
+
+    def activa(self, inactividad_maxima):
+        """
+        Indica si la conexión sigue viva; tras un periodo inactivo se comprueba con NOOP.
+        """
+        if self.smtp is None:
+            return False
+        if time.monotonic() - self.ultimo_uso < inactividad_maxima:
+            return True
+        try:
+            return self.smtp.noop()[0] == 250
+        except ERRORES_CONEXION:
+            return False
+
+    def enviar_archivo(self, remitente, destinatarios, archivo, tamaño=None, bloque=BLOQUE_DATA):
+        """
+        Envía un mensaje leyéndolo de un archivo binario, en bloques de `bloque` bytes.
+
+        Equivale a sendmail, pero el DATA se transmite a medida que se lee el archivo,
+        así la memoria usada no depende del tamaño del mensaje. El mensaje debe tener
+        finales de línea CRLF (como los que genera mime_spool); el punto al inicio de
+        línea se duplica aquí, también cuando cae en el borde entre dos bloques.
+
+        Args:
+            remitente (str): Dirección del remitente (MAIL FROM).
+            destinatarios (list): Direcciones de destino (RCPT TO).
+            archivo: Archivo binario posicionado al inicio del mensaje.
+            tamaño (int): Tamaño del mensaje, para la extensión SIZE si el servidor la anuncia.
+            bloque (int): Bytes leídos y enviados en cada escritura.
+
+        Returns:
+            dict: Destinatarios rechazados, como en sendmail.
+        """
+        smtp = self.smtp
+        smtp.ehlo_or_helo_if_needed()
+        opciones = [f'size={tamaño}'] if tamaño is not None and smtp.does_esmtp and smtp.has_extn('size') else []
+        codigo, respuesta = smtp.mail(remitente, opciones)
+        if codigo != 250:
+            if codigo == 421:
+                self.cerrar()
+            else:
+                smtp.rset()
+            raise smtplib.SMTPSenderRefused(codigo, respuesta, remitente)
+        rechazados = {}
+        for destinatario in destinatarios:
+            codigo, respuesta = smtp.rcpt(destinatario)
+            if codigo not in (250, 251):
+                rechazados[destinatario] = (codigo, respuesta)
+            if codigo == 421:
+                self.cerrar()
+                raise smtplib.SMTPRecipientsRefused(rechazados)
+        if len(rechazados) == len(destinatarios):
+            smtp.rset()
+            raise smtplib.SMTPRecipientsRefused(rechazados)
+
+        smtp.putcmd('data')
+        codigo, respuesta = smtp.getreply()
+        if codigo != 354:
+            smtp.rset()
+            raise smtplib.SMTPDataError(codigo, respuesta)
+        ultimo = b'\n'
+        while True:
+            datos = archivo.read(bloque)
+            if not datos:
+                break
+            datos = datos.replace(b'\n.', b'\n..')
+            if ultimo == b'\n' and datos.startswith(b'.'):
+                datos = b'.' + datos
+            smtp.send(datos)
+            ultimo = datos[-1:]
+        smtp.send(b'.\r\n' if ultimo == b'\n' else b'\r\n.\r\n')
+        codigo, respuesta = smtp.getreply()
+        if codigo != 250:
+            if codigo == 421:
+                self.cerrar()
+            else:
+                smtp.rset()
+            raise smtplib.SMTPDataError(codigo, respuesta)
+        return rechazados
+
+class TransporteSMTP:
+    """
+    Pool de conexiones SMTP persistentes.
+
+    Cada conexión hace STARTTLS y LOGIN una sola vez y se reutiliza para varios
+    sendmail. Las conexiones caídas se detectan y se reabren de forma
+    transparente, y cada una se renueva al llegar a max_mensajes.
+
+    Los mensajes grandes se envían con enviar_archivo, que transmite el DATA
+    por bloques de `bloque` bytes directamente desde un archivo.
+    """
+
+    def __init__(self, servidor, puerto, usuario, clave, tamaño=1, max_mensajes=50, inactividad_maxima=30, timeout=60, starttls=True, bloque=BLOQUE_DATA):
+        self.usuario = usuario
+        self.bloque = max(1024, bloque)
+        self.max_mensajes = max_mensajes
+        self.inactividad_maxima = inactividad_maxima
+        self.conexiones = [ConexionSMTP(servidor, puerto, usuario, clave, timeout, starttls) for _ in range(max(1, tamaño))]
+        self.disponibles = queue.Queue()
+        for conexion in self.conexiones:
+            self.disponibles.put(conexion)
+
+    def _preparar(self, conexion):
+        if conexion.mensajes >= self.max_mensajes or not conexion.activa(self.inactividad_maxima):
+            conexion.cerrar()
+            conexion.abrir()
+
+    def _enviar(self, envio):
+        """
+        Ejecuta `envio(conexion)` con una conexión del pool.
+
+        Si la conexión resulta estar caída se reabre y se reintenta una vez; las
+        respuestas de error del servidor se propagan sin reintentar.
+        """
+        conexion = self.disponibles.get()
+        try:
+            try:
+                self._preparar(conexion)
+                resultado = envio(conexion)
+            except Exception as error:
+                if not error_conexion(error):
+                    raise
+                conexion.cerrar()
+                conexion.abrir()
+                resultado = envio(conexion)
+            conexion.mensajes += 1
+            conexion.ultimo_uso = time.monotonic()
+            return resultado
+        finally:
+            self.disponibles.put(conexion)
+
+    def enviar(self, remitente, destinatarios, mensaje):
+        """
+        Envía un mensaje ya serializado usando una conexión del pool.
+        """
+        return self._enviar(lambda conexion: conexion.smtp.sendmail(remitente, destinatarios, mensaje))
+
+    def enviar_archivo(self, remitente, destinatarios, archivo, tamaño=None):
+        """
+        Envía un mensaje leído de un archivo binario usando una conexión del pool,
+        transmitiendo el DATA por bloques (ver ConexionSMTP.enviar_archivo).
+
+        Cada intento lee el archivo desde la posición que tenía al llamar, así
+        tanto el reintento por conexión caída como los del limitador reenvían el
+        mensaje completo.
+        """
+        posicion = archivo.tell()
+
+        def envio(conexion):
+            archivo.seek(posicion)
+            return conexion.enviar_archivo(remitente, destinatarios, archivo, tamaño, self.bloque)
+
+        try:
+            return self._enviar(envio)
+        finally:
+            archivo.seek(posicion)
+
+    def cerrar(self):
+        for conexion in self.conexiones:
+            conexion.cerrar()
+
+def crear_transporte(configuracion_smtp):
+    return TransporteSMTP(
+        configuracion_smtp.server,
+        configuracion_smtp.port,
+        configuracion_smtp.user,
+        configuracion_smtp.password,
+        tamaño=configuracion_smtp.pool_size,
+        max_mensajes=configuracion_smtp.max_messages,
+        starttls=configuracion_smtp.starttls,
+        bloque=configuracion_smtp.data_chunk_kb * 1024
+    )
+
+def obtener_transporte(configuracion_smtp):
+    """
+    Devuelve el transporte SMTP del proceso, creándolo en el primer uso.
+    """
+    global _transporte
+    with _lock:
+        if _transporte is None:
+            _transporte = crear_transporte(configuracion_smtp)
+        return _transporte
+
+def cerrar_transporte():
+    """
+    Cierra las conexiones del transporte SMTP del proceso, si existe.
+    """
+    global _transporte
+    with _lock:
+        if _transporte is not None:
+            _transporte.cerrar()
+            _transporte = None
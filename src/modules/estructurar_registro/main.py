@@ -8,44 +8,25 @@ def obtener_recibidor(carpeta):
     return recibidor
 
 def obtener_destinatarios(recibidor, excel):
-    destinatarios = []
-    for item in excel.config.recibidores_emails:
-        if item.recibidor == recibidor:
-            destinatarios = item
-            break
+    destinatarios = excel.config.buscar_recibidor(recibidor) or []
     if not destinatarios:
         print(f"recibidor {recibidor} no encontrado en la configuración.")
     return destinatarios
 
 def obtener_distribucion(distribucion, excel):
-    distribucion_correos = []
-    for item in excel.config.distribucion_correos:
-        if item.emails_para == distribucion:
-            distribucion_correo = item
-            break
+    distribucion_correo = excel.config.buscar_distribucion(distribucion) or []
     if not distribucion_correo:
-        print(f"recibidor {distribucion_correo} no encontrado en la configuración.")
-    try:
-        return distribucion_correo
-    except Exception as e:
-        print(f"Error al obtener la distribución: {e}")
-        return []
+        print(f"distribución {distribucion} no encontrada en la configuración.")
+    return distribucion_correo
 
 def obtener_copia(cc, excel):
-    copia = []
-    for item in excel.config.resumen_cc:
-        if item.cc.strip() == cc:
-            copia = item
-            break
+    copia = excel.config.buscar_copia(cc) or []
     if not copia:
-        print(f"recibidor {copia} no encontrado en la configuración.")
+        print(f"copia {cc} no encontrada en la configuración.")
     return copia
 
 def obtener_reporte(excel):
-    email_reporte = []
-    for item in excel.config.email_reporte:
-            email_reporte = item
-            break
+    email_reporte = excel.config.email_reporte[0] if excel.config.email_reporte else []
     if not email_reporte:
         print(f"recibidor {email_reporte} no encontrado en la configuración.")
     return email_reporte
@@ -54,6 +35,7 @@ def estructurar(carpeta, archivos,excel):
     distribucion_correo = ''
     pais = ''
     lista_mail_recibidor = ''
+    destinatarios = ()
     cuerpo_distribucion_correo = ''
     asunto = carpeta
     recibidor = obtener_recibidor(carpeta)
@@ -62,11 +44,13 @@ def estructurar(carpeta, archivos,excel):
         distribucion_correo = obtener_distribucion(mail_recibidor.distribucion_correos, excel)
         pais = distribucion_correo.pais
         lista_mail_recibidor = mail_recibidor.lista_emails
+        destinatarios = mail_recibidor.emails
         cuerpo_distribucion_correo = distribucion_correo.cuerpo
     except:
         distribucion_correo = ''
         pais = ''
         lista_mail_recibidor = ''
+        destinatarios = ()
         cuerpo_distribucion_correo = ''
     resumen_cc = obtener_copia('SANTA ELENA',excel)
 
@@ -78,7 +62,9 @@ def estructurar(carpeta, archivos,excel):
         emails_copia=resumen_cc.lista_emails,
         adjuntos=archivos,
         asunto=asunto,
-        cuerpo=cuerpo_distribucion_correo
+        cuerpo=cuerpo_distribucion_correo,
+        destinatarios=destinatarios,
+        copia=resumen_cc.emails
     )
 
     return caso_exportacion
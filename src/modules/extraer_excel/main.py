@@ -1,12 +1,14 @@
 import os
-import pandas as pd
-from models import load_config_excel as load_config
+from models import load_config_excel_selectivo as load_config, load_config_excel_cached as load_config_cached
 
 class Configuracion:
 
-    def __init__(self, archivo_configuracion):
+    def __init__(self, archivo_configuracion, ruta_cache=None, refrescar=False):
         self.path_file = archivo_configuracion
-        self.config = load_config(archivo_configuracion)
+        if ruta_cache:
+            self.config = load_config_cached(archivo_configuracion, ruta_cache, refrescar)
+        else:
+            self.config = load_config(archivo_configuracion)
 
     def get_dict(self):
         return {
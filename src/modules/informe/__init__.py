@@ -1,3 +1,3 @@
-from .main import genera_informe
+from .main import genera_informe, escribir_informe, anexar_informe
 
-__all__ = ['main']
\ No newline at end of file
+__all__ = ['genera_informe', 'escribir_informe', 'anexar_informe']
\ No newline at end of file
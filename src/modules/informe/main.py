@@ -1,40 +1,124 @@
 from datetime import datetime
 import pandas as pd
 import os
+from openpyxl import Workbook, load_workbook
 
-def genera_informe(registro, ruta, nombre_archivo):
-    # Crear un DataFrame vacío
-    df = pd.DataFrame()
+COLUMNAS = ['Asunto', 'Recibidor', 'cuerpo', 'Adjuntos', 'Emails Para', 'Estado Envio', 'Descripcion Envio', 'Fecha Envio', 'Partes', 'Reintentos', 'Espera Limites (s)']
+ETIQUETAS_HTML = r'<br>|<b>|</b>'
+HOJA_METRICAS = 'Metricas'
+ETAPAS_METRICAS = [('validar_archivos', 'Validar (s)'), ('compresion', 'Compresion (s)'), ('estructurar', 'Estructurar (s)'), ('enviar', 'Envio (s)'), ('drive', 'Drive (s)')]
+CONTADORES_METRICAS = [('bytes_adjuntos', 'MB Adjuntos'), ('bytes_comprimidos', 'MB Comprimidos')]
+COLUMNAS_METRICAS = ['Asunto'] + [columna for _, columna in ETAPAS_METRICAS + CONTADORES_METRICAS]
+
+def construir_filas(registros):
+    """
+    Convierte los registros de ejecución en un DataFrame con las columnas del informe.
 
-    # Agregar los datos del registro al DataFrame
+    La limpieza de etiquetas HTML del cuerpo se hace en una sola pasada vectorizada.
+    """
+    fecha = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
     df = pd.DataFrame([{
         'Asunto': registro['estructura']['asunto'],
         'Recibidor': registro['estructura']['recibidor'],
-        'cuerpo': registro['estructura']['cuerpo'].replace('<br>','').replace('<b>','').replace('</b>',''),
+        'cuerpo': registro['estructura']['cuerpo'],
         'Adjuntos': ', '.join(registro['estructura']['adjuntos']),
         'Emails Para': registro['estructura']['emails_para'],
         'Estado Envio': 'OK' if registro['estado_correo']['estado'] else 'ERROR',
         'Descripcion Envio': registro['estado_correo']['descripcion'],
-        'Fecha Envio': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-    }])
+        'Fecha Envio': fecha,
+        'Partes': registro.get('partes', 1),
+        'Reintentos': registro['estado_correo'].get('reintentos', 0),
+        'Espera Limites (s)': round(registro['estado_correo'].get('espera_cuota', 0) + registro['estado_correo'].get('espera_reintentos', 0), 1)
+    } for registro in registros], columns=COLUMNAS)
+    df['cuerpo'] = df['cuerpo'].astype(str).str.replace(ETIQUETAS_HTML, '', regex=True)
+    return df
 
-    # Ruta del archivo
-    ruta_archivo = f"{ruta}/{nombre_archivo}"
+def filas_metricas(registros):
+    """
+    Desglose por carpeta: segundos de cada etapa y MB adjuntos y comprimidos.
+    Solo incluye los registros que traen 'metricas'.
+    """
+    filas = []
+    for registro in registros:
+        if 'metricas' not in registro:
+            continue
+        etapas = registro['metricas']['etapas']
+        contadores = registro['metricas']['contadores']
+        filas.append([registro['estructura']['asunto']]
+                     + [round(etapas.get(etapa, 0), 3) for etapa, _ in ETAPAS_METRICAS]
+                     + [round(contadores.get(contador, 0) / (1024 * 1024), 2) for contador, _ in CONTADORES_METRICAS])
+    return filas
+
+def escribir_informe(registros, ruta, nombre_archivo):
+    """
+    Genera el informe completo de una ejecución escribiendo el libro una sola vez.
 
-    # Verificar si el archivo ya existe
-    if os.path.exists(ruta_archivo):
-        # Cargar el archivo existente
-        df_existente = pd.read_excel(ruta_archivo)
-        # Concatenar los datos nuevos con los existentes
-        df = pd.concat([df_existente, df], ignore_index=True)
+    Usa un libro de openpyxl en modo write-only, que escribe las filas en streaming.
+    Si los registros traen métricas, se agrega la hoja 'Metricas' con el desglose por carpeta.
 
-    # Guardar el DataFrame en un archivo Excel en la ruta especificada
-    df.to_excel(ruta_archivo, index=False)
+    Args:
+        registros (list): Lista de registros de ejecución (lista_ejecucion o un iterable).
+        ruta (str): Carpeta donde se guarda el informe.
+        nombre_archivo (str): Nombre del archivo Excel.
+
+    Returns:
+        str: Ruta del archivo generado.
+    """
+    registros = list(registros)
+    df = construir_filas(registros)
+    ruta_archivo = f"{ruta}/{nombre_archivo}"
+
+    libro = Workbook(write_only=True)
+    hoja = libro.create_sheet('Sheet1')
+    hoja.append(COLUMNAS)
+    for fila in df.itertuples(index=False, name=None):
+        hoja.append(list(fila))
+    metricas = filas_metricas(registros)
+    if metricas:
+        hoja = libro.create_sheet(HOJA_METRICAS)
+        hoja.append(COLUMNAS_METRICAS)
+        for fila in metricas:
+            hoja.append(fila)
+    libro.save(ruta_archivo)
 
     print(f"Archivo Excel generado y guardado en: {ruta_archivo}")
 
     return ruta_archivo
 
+def anexar_informe(registros, ruta, nombre_archivo):
+    """
+    Agrega registros a un informe existente, o lo crea si aún no existe.
+
+    Solo se escriben las filas nuevas; las existentes no se vuelven a leer con pandas.
+    """
+    ruta_archivo = f"{ruta}/{nombre_archivo}"
+    if not os.path.exists(ruta_archivo):
+        return escribir_informe(registros, ruta, nombre_archivo)
+
+    registros = list(registros)
+    df = construir_filas(registros)
+    libro = load_workbook(ruta_archivo)
+    hoja = libro.active
+    for fila in df.itertuples(index=False, name=None):
+        hoja.append(list(fila))
+    metricas = filas_metricas(registros)
+    if metricas:
+        if HOJA_METRICAS in libro.sheetnames:
+            hoja = libro[HOJA_METRICAS]
+        else:
+            hoja = libro.create_sheet(HOJA_METRICAS)
+            hoja.append(COLUMNAS_METRICAS)
+        for fila in metricas:
+            hoja.append(fila)
+    libro.save(ruta_archivo)
+
+    print(f"Archivo Excel actualizado en: {ruta_archivo}")
+
+    return ruta_archivo
+
+def genera_informe(registro, ruta, nombre_archivo):
+    return anexar_informe([registro], ruta, nombre_archivo)
+
 def main(registro, ruta):
     pass
 
@@ -43,5 +127,4 @@ if __name__ == "__main__":
     ruta = '/Volumes/Resources/Development/SmartBots/Santa_Elena-Envio_Full_Set_a_Recibido/test/En Proceso'
     nombre_archivo = f"Informe_Envio_Recibidor_{datetime.now().strftime('%Y-%m-%d_%H.%M.%S')}.xlsx"
 
-    for registro in registros:
-        archivo_informe = genera_informe(registro, ruta, nombre_archivo)
\ No newline at end of file
+    archivo_informe = escribir_informe(registros, ruta, nombre_archivo)
\ No newline at end of file
@@ -1,3 +1,3 @@
-from .main import listar_archivos
+from .main import listar_archivos, recorrer_carpetas, Archivo
 
-__all__ = ['listar_archivos']
\ No newline at end of file
+__all__ = ['listar_archivos', 'recorrer_carpetas', 'Archivo']
\ No newline at end of file
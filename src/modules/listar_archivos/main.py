@@ -1,22 +1,41 @@
 import os
+from collections import namedtuple
+
+ARCHIVOS_IGNORADOS = ('desktop.ini', '.DS_Store')
+
+Archivo = namedtuple('Archivo', ['nombre', 'ruta', 'tamaño', 'mtime_ns'])
+
+def recorrer_carpetas(ruta, excluidas=()):
+    """
+    Recorre las carpetas de la ruta con os.scandir en una sola pasada.
+
+    El tamaño y el mtime salen del DirEntry (en Windows vienen con el listado, sin un
+    stat extra por archivo), así las etapas siguientes no vuelven a consultar el disco.
+    Los archivos ignorados (desktop.ini, .DS_Store) se eliminan como en listar_archivos.
+
+    Returns:
+        dict: {carpeta: {nombre de archivo: Archivo}}, en el orden del directorio.
+    """
+    carpetas = {}
+    with os.scandir(ruta) as entradas:
+        for carpeta in entradas:
+            if carpeta.name in excluidas or not carpeta.is_dir():
+                continue
+            archivos = {}
+            with os.scandir(carpeta.path) as contenido:
+                for entrada in contenido:
+                    if not entrada.is_file():
+                        continue
+                    if entrada.name in ARCHIVOS_IGNORADOS:
+                        os.remove(entrada.path)
+                        continue
+                    info = entrada.stat()
+                    archivos[entrada.name] = Archivo(entrada.name, entrada.path, info.st_size, info.st_mtime_ns)
+            carpetas[carpeta.name] = archivos
+    return carpetas
 
 def listar_archivos(ruta):
-    archivos_dict = {}
-    archivos_ignorados = ['desktop.ini', '.DS_Store']
-    
-    for dir in os.listdir(ruta):
-        dir_path = os.path.join(ruta, dir)
-        if os.path.isdir(dir_path):
-            archivos_dict[dir] = []
-            for file in os.listdir(dir_path):
-                file_path = os.path.join(dir_path, file)
-                if os.path.isfile(file_path):
-                    if file in archivos_ignorados:
-                        os.remove(file_path)
-                    else:
-                        archivos_dict[dir].append(file)
-    
-    return archivos_dict
+    return {carpeta: list(archivos) for carpeta, archivos in recorrer_carpetas(ruta).items()}
 
 def main(ruta):
     resultado = listar_archivos(ruta)
@@ -0,0 +1,3 @@
+from .main import Metricas, iniciar_metricas, metricas, medir, sumar, en_carpeta
+
+__all__ = ['Metricas', 'iniciar_metricas', 'metricas', 'medir', 'sumar', 'en_carpeta']
\ No newline at end of file
@@ -0,0 +1,189 @@
+import os
+import json
+import time
+import tempfile
+import threading
+from contextlib import contextmanager
+from datetime import datetime
+
+PREFIJO = 'fullset'
+
+_actual = None
+_lock = threading.Lock()
+_local = threading.local()
+
+def percentil(valores, fraccion):
+    """
+    Percentil por interpolación lineal de una lista ya ordenada.
+    """
+    if not valores:
+        return 0.0
+    posicion = (len(valores) - 1) * fraccion
+    inferior = int(posicion)
+    superior = min(inferior + 1, len(valores) - 1)
+    return valores[inferior] + (valores[superior] - valores[inferior]) * (posicion - inferior)
+
+class Metricas:
+    """
+    Métricas de una ejecución: duración de cada etapa y contadores (bytes,
+    reintentos, esperas), en total y desglosados por carpeta.
+
+    Es segura entre hilos; las etapas del pipeline registran desde sus trabajadores.
+    """
+
+    def __init__(self):
+        self.inicio = time.time()
+        self.lock = threading.Lock()
+        self.duraciones = {}
+        self.contadores = {}
+        self.carpetas = {}
+
+    def _carpeta(self, carpeta):
+        return self.carpetas.setdefault(carpeta, {'etapas': {}, 'contadores': {}})
+
+    def registrar(self, etapa, segundos, carpeta=None):
+        with self.lock:
+            self.duraciones.setdefault(etapa, []).append(segundos)
+            if carpeta is not None:
+                etapas = self._carpeta(carpeta)['etapas']
+                etapas[etapa] = etapas.get(etapa, 0.0) + segundos
+
+    def sumar(self, contador, valor=1, carpeta=None):
+        with self.lock:
+            self.contadores[contador] = self.contadores.get(contador, 0) + valor
+            if carpeta is not None:
+                contadores = self._carpeta(carpeta)['contadores']
+                contadores[contador] = contadores.get(contador, 0) + valor
+
+    def carpeta(self, carpeta):
+        """
+        Desglose de una carpeta: segundos por etapa y contadores.
+        """
+        with self.lock:
+            datos = self.carpetas.get(carpeta, {'etapas': {}, 'contadores': {}})
+            return {'etapas': dict(datos['etapas']), 'contadores': dict(datos['contadores'])}
+
+    def resumen(self):
+        """
+        Resumen de la ejecución: por etapa cantidad, total, p50, p95 y máximo en segundos.
+        """
+        with self.lock:
+            etapas = {}
+            for etapa, duraciones in self.duraciones.items():
+                ordenadas = sorted(duraciones)
+                etapas[etapa] = {
+                    'cantidad': len(ordenadas),
+                    'total': round(sum(ordenadas), 4),
+                    'p50': round(percentil(ordenadas, 0.5), 4),
+                    'p95': round(percentil(ordenadas, 0.95), 4),
+                    'max': round(ordenadas[-1], 4)
+                }
+            return {
+                'inicio': datetime.fromtimestamp(self.inicio).isoformat(timespec='seconds'),
+                'duracion': round(time.time() - self.inicio, 4),
+                'etapas': etapas,
+                'contadores': dict(self.contadores),
+                'carpetas': {carpeta: {'etapas': dict(datos['etapas']), 'contadores': dict(datos['contadores'])} for carpeta, datos in self.carpetas.items()}
+            }
+
+    def escribir_json(self, carpeta):
+        """
+        Escribe el resumen de la ejecución en metricas_<fecha>.json dentro de la carpeta.
+
+        Returns:
+            str: Ruta del archivo escrito.
+        """
+        os.makedirs(carpeta, exist_ok=True)
+        ruta = os.path.join(carpeta, f"metricas_{datetime.fromtimestamp(self.inicio).strftime('%Y-%m-%d_%H-%M-%S')}.json")
+        with open(ruta, 'w', encoding='utf-8') as archivo:
+            json.dump(self.resumen(), archivo, ensure_ascii=False, indent=2)
+        return ruta
+
+    def escribir_prometheus(self, carpeta, nombre='metricas.prom'):
+        """
+        Escribe las métricas de la última ejecución en formato textfile de Prometheus
+        (para el textfile collector de node_exporter). Se reemplaza de forma atómica.
+
+        Returns:
+            str: Ruta del archivo escrito.
+        """
+        resumen = self.resumen()
+        lineas = [
+            f'# HELP {PREFIJO}_ejecucion_segundos Duración de la última ejecución.',
+            f'# TYPE {PREFIJO}_ejecucion_segundos gauge',
+            f'{PREFIJO}_ejecucion_segundos {resumen["duracion"]}',
+            f'# HELP {PREFIJO}_ultima_ejecucion_timestamp_segundos Inicio de la última ejecución.',
+            f'# TYPE {PREFIJO}_ultima_ejecucion_timestamp_segundos gauge',
+            f'{PREFIJO}_ultima_ejecucion_timestamp_segundos {self.inicio:.0f}',
+            f'# HELP {PREFIJO}_etapa_segundos Segundos por etapa en la última ejecución.',
+            f'# TYPE {PREFIJO}_etapa_segundos gauge'
+        ]
+        for etapa, datos in sorted(resumen['etapas'].items()):
+            for medida in ('total', 'p50', 'p95', 'max'):
+                lineas.append(f'{PREFIJO}_etapa_segundos{{etapa="{etapa}",medida="{medida}"}} {datos[medida]}')
+        lineas += [f'# HELP {PREFIJO}_etapa_cantidad Veces que se ejecutó cada etapa.', f'# TYPE {PREFIJO}_etapa_cantidad gauge']
+        lineas += [f'{PREFIJO}_etapa_cantidad{{etapa="{etapa}"}} {datos["cantidad"]}' for etapa, datos in sorted(resumen['etapas'].items())]
+        for contador, valor in sorted(resumen['contadores'].items()):
+            lineas += [f'# TYPE {PREFIJO}_{contador} gauge', f'{PREFIJO}_{contador} {valor}']
+
+        os.makedirs(carpeta, exist_ok=True)
+        ruta = os.path.join(carpeta, nombre)
+        # Temporal único (sin extensión .prom, el recolector lo ignora) y reemplazo atómico
+        descriptor, temporal = tempfile.mkstemp(suffix='.tmp', dir=carpeta)
+        try:
+            with os.fdopen(descriptor, 'w', encoding='utf-8') as archivo:
+                archivo.write('\n'.join(lineas) + '\n')
+            os.replace(temporal, ruta)
+        except BaseException:
+            os.remove(temporal)
+            raise
+        return ruta
+
+def iniciar_metricas():
+    """
+    Empieza las métricas de una nueva ejecución y las deja como actuales.
+    """
+    global _actual
+    with _lock:
+        _actual = Metricas()
+        return _actual
+
+def metricas():
+    """
+    Devuelve las métricas de la ejecución actual, creándolas en el primer uso.
+    """
+    global _actual
+    with _lock:
+        if _actual is None:
+            _actual = Metricas()
+        return _actual
+
+def carpeta_actual():
+    return getattr(_local, 'carpeta', None)
+
+@contextmanager
+def en_carpeta(carpeta):
+    """
+    Atribuye a la carpeta lo que se mida en este hilo dentro del bloque.
+    """
+    anterior = carpeta_actual()
+    _local.carpeta = carpeta
+    try:
+        yield
+    finally:
+        _local.carpeta = anterior
+
+@contextmanager
+def medir(etapa, carpeta=None):
+    """
+    Mide la duración del bloque como una ejecución de la etapa; por defecto se
+    atribuye a la carpeta actual del hilo.
+    """
+    inicio = time.perf_counter()
+    try:
+        yield
+    finally:
+        metricas().registrar(etapa, time.perf_counter() - inicio, carpeta or carpeta_actual())
+
+def sumar(contador, valor=1, carpeta=None):
+    metricas().sumar(contador, valor, carpeta or carpeta_actual())
\ No newline at end of file
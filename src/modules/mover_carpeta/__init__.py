@@ -1,3 +1,3 @@
-from .main import eliminar_carpetas, mover, mover_todo
+from .main import eliminar_carpetas, mover, mover_todo, mover_lote, mover_elemento
 
-__all__ = ['eliminar_carpetas', 'mover', 'mover_todo']
\ No newline at end of file
+__all__ = ['eliminar_carpetas', 'mover', 'mover_todo', 'mover_lote', 'mover_elemento']
\ No newline at end of file
@@ -1,7 +1,10 @@
 import os
+import time
+import errno
 import shutil
 import logging
 from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
 
 # Configuración del logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
@@ -32,54 +35,175 @@ def eliminar_carpetas(ruta):
     else:
         logging.info(f"La carpeta {destino_base} no existe.")
 
-def mover_carpetas(ruta, lista_carpeta):
+def tamaño_arbol(ruta):
+    """
+    Archivos (ruta relativa -> tamaño) de una carpeta o archivo, con os.scandir.
+    """
+    if not os.path.isdir(ruta):
+        return {os.path.basename(ruta): os.path.getsize(ruta)}
+    archivos = {}
+    pendientes = ['']
+    while pendientes:
+        relativa = pendientes.pop()
+        with os.scandir(os.path.join(ruta, relativa)) as entradas:
+            for entrada in entradas:
+                nombre = os.path.join(relativa, entrada.name)
+                if entrada.is_dir(follow_symlinks=False):
+                    pendientes.append(nombre)
+                else:
+                    archivos[nombre] = entrada.stat(follow_symlinks=False).st_size
+    return archivos
+
+def mismo_dispositivo(origen, carpeta_destino):
+    try:
+        return os.stat(origen).st_dev == os.stat(carpeta_destino).st_dev
+    except OSError:
+        return False
+
+def eliminar_elemento(ruta):
+    if os.path.isdir(ruta):
+        shutil.rmtree(ruta)
+    elif os.path.exists(ruta):
+        os.remove(ruta)
+
+def copiar_verificado(origen, destino):
+    """
+    Copia entre dispositivos distintos: copia a una ruta temporal junto al destino,
+    verifica que estén todos los archivos con su tamaño, la renombra al destino y
+    recién entonces elimina el origen.
+
+    Returns:
+        int: Bytes copiados.
+    """
+    if os.path.exists(destino):
+        raise FileExistsError(f"El destino {destino} ya existe.")
+    temporal = f'{destino}.parcial'
+    eliminar_elemento(temporal)
+    esperado = tamaño_arbol(origen)
+    try:
+        if os.path.isdir(origen):
+            shutil.copytree(origen, temporal)
+        else:
+            shutil.copy2(origen, temporal)
+        copiado = tamaño_arbol(temporal)
+        if os.path.isfile(temporal):
+            copiado = {os.path.basename(origen): copiado.popitem()[1]}
+        if copiado != esperado:
+            faltantes = sorted(set(esperado.items()) - set(copiado.items()))
+            raise IOError(f"La copia de {origen} no coincide con el origen: {faltantes[:5]}")
+        os.rename(temporal, destino)
+    except Exception:
+        eliminar_elemento(temporal)
+        raise
+    eliminar_elemento(origen)
+    return sum(esperado.values())
+
+def mover_elemento(origen, destino, tamaño=None):
+    """
+    Mueve una carpeta o archivo: con un rename atómico si origen y destino están en el
+    mismo dispositivo, o con una copia verificada si no.
+
+    Args:
+        origen (str): Carpeta o archivo a mover.
+        destino (str): Ruta final.
+        tamaño (int): Bytes del elemento ya conocidos por el escaneo; el rename no
+            recorre el árbol para contarlos (la copia sí, porque los verifica).
+
+    Returns:
+        dict: elemento, metodo ('rename' o 'copia'), bytes (None si no se conocen),
+            segundos, estado y descripcion.
+    """
+    inicio = time.perf_counter()
+    resultado = {'elemento': os.path.basename(origen), 'metodo': 'rename', 'bytes': 0, 'segundos': 0.0, 'estado': True, 'descripcion': ''}
+    try:
+        if mismo_dispositivo(origen, os.path.dirname(destino)):
+            try:
+                os.rename(origen, destino)
+                resultado['bytes'] = tamaño
+            except OSError as e:
+                if e.errno != errno.EXDEV:
+                    raise
+                resultado['metodo'] = 'copia'
+                resultado['bytes'] = copiar_verificado(origen, destino)
+        else:
+            resultado['metodo'] = 'copia'
+            resultado['bytes'] = copiar_verificado(origen, destino)
+    except Exception as e:
+        resultado.update(estado=False, descripcion=str(e))
+        logging.error(f"Error al mover {origen} a {destino}: {e}")
+    resultado['segundos'] = time.perf_counter() - inicio
+    return resultado
+
+def mover_lote(pares, workers=4):
+    """
+    Mueve varios elementos (origen, destino[, tamaño]) en paralelo con un pool de hilos acotado.
+
+    Returns:
+        list: Un resultado de mover_elemento por par, en el mismo orden.
+    """
+    if not pares:
+        return []
+    with ThreadPoolExecutor(max_workers=max(1, min(workers, len(pares))), thread_name_prefix='mover') as executor:
+        resultados = list(executor.map(lambda par: mover_elemento(*par), pares))
+    for resultado in resultados:
+        if resultado['estado']:
+            logging.info(f"{resultado['elemento']}: {resultado['metodo']}, {resultado['bytes'] if resultado['bytes'] is not None else '?'} bytes en {resultado['segundos']:.3f}s")
+    return resultados
+
+def mover_carpetas(ruta, lista_carpeta, workers=4):
     """
     Mueve las carpetas especificadas en lista_carpeta a la ruta destino.
+
+    Returns:
+        list: Resultado por carpeta (ver mover_elemento).
     """
     destino_base = os.path.join(ruta, 'En Proceso')
-    if not os.path.exists(destino_base):
-        os.makedirs(destino_base)
-        logging.info(f"Carpeta de destino {destino_base} creada.")
+    os.makedirs(destino_base, exist_ok=True)
 
+    pares = []
     for carpeta in lista_carpeta:
         origen = os.path.join(ruta, carpeta)
-        destino = os.path.join(destino_base, carpeta)
         if os.path.exists(origen):
-            shutil.move(origen, destino)
-            logging.info(f"Carpeta {carpeta} movida a {destino}.")
+            pares.append((origen, os.path.join(destino_base, carpeta)))
         else:
             logging.warning(f"La carpeta {carpeta} no existe en la ruta {ruta}.")
+    return mover_lote(pares, workers)
 
-def mover(ruta, lista_carpeta):
+def mover(ruta, lista_carpeta, workers=4):
     """
     Función principal que recibe los argumentos y ejecuta las acciones.
     """
     try:
         validar_ruta(ruta)
-        mover_carpetas(ruta, lista_carpeta)
-        mover = True
+        resultados = mover_carpetas(ruta, lista_carpeta, workers)
+        mover = all(resultado['estado'] for resultado in resultados)
     except Exception as e:
         mover = False
         logging.error(f"Error en la ejecución: {e}")
     return mover
 
-def mover_todo(ruta):
+def mover_todo(ruta, workers=4, conservar=(), tamaños=None):
+    """
+    Mueve todo lo que hay en En Proceso a Listo/<fecha>/<hora>, salvo los
+    elementos nombrados en `conservar`, que quedan para la próxima ejecución.
+
+    `tamaños` (nombre -> bytes, del escaneo de la ejecución) solo se usa para
+    informar los bytes movidos sin volver a recorrer las carpetas.
+    """
+    ahora = datetime.now()
     destino_base = os.path.join(ruta, 'En Proceso')
-    destino_final = os.path.join(ruta, 'Listo', datetime.now().strftime('%Y-%m-%d'), datetime.now().strftime('%H.%M.%S'))
-    if not os.path.exists(destino_final):
-        os.makedirs(destino_final)
-        logging.info(f"Carpeta de destino final {destino_final} creada.")
-
-    for item in os.listdir(destino_base):
-        origen = os.path.join(destino_base, item)
-        destino = os.path.join(destino_final, item)
-        if os.path.exists(origen):
-            shutil.move(origen, destino)
-            logging.info(f"Elemento {item} movido a {destino}.")
-        else:
-            logging.warning(f"El elemento {item} no existe en la ruta {destino_base}.")
+    destino_final = os.path.join(ruta, 'Listo', ahora.strftime('%Y-%m-%d'), ahora.strftime('%H.%M.%S'))
+    os.makedirs(destino_final, exist_ok=True)
+
+    with os.scandir(destino_base) as entradas:
+        pares = [(entrada.path, os.path.join(destino_final, entrada.name), (tamaños or {}).get(entrada.name))
+                 for entrada in entradas if entrada.name not in conservar]
+    resultados = mover_lote(pares, workers)
 
-    print(f"Elementos movidos correctamente a la carpeta {destino_final}.")
+    movidos = [resultado for resultado in resultados if resultado['estado']]
+    total = sum(resultado['bytes'] or 0 for resultado in movidos)
+    print(f"Elementos movidos correctamente a la carpeta {destino_final} ({len(movidos)} de {len(resultados)} elementos, {total / (1024 * 1024):.2f} MB).")
+    return resultados
 
 def main(ruta, lista_carpeta):
     """
@@ -0,0 +1,4 @@
+from .main import ejecutar_pipeline, Etapa
+from .procesos import configurar_procesos, ejecutar_en_proceso, procesos_activos, cerrar_procesos
+
+__all__ = ['ejecutar_pipeline', 'Etapa', 'configurar_procesos', 'ejecutar_en_proceso', 'procesos_activos', 'cerrar_procesos']
\ No newline at end of file
@@ -0,0 +1,97 @@
+import asyncio
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from modules.metricas import medir, en_carpeta
+
+FIN = object()
+
+class Etapa:
+    """
+    Etapa del pipeline: una función bloqueante que recibe y devuelve un registro.
+
+    Args:
+        nombre (str): Nombre de la etapa (se usa en los errores).
+        funcion (callable): Función que procesa un registro (dict) y lo devuelve.
+        concurrencia (int): Cantidad de registros que la etapa procesa a la vez.
+    """
+
+    def __init__(self, nombre, funcion, concurrencia=1):
+        self.nombre = nombre
+        self.funcion = funcion
+        self.concurrencia = max(1, int(concurrencia))
+
+def procesar(etapa, registro):
+    """
+    Ejecuta la etapa sobre el registro. Si una etapa anterior falló, el registro
+    pasa sin cambios; si esta falla, el error queda anotado en el registro.
+
+    La duración de la etapa se registra en las métricas de la carpeta, junto con
+    lo que midan las funciones que llama (compresión, subidas a Drive).
+    """
+    if 'error' in registro:
+        return registro
+    with en_carpeta(registro.get('carpeta')), medir(etapa.nombre):
+        try:
+            return etapa.funcion(registro)
+        except Exception as e:
+            logging.error(f"Error en la etapa {etapa.nombre} para {registro.get('carpeta')}: {e}")
+            registro['error'] = {'etapa': etapa.nombre, 'descripcion': str(e)}
+            return registro
+
+async def ejecutar_etapa(etapa, entrada, salida, executor):
+    loop = asyncio.get_running_loop()
+
+    async def trabajador():
+        while True:
+            registro = await entrada.get()
+            if registro is FIN:
+                await entrada.put(FIN)  # el resto de los trabajadores también debe terminar
+                return
+            registro = await loop.run_in_executor(executor, procesar, etapa, registro)
+            await salida.put(registro)
+
+    await asyncio.gather(*(trabajador() for _ in range(etapa.concurrencia)))
+    await salida.put(FIN)
+
+async def alimentar(registros, cola):
+    for registro in registros:
+        await cola.put(registro)
+    await cola.put(FIN)
+
+async def recolectar(cola):
+    resultados = []
+    while True:
+        registro = await cola.get()
+        if registro is FIN:
+            return resultados
+        resultados.append(registro)
+
+async def _pipeline(registros, etapas, tamaño_cola):
+    colas = [asyncio.Queue(maxsize=tamaño_cola) for _ in range(len(etapas) + 1)]
+    trabajadores = sum(etapa.concurrencia for etapa in etapas)
+    with ThreadPoolExecutor(max_workers=trabajadores, thread_name_prefix='pipeline') as executor:
+        tareas = [asyncio.create_task(alimentar(registros, colas[0]))]
+        for indice, etapa in enumerate(etapas):
+            tareas.append(asyncio.create_task(ejecutar_etapa(etapa, colas[indice], colas[indice + 1], executor)))
+        resultados = await recolectar(colas[-1])
+        await asyncio.gather(*tareas)
+    return resultados
+
+def ejecutar_pipeline(registros, etapas, tamaño_cola=4):
+    """
+    Procesa los registros a través de las etapas con colas acotadas entre ellas.
+
+    Cada etapa corre sus llamadas bloqueantes en un pool de hilos con su propia
+    concurrencia, así mientras una carpeta se envía la siguiente ya se está
+    validando y estructurando. El tiempo total tiende al de la etapa más lenta.
+
+    Args:
+        registros (iterable): Registros (dict) de entrada; cada uno debe tener 'indice'.
+        etapas (list): Lista de Etapa, en orden.
+        tamaño_cola (int): Capacidad de cada cola entre etapas.
+
+    Returns:
+        list: Registros procesados, en el orden original de entrada.
+    """
+    resultados = asyncio.run(_pipeline(registros, etapas, max(1, tamaño_cola)))
+    return sorted(resultados, key=lambda registro: registro['indice'])
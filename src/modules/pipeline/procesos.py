@@ -0,0 +1,38 @@
+import threading
+from concurrent.futures import ProcessPoolExecutor
+
+_pool = None
+_lock = threading.Lock()
+
+def configurar_procesos(workers):
+    """
+    Crea el pool de procesos del run para el trabajo intensivo en CPU
+    (compresión, armado MIME). Con workers <= 0 todo se ejecuta en el hilo que llama.
+    """
+    global _pool
+    with _lock:
+        if _pool is None and workers and workers > 0:
+            _pool = ProcessPoolExecutor(max_workers=workers)
+        return _pool
+
+def procesos_activos():
+    return _pool is not None
+
+def ejecutar_en_proceso(funcion, *args, **kwargs):
+    """
+    Ejecuta la función en el pool de procesos y espera su resultado.
+
+    La función debe ser importable a nivel de módulo y devolver resultados
+    livianos (rutas de archivo, tamaños), no el contenido de los archivos.
+    """
+    pool = _pool
+    if pool is None:
+        return funcion(*args, **kwargs)
+    return pool.submit(funcion, *args, **kwargs).result()
+
+def cerrar_procesos():
+    global _pool
+    with _lock:
+        if _pool is not None:
+            _pool.shutdown()
+            _pool = None
@@ -0,0 +1,3 @@
+from .main import Vigilante, crear_observador, firma_carpeta
+
+__all__ = ['Vigilante', 'crear_observador', 'firma_carpeta']
\ No newline at end of file
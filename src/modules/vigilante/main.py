@@ -0,0 +1,195 @@
+import os
+import sys
+import time
+import select
+import ctypes
+import ctypes.util
+import logging
+from modules.buscar_carpeta import carpetas_pendientes
+from modules.buscar_carpeta.main import CARPETAS_SISTEMA
+
+ARCHIVOS_IGNORADOS = ('desktop.ini', '.DS_Store')
+
+# Eventos de inotify que indican que algo llegó, cambió o se fue
+IN_MODIFY = 0x002
+IN_ATTRIB = 0x004
+IN_CLOSE_WRITE = 0x008
+IN_MOVED_FROM = 0x040
+IN_MOVED_TO = 0x080
+IN_CREATE = 0x100
+IN_DELETE = 0x200
+MASCARA = IN_MODIFY | IN_ATTRIB | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE
+
+class ObservadorSondeo:
+    """
+    Observador por sondeo: solo espera el intervalo; los cambios los detecta la
+    comparación de tamaños y mtimes. Es el que sirve en unidades sincronizadas
+    (Google Drive), donde inotify no recibe eventos.
+    """
+
+    def vigilar(self, ruta):
+        pass
+
+    def olvidar(self, ruta):
+        pass
+
+    def esperar(self, segundos):
+        time.sleep(segundos)
+
+    def cerrar(self):
+        pass
+
+class ObservadorInotify:
+    """
+    Observador con inotify (Linux), vía ctypes: despierta apenas hay un evento en
+    la carpeta raíz o en alguna de las carpetas vigiladas.
+    """
+
+    def __init__(self, ruta):
+        self.libc = ctypes.CDLL(ctypes.util.find_library('c'), use_errno=True)
+        self.fd = self.libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), 'inotify_init1')
+        self.vigiladas = {}
+        self.vigilar(ruta)
+
+    def vigilar(self, ruta):
+        if ruta in self.vigiladas:
+            return
+        descriptor = self.libc.inotify_add_watch(self.fd, os.fsencode(ruta), MASCARA)
+        if descriptor < 0:
+            logging.warning(f"No se pudo vigilar {ruta} con inotify (errno {ctypes.get_errno()})")
+            return
+        self.vigiladas[ruta] = descriptor
+
+    def olvidar(self, ruta):
+        descriptor = self.vigiladas.pop(ruta, None)
+        if descriptor is not None:
+            self.libc.inotify_rm_watch(self.fd, descriptor)
+
+    def esperar(self, segundos):
+        listos, _, _ = select.select([self.fd], [], [], segundos)
+        if listos:
+            try:
+                while os.read(self.fd, 65536):
+                    pass
+            except BlockingIOError:
+                pass
+
+    def cerrar(self):
+        os.close(self.fd)
+
+def crear_observador(ruta, modo='auto'):
+    """
+    Elige el observador: 'inotify', 'poll' o 'auto' (inotify si está disponible).
+    """
+    if modo in ('auto', 'inotify') and sys.platform.startswith('linux'):
+        try:
+            return ObservadorInotify(ruta)
+        except (OSError, AttributeError) as e:
+            if modo == 'inotify':
+                raise
+            logging.warning(f"inotify no disponible, se usa sondeo: {e}")
+    elif modo == 'inotify':
+        raise OSError("inotify solo está disponible en Linux")
+    return ObservadorSondeo()
+
+def firma_carpeta(ruta):
+    """
+    Nombres, tamaños y mtimes de los archivos de la carpeta, en un único escaneo.
+    """
+    try:
+        with os.scandir(ruta) as entradas:
+            return tuple(sorted(
+                (entrada.name, info.st_size, info.st_mtime_ns)
+                for entrada in entradas
+                if entrada.name not in ARCHIVOS_IGNORADOS and entrada.is_file()
+                for info in (entrada.stat(),)))
+    except FileNotFoundError:
+        return ()
+
+class Vigilante:
+    """
+    Vigila la carpeta compartida y entrega las carpetas nuevas cuando terminan de llegar.
+
+    Una carpeta se entrega recién cuando sus archivos (nombres, tamaños y mtimes) no
+    cambian durante `silencio` segundos, así no se envían carpetas a medio sincronizar.
+    Una carpeta vacía también se entrega al cumplir el silencio, como en el modo normal.
+
+    Args:
+        ruta (str): Carpeta compartida (path.shared.main).
+        silencio (float): Segundos que una carpeta debe quedar sin cambios.
+        intervalo (float): Segundos máximos entre revisiones.
+        modo (str): 'auto', 'inotify' o 'poll'.
+        reintento (float): Segundos sin lotes nuevos tras los cuales se entrega un lote
+            vacío, para retomar lo que quedó en En Proceso; 0 no reintenta.
+    """
+
+    def __init__(self, ruta, silencio=60, intervalo=10, modo='auto', excluidas=CARPETAS_SISTEMA, reintento=0):
+        self.ruta = ruta
+        self.silencio = silencio
+        self.intervalo = intervalo
+        self.reintento = reintento
+        self.excluidas = excluidas
+        self.observador = crear_observador(ruta, modo)
+        self.vistas = {}  # carpeta -> (firma, desde cuándo no cambia)
+
+    def revisar(self, ahora=None):
+        """
+        Actualiza las firmas y devuelve las carpetas que ya cumplieron el silencio.
+        """
+        ahora = time.monotonic() if ahora is None else ahora
+        carpetas = carpetas_pendientes(self.ruta, self.excluidas)
+        for carpeta in set(self.vistas) - set(carpetas):
+            del self.vistas[carpeta]
+            self.observador.olvidar(os.path.join(self.ruta, carpeta))
+        listas = []
+        for carpeta in carpetas:
+            ruta = os.path.join(self.ruta, carpeta)
+            self.observador.vigilar(ruta)
+            firma = firma_carpeta(ruta)
+            anterior = self.vistas.get(carpeta)
+            if anterior is None or anterior[0] != firma:
+                self.vistas[carpeta] = (firma, ahora)
+            elif ahora - anterior[1] >= self.silencio:
+                listas.append(carpeta)
+        return listas
+
+    def _espera(self, ahora):
+        """
+        Segundos hasta la próxima revisión: el intervalo, o antes si alguna carpeta
+        cumple su silencio.
+        """
+        vencimientos = [desde + self.silencio - ahora for _, desde in self.vistas.values()]
+        return max(0.1, min([self.intervalo] + vencimientos))
+
+    def lotes(self):
+        """
+        Itera sin fin entregando listas de carpetas listas para procesar.
+
+        Si pasan `reintento` segundos sin entregar nada, entrega una lista vacía: quien
+        la recibe retoma las carpetas que quedaron en En Proceso (envíos diferidos por
+        cuota o por errores temporales) aunque no lleguen carpetas nuevas.
+        """
+        proximo_reintento = time.monotonic() + self.reintento
+        while True:
+            ahora = time.monotonic()
+            listas = self.revisar(ahora)
+            if listas:
+                for carpeta in listas:
+                    del self.vistas[carpeta]
+                    self.observador.olvidar(os.path.join(self.ruta, carpeta))
+                yield listas
+                proximo_reintento = time.monotonic() + self.reintento
+                continue
+            if self.reintento and ahora >= proximo_reintento:
+                yield []
+                proximo_reintento = time.monotonic() + self.reintento
+                continue
+            espera = self._espera(ahora)
+            if self.reintento:
+                espera = max(0.1, min(espera, proximo_reintento - ahora))
+            self.observador.esperar(espera)
+
+    def cerrar(self):
+        self.observador.cerrar()
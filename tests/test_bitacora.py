@@ -0,0 +1,31 @@
+from modules.bitacora.main import Bitacora
+
+def test_estado_sobrevive_a_un_reinicio(tmp_path):
+    ruta = str(tmp_path / 'data' / 'bitacora.sqlite3')
+    bitacora = Bitacora(ruta)
+    bitacora.reclamar('FULL SET A')
+    bitacora.avanzar('FULL SET A', 'compressed', archivos=['a.pdf'])
+    bitacora.avanzar('FULL SET A', 'sent', partes_enviadas=[1])
+    bitacora.cerrar()
+
+    bitacora = Bitacora(ruta)
+    assert bitacora.estado('FULL SET A') == ('sent', {'archivos': ['a.pdf'], 'partes_enviadas': [1]})
+    assert bitacora.alcanzado('FULL SET A', 'structured')
+    assert not bitacora.alcanzado('FULL SET A', 'reported')
+    bitacora.cerrar()
+
+def test_avanzar_nunca_retrocede():
+    bitacora = Bitacora()
+    bitacora.avanzar('FULL SET A', 'sent')
+    bitacora.avanzar('FULL SET A', 'compressed', partes=2)
+    assert bitacora.estado('FULL SET A') == ('sent', {'partes': 2})
+
+def test_retomar_conserva_y_reclamar_descarta():
+    bitacora = Bitacora()
+    assert bitacora.estado('FULL SET A') == (None, {})
+    bitacora.avanzar('FULL SET A', 'structured', partes=2)
+    assert bitacora.retomar('FULL SET A') == ('structured', {'partes': 2})
+    assert bitacora.retomar('FULL SET B') == ('claimed', {})
+
+    bitacora.reclamar('FULL SET A')
+    assert bitacora.estado('FULL SET A') == ('claimed', {})
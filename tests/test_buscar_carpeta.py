@@ -0,0 +1,21 @@
+import os
+import sys
+import subprocess
+from modules.buscar_carpeta.main import carpetas_pendientes
+
+SRC = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src')
+
+def test_carpetas_pendientes_omite_las_del_bot(tmp_path):
+    for nombre in ('FULL SET B', 'FULL SET A', 'Configuracion', 'En Proceso', 'Listo'):
+        (tmp_path / nombre).mkdir()
+    (tmp_path / 'suelto.pdf').write_bytes(b'%PDF')
+
+    assert carpetas_pendientes(str(tmp_path)) == ['FULL SET A', 'FULL SET B']
+
+def test_carpetas_pendientes_sin_ruta(tmp_path):
+    assert carpetas_pendientes(str(tmp_path / 'no existe')) == []
+
+def test_importar_main_no_carga_dependencias_pesadas():
+    codigo = "import sys, main; print(sorted(m for m in ('pandas', 'py7zr', 'openpyxl') if m in sys.modules))"
+    salida = subprocess.run([sys.executable, '-c', codigo], cwd=SRC, capture_output=True, text=True, check=True)
+    assert salida.stdout.strip().splitlines()[-1] == '[]'
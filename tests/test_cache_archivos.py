@@ -0,0 +1,63 @@
+import os
+import pytest
+from modules import compresor
+from modules.cache_archivos import main as cache_archivos
+from modules.cache_archivos.main import CacheContenido
+
+def test_digesto_no_se_recalcula_aunque_el_archivo_se_mueva(tmp_path, monkeypatch):
+    origen = tmp_path / 'Pendientes'
+    destino = tmp_path / 'En Proceso'
+    origen.mkdir()
+    destino.mkdir()
+    archivo = origen / 'FULL SET.pdf'
+    archivo.write_bytes(os.urandom(10_000))
+    with CacheContenido(str(tmp_path / 'cache')) as cache:
+        digesto = cache.digesto(str(archivo))
+        os.rename(archivo, destino / archivo.name)
+
+        def sin_lectura(ruta):
+            raise AssertionError('no debería volver a leer el archivo')
+
+        monkeypatch.setattr(cache_archivos, 'calcular_sha256', sin_lectura)
+        assert cache.digesto(str(destino / archivo.name)) == digesto
+
+def test_clave_con_datos_del_escaneo_no_consulta_el_disco(tmp_path, monkeypatch):
+    archivo = tmp_path / 'FULL SET.pdf'
+    archivo.write_bytes(os.urandom(10_000))
+    info = os.stat(archivo)
+    tamaños, mtimes = {archivo.name: info.st_size}, {archivo.name: info.st_mtime_ns}
+    with CacheContenido(str(tmp_path / 'cache')) as cache:
+        clave = cache.clave([str(archivo)], 'lzma2', None)
+
+        def sin_disco(*args):
+            raise AssertionError('no debería consultar el disco')
+
+        monkeypatch.setattr(cache_archivos, 'calcular_sha256', sin_disco)
+        monkeypatch.setattr(cache_archivos.os, 'stat', sin_disco)
+        assert cache.clave([str(archivo)], 'lzma2', None, tamaños=tamaños, mtimes=mtimes) == clave
+
+def test_comprimido_reutilizado_entre_ejecuciones(tmp_path, monkeypatch):
+    pytest.importorskip('py7zr')
+    (tmp_path / 'PACKING LIST.xls').write_bytes(b'PACKING LIST ' * 20_000)
+    ruta_cache = str(tmp_path / 'cache')
+    primero = compresor.validar_archivos_detalle(['PACKING LIST.xls'], str(tmp_path), 'envio', 0, ruta_cache=ruta_cache)
+    contenido = (tmp_path / 'envio.7z').read_bytes()
+    os.remove(tmp_path / 'envio.7z')
+
+    def sin_compresion(*args):
+        raise AssertionError('debería reutilizar el comprimido de la cache')
+
+    monkeypatch.setattr(compresor.main, 'comprimir_por_tipo', sin_compresion)
+    segundo = compresor.validar_archivos_detalle(['PACKING LIST.xls'], str(tmp_path), 'envio', 0, ruta_cache=ruta_cache)
+    assert segundo == primero
+    assert (tmp_path / 'envio.7z').read_bytes() == contenido
+
+def test_desalojo_lru(tmp_path):
+    with CacheContenido(str(tmp_path / 'cache'), tamaño_maximo_mb=1) as cache:
+        for clave in ('a', 'b', 'c'):
+            origen = tmp_path / f'{clave}.7z'
+            origen.write_bytes(os.urandom(400 * 1024))
+            cache.guardar(clave, str(origen), [])
+        assert cache.obtener('a', str(tmp_path / 'a.salida')) is None
+        assert cache.obtener('c', str(tmp_path / 'c.salida')) == []
+        assert cache.limpiar() == 2 * 400 * 1024
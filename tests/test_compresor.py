@@ -0,0 +1,38 @@
+import os
+import pytest
+from modules.compresor.main import codec_archivo, comprimir_por_tipo, validar_archivos_detalle
+
+py7zr = pytest.importorskip('py7zr')
+
+def carpeta_con_archivos(tmp_path):
+    (tmp_path / 'FULL SET.pdf').write_bytes(os.urandom(200_000))
+    (tmp_path / 'PACKING LIST.xls').write_bytes(b'PACKING LIST ' * 20_000)
+    return ['FULL SET.pdf', 'PACKING LIST.xls']
+
+def test_codec_por_tipo_de_archivo():
+    assert codec_archivo('FULL SET.PDF ', 'lzma2') == 'copy'
+    assert codec_archivo('PACKING LIST.xls', 'lzma2') == 'lzma2'
+    assert codec_archivo('PACKING LIST.xls', 'zstd') == 'zstd'
+
+def test_comprimir_por_tipo_guarda_los_pdf_y_comprime_el_resto(tmp_path):
+    archivos = carpeta_con_archivos(tmp_path)
+    ruta_7z = str(tmp_path / 'envio.7z')
+    estadisticas = {estadistica['archivo']: estadistica for estadistica in comprimir_por_tipo(archivos, ruta_7z, str(tmp_path))}
+
+    assert estadisticas['FULL SET.pdf']['codec'] == 'copy'
+    assert estadisticas['PACKING LIST.xls']['codec'] == 'lzma2'
+    assert estadisticas['PACKING LIST.xls']['ratio'] < 0.1
+    destino = tmp_path / 'extraido'
+    with py7zr.SevenZipFile(ruta_7z, 'r') as archive:
+        archive.extractall(destino)
+    for archivo in archivos:
+        assert (destino / archivo).read_bytes() == (tmp_path / archivo).read_bytes()
+
+def test_validar_archivos_solo_comprime_sobre_el_limite(tmp_path):
+    archivos = carpeta_con_archivos(tmp_path)
+    assert validar_archivos_detalle(archivos, str(tmp_path), 'envio')[0] == archivos
+
+    validados, tamaño, estadisticas = validar_archivos_detalle(archivos, str(tmp_path), 'envio', tamaño_maximo=0)
+    assert validados == ['envio.7z']
+    assert tamaño == os.path.getsize(tmp_path / 'envio.7z') / (1024 * 1024)
+    assert len(estadisticas) == 2
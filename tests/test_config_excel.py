@@ -0,0 +1,75 @@
+import os
+import shutil
+import pytest
+from models import config_excel
+
+LIBRO = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'test', 'Configuracion', 'Plantilla_de_Configuracion.xlsx')
+
+def test_indices_equivalen_a_la_busqueda_lineal():
+    modelo = config_excel.load_config(LIBRO)
+    for item in modelo.recibidores_emails:
+        primero = next(otro for otro in modelo.recibidores_emails if str(otro.recibidor).strip().upper() == str(item.recibidor).strip().upper())
+        assert modelo.buscar_recibidor(f' {str(item.recibidor).lower()} ') is primero
+    for item in modelo.resumen_cc:
+        assert modelo.buscar_copia(item.cc).cc == item.cc
+    assert modelo.buscar_recibidor('NO EXISTE') is None
+
+def test_normalizar_clave_y_separar_emails():
+    assert config_excel.normalizar_clave(1.0) == config_excel.normalizar_clave(1) == '1'
+    assert config_excel.normalizar_clave(' divine ') == 'DIVINE'
+    assert config_excel.separar_emails('a@x.com; b@x.com,, c@x.com ') == ('a@x.com', 'b@x.com', 'c@x.com')
+    assert config_excel.separar_emails(float('nan')) == ()
+
+@pytest.fixture
+def libro(tmp_path):
+    ruta = tmp_path / 'Plantilla_de_Configuracion.xlsx'
+    shutil.copyfile(LIBRO, ruta)
+    return str(ruta)
+
+def test_snapshot_sin_cambios_no_lee_el_libro(libro, tmp_path, monkeypatch):
+    cache = str(tmp_path / 'cache')
+    modelo = config_excel.load_config_cached(libro, cache)
+
+    def sin_lectura(*args):
+        raise AssertionError('no debería leer el libro')
+
+    monkeypatch.setattr(config_excel, 'hash_archivo', sin_lectura)
+    monkeypatch.setattr(config_excel, 'load_config_selectivo', sin_lectura)
+    assert config_excel.load_config_cached(libro, cache).to_dict() == modelo.to_dict()
+
+def test_snapshot_con_otro_mtime_compara_el_hash(libro, tmp_path, monkeypatch):
+    cache = str(tmp_path / 'cache')
+    modelo = config_excel.load_config_cached(libro, cache)
+    estado = os.stat(libro)
+    os.utime(libro, ns=(estado.st_atime_ns, estado.st_mtime_ns + 10 ** 9))
+
+    def sin_carga(*args):
+        raise AssertionError('el contenido es el mismo, no debería regenerarse')
+
+    monkeypatch.setattr(config_excel, 'load_config_selectivo', sin_carga)
+    assert config_excel.load_config_cached(libro, cache).to_dict() == modelo.to_dict()
+    snapshot = config_excel.leer_snapshot(config_excel.ruta_snapshot(libro, cache))
+    assert snapshot['firma']['mtime'] == estado.st_mtime_ns + 10 ** 9
+
+def sin_nan(valor):
+    if isinstance(valor, float) and valor != valor:
+        return None  # pandas devuelve NaN en las celdas vacías; el lector selectivo, None
+    if isinstance(valor, dict):
+        return {clave: sin_nan(dato) for clave, dato in valor.items()}
+    if isinstance(valor, list):
+        return [sin_nan(dato) for dato in valor]
+    return valor
+
+def test_lector_selectivo_equivale_al_de_pandas():
+    pytest.importorskip('pandas')
+    assert config_excel.load_config_selectivo(LIBRO).to_dict() == sin_nan(config_excel.load_config(LIBRO).to_dict())
+
+def test_guardar_snapshot_no_deja_temporales(tmp_path):
+    ruta = str(tmp_path / 'cache' / 'snapshot.pkl')
+    (tmp_path / 'cache').mkdir()
+    (tmp_path / 'cache' / 'snapshot.pkl.tmp').write_bytes(b'de otro proceso')
+    config_excel.guardar_snapshot(ruta, {'mtime': 1}, {'modelo': 1})
+    config_excel.guardar_snapshot(ruta, {'mtime': 2}, {'modelo': 2})
+
+    assert config_excel.leer_snapshot(ruta)['firma'] == {'mtime': 2}
+    assert sorted(nombre.name for nombre in (tmp_path / 'cache').iterdir()) == ['snapshot.pkl', 'snapshot.pkl.tmp']
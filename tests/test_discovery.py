@@ -0,0 +1,55 @@
+import os
+import json
+import threading
+import httplib2
+from modules.email_sender import discovery
+
+def test_documento_incluido_se_guarda_en_la_cache(tmp_path):
+    cache = str(tmp_path / 'cache')
+    documento = discovery.cargar_documento('gmail', 'v1', cache)
+    assert documento['name'] == 'gmail'
+    with open(os.path.join(cache, 'gmail.v1.json'), encoding='utf-8') as archivo:
+        assert json.load(archivo)['revision'] == documento['revision']
+
+def test_sin_documento_incluido_usa_el_estatico(tmp_path, monkeypatch):
+    monkeypatch.setattr(discovery, 'DISCOVERY_PATH', str(tmp_path))
+    assert discovery.cargar_documento('drive', 'v3')['name'] == 'drive'
+
+def test_servicio_con_url_raiz_alternativa():
+    servicio = discovery.construir_servicio('gmail', 'v1', httplib2.Http(), root_url='http://127.0.0.1:8765')
+    assert servicio._baseUrl.startswith('http://127.0.0.1:8765/')
+
+def test_caches_simultaneas_no_leen_documentos_a_medias(tmp_path):
+    cache = str(tmp_path / 'cache')
+    documentos = []
+
+    def cargar():
+        for _ in range(5):
+            documentos.append(discovery.cargar_documento('gmail', 'v1', cache)['revision'])
+
+    hilos = [threading.Thread(target=cargar) for _ in range(8)]
+    for hilo in hilos:
+        hilo.start()
+    for hilo in hilos:
+        hilo.join()
+    assert len(documentos) == 40 and len(set(documentos)) == 1
+    assert os.listdir(cache) == ['gmail.v1.json']
+
+def test_cache_mas_antigua_que_el_documento_incluido_se_descarta(tmp_path, monkeypatch):
+    incluidos = tmp_path / 'incluidos'
+    incluidos.mkdir()
+    monkeypatch.setattr(discovery, 'DISCOVERY_PATH', str(incluidos))
+    cache = str(tmp_path / 'cache')
+    incluido = incluidos / 'gmail.v1.json'
+
+    incluido.write_text(json.dumps({'revision': '1'}), encoding='utf-8')
+    assert discovery.cargar_documento('gmail', 'v1', cache)['revision'] == '1'
+    assert discovery.cargar_documento('gmail', 'v1', cache)['revision'] == '1'
+
+    # Documento incluido actualizado después de poblar la caché
+    incluido.write_text(json.dumps({'revision': '2'}), encoding='utf-8')
+    cacheado = os.path.getmtime(os.path.join(cache, 'gmail.v1.json'))
+    os.utime(incluido, (cacheado + 10, cacheado + 10))
+    assert discovery.cargar_documento('gmail', 'v1', cache)['revision'] == '2'
+    with open(os.path.join(cache, 'gmail.v1.json'), encoding='utf-8') as archivo:
+        assert json.load(archivo)['revision'] == '2'
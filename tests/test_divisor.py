@@ -0,0 +1,59 @@
+import pytest
+from modules.divisor import main as divisor
+from modules.divisor.main import ArchivoExcedido, asunto_parte, combinar_estados, dividir_archivos, tamaño_adjunto
+
+MB = 1024 * 1024
+
+def test_todo_en_una_parte_si_cabe():
+    tamaños = {'a.pdf': MB, 'b.xls': 2 * MB}
+    assert dividir_archivos(['a.pdf', 'b.xls'], '/no/existe', 25, tamaños) == [['a.pdf', 'b.xls']]
+
+def test_first_fit_decreasing_respeta_el_limite_y_el_orden():
+    archivos = ['1.pdf', '2.pdf', '3.pdf', '4.xls', '5.xls']
+    tamaños = {'1.pdf': 6 * MB, '2.pdf': 2 * MB, '3.pdf': 4 * MB, '4.xls': 5 * MB, '5.xls': 3 * MB}
+    partes = dividir_archivos(archivos, '/no/existe', 10, tamaños)
+
+    assert sorted(archivo for parte in partes for archivo in parte) == archivos
+    capacidad = 10 * MB - divisor.CABECERAS_MENSAJE
+    for parte in partes:
+        assert sum(tamaño_adjunto(tamaños[archivo]) for archivo in parte) <= capacidad
+        assert parte == sorted(parte, key=archivos.index)
+    assert partes == [['1.pdf'], ['2.pdf', '4.xls'], ['3.pdf', '5.xls']]  # en base64, ~7.6 MB de archivos por parte
+
+def test_archivo_mayor_al_limite():
+    with pytest.raises(ArchivoExcedido) as error:
+        dividir_archivos(['chico.pdf', 'grande.pdf'], '/no/existe', 1, {'chico.pdf': 1, 'grande.pdf': MB})
+    assert error.value.archivos == ['grande.pdf']
+
+def test_sin_archivos_no_hay_partes():
+    assert dividir_archivos([], '/no/existe', 25, {}) == []
+
+def test_asunto_parte():
+    assert asunto_parte('FULL SET', 1, 1) == 'FULL SET'
+    assert asunto_parte('FULL SET', 2, 3) == 'FULL SET (2/3)'
+
+def test_combinar_estados_una_sola_parte():
+    estado = {'estado': False, 'descripcion': 'Error al enviar'}
+    assert combinar_estados([estado]) is estado
+
+def test_combinar_estados_informa_las_partes_fallidas():
+    resultado = combinar_estados([{'estado': True, 'descripcion': 'ok'}, {'estado': False, 'descripcion': 'rechazado'}])
+    assert resultado == {'estado': False, 'descripcion': 'Parte 2/2: rechazado'}
+
+def test_combinar_estados_sin_envios_es_fallo():
+    assert combinar_estados([])['estado'] is False
+
+def test_combinar_estados_suma_contadores_y_propaga_pendiente():
+    estados = [
+        {'estado': True, 'descripcion': 'ok', 'reintentos': 1, 'espera_cuota': 0.5},
+        {'estado': False, 'descripcion': 'cuota', 'reintentos': 2, 'espera_cuota': 1.0, 'pendiente': True}
+    ]
+    resultado = combinar_estados(estados)
+    assert resultado['estado'] is False
+    assert resultado['descripcion'] == 'Parte 2/2: cuota'
+    assert resultado['reintentos'] == 3 and resultado['espera_cuota'] == 1.5
+    assert resultado['pendiente'] is True
+
+def test_combinar_estados_todas_enviadas():
+    resultado = combinar_estados([{'estado': True, 'descripcion': 'ok'}] * 3)
+    assert resultado == {'estado': True, 'descripcion': 'Correo enviado correctamente en 3 partes.'}
@@ -0,0 +1,203 @@
+import os
+import json
+import time
+import threading
+import httplib2
+import pytest
+from googleapiclient.errors import HttpError
+from googleapiclient.http import HttpRequest
+from modules.email_sender import drive as modulo_drive
+from modules.email_sender.drive import EstadoSubidas, SubidorDrive, calcular_md5, enlace_drive, obtener_estado
+from modules.email_sender.limitador import LimitadorEnvios
+
+class Llamada:
+    def __init__(self, resultado):
+        self.resultado = resultado
+
+    def execute(self):
+        return self.resultado
+
+class LoteFalso:
+    def __init__(self, callback, permisos, fallos):
+        self.callback = callback
+        self.permisos = permisos
+        self.fallos = fallos
+        self.solicitudes = []
+
+    def add(self, solicitud, request_id):
+        self.solicitudes.append(request_id)
+
+    def execute(self):
+        for request_id in self.solicitudes:
+            if self.fallos.get(request_id):
+                self.callback(request_id, None, self.fallos[request_id].pop(0))
+                continue
+            self.permisos.append(request_id)
+            self.callback(request_id, {}, None)
+
+class Permisos:
+    def create(self, fileId, body):
+        return (fileId, body)
+
+class DriveFalso:
+    """
+    Cliente de Drive con un único archivo ya subido; falla si se intenta subir otro.
+    """
+
+    def __init__(self, file_id, md5, fallos=None):
+        self.archivo = {'id': file_id, 'md5Checksum': md5}
+        self.permisos = []
+        self.fallos = fallos or {}
+
+    def files(self):
+        return self
+
+    def list(self, **kwargs):
+        return Llamada({'files': [self.archivo]})
+
+    def get(self, fileId, **kwargs):
+        return Llamada(self.archivo)
+
+    def create(self, **kwargs):
+        raise AssertionError('el archivo ya está en Drive, no debería subirse')
+
+    def permissions(self):
+        return Permisos()
+
+    def new_batch_http_request(self, callback):
+        return LoteFalso(callback, self.permisos, self.fallos)
+
+class HttpGrabador:
+    """
+    Transporte HTTP que devuelve respuestas preparadas y registra cada solicitud.
+    """
+
+    def __init__(self, respuestas):
+        self.respuestas = respuestas
+        self.llamadas = []
+
+    def request(self, uri, method='GET', body=None, headers=None, **kwargs):
+        self.llamadas.append((uri, method, dict(headers or {})))
+        estado, contenido = self.respuestas.pop(0)
+        return httplib2.Response(estado), contenido
+
+class DriveSubida(DriveFalso):
+    """
+    Cliente de Drive sin el archivo: create arma una carga reanudable real sobre `http`.
+    """
+
+    def __init__(self, http):
+        super().__init__('otro', 'md5-distinto')
+        self.http = http
+
+    def create(self, body, media_body, fields):
+        return HttpRequest(self.http, lambda resp, contenido: json.loads(contenido), 'https://upload/files', method='POST', resumable=media_body)
+
+def error_http(estado, razon):
+    contenido = b'{"error": {"message": "error", "errors": [{"reason": "%s"}]}}' % razon.encode()
+    return HttpError(httplib2.Response({'status': str(estado)}), contenido)
+
+class SesionFalsa:
+    def __init__(self, drive):
+        self.drive = drive
+
+def test_estado_persiste_entre_ejecuciones(tmp_path):
+    ruta = str(tmp_path / 'drive' / 'subidas.json')
+    estado = EstadoSubidas(ruta)
+    estado.guardar_sesion('md5:10', 'https://upload/sesion')
+    estado.guardar_archivo('md5:20', 'id-20', compartido=True)
+
+    recargado = EstadoSubidas(ruta)
+    assert recargado.sesion('md5:10') == 'https://upload/sesion'
+    assert recargado.archivo('md5:20') == {'id': 'id-20', 'compartido': True}
+
+def test_sesion_vencida_no_se_reanuda(tmp_path, monkeypatch):
+    estado = EstadoSubidas(str(tmp_path / 'subidas.json'))
+    estado.guardar_sesion('md5:10', 'https://upload/sesion')
+    ahora = time.time()
+    monkeypatch.setattr(modulo_drive.time, 'time', lambda: ahora + modulo_drive.VIGENCIA_SESION + 1)
+    assert estado.sesion('md5:10') is None
+
+def test_contenido_ya_subido_se_reutiliza_y_se_comparte_una_vez(tmp_path):
+    archivo = tmp_path / 'FULL SET.pdf'
+    archivo.write_bytes(os.urandom(2000))
+    drive = DriveFalso('id-existente', calcular_md5(str(archivo)))
+    subidor = SubidorDrive(SesionFalsa(drive), str(tmp_path / 'subidas.json'))
+
+    assert subidor.subir([str(archivo)]) == [enlace_drive('id-existente')]
+    assert subidor.subir([str(archivo)]) == [enlace_drive('id-existente')]
+    assert drive.permisos == ['id-existente']
+
+def test_compartir_reintenta_solo_las_solicitudes_fallidas(tmp_path):
+    drive = DriveFalso('id-1', 'md5', fallos={'id-2': [error_http(429, 'rateLimitExceeded')]})
+    limitador = LimitadorEnvios(0, 0, reintentos=2, espera_base=0.001, espera_maxima=0.001)
+    subidor = SubidorDrive(SesionFalsa(drive), str(tmp_path / 'subidas.json'), limitador=limitador)
+    subidor._compartir([('md5:1', 'id-1'), ('md5:2', 'id-2')])
+
+    assert drive.permisos == ['id-1', 'id-2']
+    assert subidor.estado.archivo('md5:2') == {'id': 'id-2', 'compartido': True}
+
+def test_compartir_con_error_permanente_conserva_lo_compartido(tmp_path):
+    drive = DriveFalso('id-1', 'md5', fallos={'id-2': [error_http(403, 'forbidden')]})
+    limitador = LimitadorEnvios(0, 0, reintentos=2, espera_base=0.001, espera_maxima=0.001)
+    subidor = SubidorDrive(SesionFalsa(drive), str(tmp_path / 'subidas.json'), limitador=limitador)
+    with pytest.raises(RuntimeError, match='id-2'):
+        subidor._compartir([('md5:1', 'id-1'), ('md5:2', 'id-2')])
+
+    assert subidor.estado.archivo('md5:1') == {'id': 'id-1', 'compartido': True}
+    assert subidor.estado.archivo('md5:2') is None
+
+def test_estado_compartido_por_ruta(tmp_path):
+    ruta = str(tmp_path / 'drive' / 'subidas.json')
+    assert obtener_estado(ruta) is obtener_estado(ruta)
+    assert obtener_estado(None) is not obtener_estado(None)
+
+def test_guardados_simultaneos_no_pierden_entradas(tmp_path):
+    ruta = str(tmp_path / 'subidas.json')
+    estado = obtener_estado(ruta)
+
+    def guardar(numero):
+        for indice in range(20):
+            estado.guardar_archivo(f'{numero}:{indice}', f'id-{numero}-{indice}')
+
+    hilos = [threading.Thread(target=guardar, args=(numero,)) for numero in range(8)]
+    for hilo in hilos:
+        hilo.start()
+    for hilo in hilos:
+        hilo.join()
+
+    with open(ruta, 'r', encoding='utf-8') as archivo:
+        assert len(json.load(archivo)['archivos']) == 160
+    assert [nombre for nombre in tmp_path.iterdir() if nombre.suffix == '.tmp'] == []
+    assert EstadoSubidas(ruta).archivo('7:19') == {'id': 'id-7-19', 'compartido': False}
+
+
+def test_subida_guardada_continua_desde_el_ultimo_byte(tmp_path):
+    archivo = tmp_path / 'FULL SET.7z'
+    archivo.write_bytes(os.urandom(2000))
+    http = HttpGrabador([({'status': '308', 'range': 'bytes=0-999'}, b''),
+                         ({'status': '200'}, b'{"id": "id-nuevo"}')])
+    subidor = SubidorDrive(SesionFalsa(DriveSubida(http)), str(tmp_path / 'subidas.json'))
+    clave = f'{calcular_md5(str(archivo))}:2000'
+    subidor.estado.guardar_sesion(clave, 'https://upload/sesion')
+
+    assert subidor._subir(str(archivo)) == (clave, 'id-nuevo')
+    assert [(uri, metodo) for uri, metodo, _ in http.llamadas] == [('https://upload/sesion', 'PUT')] * 2
+    assert http.llamadas[0][2]['Content-Range'] == 'bytes */2000'
+    assert http.llamadas[1][2]['Content-Range'] == 'bytes 1000-1999/2000'
+    assert subidor.estado.sesion(clave) is None
+    subidor.cerrar()
+
+def test_subida_guardada_vencida_empieza_de_nuevo(tmp_path):
+    archivo = tmp_path / 'FULL SET.7z'
+    archivo.write_bytes(os.urandom(2000))
+    http = HttpGrabador([({'status': '404'}, b'{"error": {"message": "no existe"}}'),
+                         ({'status': '200', 'location': 'https://upload/nueva'}, b''),
+                         ({'status': '200'}, b'{"id": "id-nuevo"}')])
+    subidor = SubidorDrive(SesionFalsa(DriveSubida(http)), str(tmp_path / 'subidas.json'))
+    clave = f'{calcular_md5(str(archivo))}:2000'
+    subidor.estado.guardar_sesion(clave, 'https://upload/vieja')
+
+    assert subidor._subir(str(archivo)) == (clave, 'id-nuevo')
+    assert [uri for uri, _, _ in http.llamadas] == ['https://upload/vieja', 'https://upload/files', 'https://upload/nueva']
+    subidor.cerrar()
@@ -0,0 +1,44 @@
+from openpyxl import load_workbook
+from modules.informe.main import COLUMNAS, COLUMNAS_METRICAS, HOJA_METRICAS, anexar_informe, escribir_informe
+
+def registro(asunto, estado=True):
+    return {
+        'estructura': {'asunto': asunto, 'recibidor': 'DIVINE', 'cuerpo': 'Dear <br>\nAdjuntos <b>docs</b>', 'adjuntos': ['a.pdf', 'b.xls'], 'emails_para': 'para@example.com'},
+        'estado_correo': {'estado': estado, 'descripcion': 'Correo enviado correctamente.' if estado else 'Error'}
+    }
+
+def filas(ruta_archivo):
+    hoja = load_workbook(ruta_archivo).active
+    return [list(fila) for fila in hoja.iter_rows(values_only=True)]
+
+def test_informe_en_una_pasada(tmp_path):
+    ruta_archivo = escribir_informe([registro('uno'), registro('dos', False)], str(tmp_path), 'informe.xlsx')
+    contenido = filas(ruta_archivo)
+
+    assert contenido[0] == COLUMNAS
+    assert len(contenido) == 3
+    fila = dict(zip(COLUMNAS, contenido[1]))
+    assert fila['Asunto'] == 'uno'
+    assert fila['cuerpo'] == 'Dear \nAdjuntos docs'
+    assert fila['Adjuntos'] == 'a.pdf, b.xls'
+    assert dict(zip(COLUMNAS, contenido[2]))['Estado Envio'] == 'ERROR'
+
+def test_anexar_solo_agrega_las_filas_nuevas(tmp_path):
+    anexar_informe([registro('uno')], str(tmp_path), 'informe.xlsx')
+    ruta_archivo = anexar_informe([registro('dos'), registro('tres')], str(tmp_path), 'informe.xlsx')
+    contenido = filas(ruta_archivo)
+
+    assert contenido[0] == COLUMNAS
+    assert [fila[0] for fila in contenido[1:]] == ['uno', 'dos', 'tres']
+
+def test_hoja_de_metricas_por_carpeta(tmp_path):
+    con_metricas = registro('uno')
+    con_metricas['metricas'] = {'etapas': {'enviar': 1.23456}, 'contadores': {'bytes_adjuntos': 3 * 1024 * 1024}}
+    ruta_archivo = escribir_informe([con_metricas, registro('dos')], str(tmp_path), 'informe.xlsx')
+
+    hoja = load_workbook(ruta_archivo)[HOJA_METRICAS]
+    contenido = [list(fila) for fila in hoja.iter_rows(values_only=True)]
+    assert contenido[0] == COLUMNAS_METRICAS
+    assert len(contenido) == 2
+    fila = dict(zip(COLUMNAS_METRICAS, contenido[1]))
+    assert fila['Asunto'] == 'uno' and fila['Envio (s)'] == 1.235 and fila['MB Adjuntos'] == 3
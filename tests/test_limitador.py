@@ -0,0 +1,54 @@
+import smtplib
+import pytest
+import httplib2
+from googleapiclient.errors import HttpError
+from modules.email_sender.limitador import CuboTokens, CuotaExcedida, LimitadorEnvios, pendiente, reintentable, retry_after
+
+def error_http(estado, retry=None, razon=None):
+    cabeceras = {'status': str(estado)}
+    if retry is not None:
+        cabeceras['retry-after'] = retry
+    contenido = b'{"error": {"message": "error", "errors": [{"reason": "%s"}]}}' % (razon or 'backendError').encode()
+    return HttpError(httplib2.Response(cabeceras), contenido)
+
+def test_cubo_reserva_en_deuda():
+    cubo = CuboTokens(10, 10)
+    assert cubo.reservar(10) == 0.0
+    assert cubo.reservar(5) == pytest.approx(0.5, abs=0.05)
+    cubo.devolver(5)
+    assert cubo.reservar(5) == pytest.approx(0.5, abs=0.05)
+
+def test_errores_reintentables():
+    assert reintentable(error_http(429))
+    assert reintentable(error_http(503))
+    assert reintentable(error_http(403, razon='userRateLimitExceeded'))
+    assert not reintentable(error_http(403, razon='forbidden'))
+    assert not reintentable(error_http(400))
+    assert reintentable(smtplib.SMTPResponseException(451, b'temporal'))
+    assert not reintentable(smtplib.SMTPResponseException(550, b'rechazado'))
+    assert pendiente(CuotaExcedida('sin cuota'))
+    assert not pendiente(ValueError('archivo no encontrado'))
+
+def test_retry_after():
+    assert retry_after(error_http(429, '7')) == 7.0
+    assert retry_after(error_http(429)) is None
+
+def test_ejecutar_reintenta_y_cuenta():
+    limitador = LimitadorEnvios(0, 0, reintentos=2, espera_base=0.001, espera_maxima=0.001)
+    intentos = []
+
+    def envio():
+        intentos.append(1)
+        if len(intentos) < 3:
+            raise error_http(500)
+        return 'ok'
+
+    medicion = {}
+    assert limitador.ejecutar(envio, medicion=medicion) == 'ok'
+    assert medicion['reintentos'] == 2 and len(intentos) == 3
+
+def test_cuota_diaria_agotada():
+    limitador = LimitadorEnvios(0, 10, espera_cuota_maxima=1)
+    limitador.ejecutar(lambda: None, destinatarios=10)
+    with pytest.raises(CuotaExcedida):
+        limitador.ejecutar(lambda: None, destinatarios=5)
@@ -0,0 +1,25 @@
+import os
+from modules.listar_archivos import listar_archivos, recorrer_carpetas
+
+def test_recorrer_carpetas_trae_tamaño_y_mtime(tmp_path):
+    carpeta = tmp_path / 'FULL SET A'
+    carpeta.mkdir()
+    (carpeta / 'a.pdf').write_bytes(b'x' * 1234)
+    (carpeta / 'desktop.ini').write_bytes(b'')
+    (carpeta / 'subcarpeta').mkdir()
+    (tmp_path / 'suelto.pdf').write_bytes(b'')
+
+    carpetas = recorrer_carpetas(str(tmp_path))
+    assert list(carpetas) == ['FULL SET A']
+    archivo = carpetas['FULL SET A']['a.pdf']
+    assert (archivo.nombre, archivo.tamaño) == ('a.pdf', 1234)
+    assert archivo.mtime_ns == os.stat(carpeta / 'a.pdf').st_mtime_ns
+    assert not (carpeta / 'desktop.ini').exists()
+
+def test_listar_archivos_conserva_su_forma(tmp_path):
+    for carpeta in ('FULL SET A', 'Listo'):
+        (tmp_path / carpeta).mkdir()
+    (tmp_path / 'FULL SET A' / 'a.pdf').write_bytes(b'')
+
+    assert recorrer_carpetas(str(tmp_path), excluidas=('Listo',)).keys() == {'FULL SET A'}
+    assert listar_archivos(str(tmp_path)) == {'FULL SET A': ['a.pdf'], 'Listo': []}
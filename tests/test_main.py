@@ -0,0 +1,69 @@
+import os
+import pytest
+import main
+from modules.bitacora import Bitacora
+from modules.configuracion import Configuracion
+from modules.email_sender import limite_mensaje_mb
+
+CONFIGURACION = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src', 'configuration', 'configuracion.yaml')
+MB = 1024 * 1024
+
+@pytest.fixture
+def configuracion(tmp_path, monkeypatch):
+    configuracion = Configuracion(CONFIGURACION)
+    configuracion.config.path.local.cache = str(tmp_path / 'cache')
+    configuracion.config.mail.config.limit_mb = 1
+    monkeypatch.setattr(main, 'CONFIG_GLOBAL', configuracion)
+    monkeypatch.setattr(main, 'BITACORA', Bitacora())
+    return configuracion
+
+def registro(tmp_path, archivos):
+    ruta = tmp_path / 'FULL SET A'
+    ruta.mkdir()
+    for nombre, contenido in archivos.items():
+        (ruta / nombre).write_bytes(contenido)
+    return {'carpeta': 'FULL SET A', 'ruta': str(ruta), 'archivos': list(archivos), 'tamaños': {nombre: len(contenido) for nombre, contenido in archivos.items()},
+            'mtimes': {nombre: os.stat(ruta / nombre).st_mtime_ns for nombre in archivos}}
+
+def test_limite_segun_el_transporte(configuracion):
+    mail = configuracion.config.mail.config
+    mail.limit_mb = 0
+    mail.transport, mail.api.upload_mode = 'api', 'resumable'
+    assert limite_mensaje_mb(configuracion) == 35
+    mail.api.upload_mode = 'raw'
+    assert limite_mensaje_mb(configuracion) == 25
+    mail.transport, mail.api.upload_mode = 'smtp', 'resumable'
+    assert limite_mensaje_mb(configuracion) == 25
+    mail.limit_mb = 10
+    assert limite_mensaje_mb(configuracion) == 10
+
+def test_pdf_mayor_al_limite_no_se_comprime(configuracion, tmp_path):
+    resultado = main.paso_validar(registro(tmp_path, {'FULL SET.pdf': os.urandom(2 * MB)}))
+    assert resultado['partes'] == []
+    assert 'mayores al límite' in resultado['rechazo'] and 'FULL SET.pdf' in resultado['rechazo']
+    assert not os.path.exists(os.path.join(resultado['ruta'], 'FULL SET A.7z'))
+    assert not main.bitacora().alcanzado('FULL SET A', 'compressed')
+
+def test_archivo_comprimible_se_comprime_y_se_divide(configuracion, tmp_path):
+    pytest.importorskip('py7zr')
+    resultado = main.paso_validar(registro(tmp_path, {'PACKING LIST.xls': b'PACKING LIST ' * (2 * MB // 13)}))
+    assert 'rechazo' not in resultado
+    assert resultado['partes'] == [['FULL SET A.7z']]
+
+def test_comprimido_que_sigue_excedido_falla(configuracion, tmp_path):
+    pytest.importorskip('py7zr')
+    resultado = main.paso_validar(registro(tmp_path, {'PACKING LIST.xls': os.urandom(2 * MB)}))
+    assert resultado['partes'] == []
+    assert 'mayores al límite' in resultado['rechazo'] and 'FULL SET A.7z' in resultado['rechazo']
+
+def test_carpeta_rechazada_se_informa_sin_enviar(configuracion, monkeypatch):
+    from models import CasoExportacion
+
+    def sin_envio(*args, **kwargs):
+        raise AssertionError('una carpeta rechazada no se envía')
+
+    monkeypatch.setattr('modules.email_sender.enviar_reciver', sin_envio)
+    rechazo = 'Archivos mayores al límite de 25 MB por correo: FULL SET.pdf'
+    resultado = main.paso_enviar({'carpeta': 'FULL SET A', 'ruta': '', 'partes': [], 'tamaños': {}, 'rechazo': rechazo,
+                                  'estructura': CasoExportacion(emails_para='cliente@example.com', asunto='FULL SET A')})
+    assert resultado['estado_correo'] == {'estado': False, 'descripcion': rechazo}
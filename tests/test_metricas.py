@@ -0,0 +1,51 @@
+import os
+import threading
+import pytest
+from concurrent.futures import ThreadPoolExecutor
+from modules.metricas.main import Metricas, en_carpeta, iniciar_metricas, medir, percentil, sumar
+
+def test_percentil():
+    assert percentil([], 0.5) == 0.0
+    assert percentil([1.0, 2.0, 3.0, 4.0], 0.5) == 2.5
+    assert percentil([1.0, 2.0, 3.0, 4.0], 0.95) == pytest.approx(3.85)
+
+def test_medir_atribuye_a_la_carpeta_del_hilo():
+    actuales = iniciar_metricas()
+
+    def procesar(carpeta, bytes_adjuntos):
+        with en_carpeta(carpeta):
+            with medir('enviar'):
+                sumar('bytes_adjuntos', bytes_adjuntos)
+
+    hilos = [threading.Thread(target=procesar, args=(f'FULL SET {numero}', numero)) for numero in range(1, 4)]
+    for hilo in hilos:
+        hilo.start()
+    for hilo in hilos:
+        hilo.join()
+
+    resumen = actuales.resumen()
+    assert resumen['etapas']['enviar']['cantidad'] == 3
+    assert resumen['contadores'] == {'bytes_adjuntos': 6}
+    assert actuales.carpeta('FULL SET 2')['contadores'] == {'bytes_adjuntos': 2}
+    assert set(actuales.carpeta('FULL SET 3')['etapas']) == {'enviar'}
+
+def test_escribir_prometheus(tmp_path):
+    actuales = Metricas()
+    actuales.registrar('enviar', 1.5)
+    actuales.sumar('correos', 2)
+    ruta = actuales.escribir_prometheus(str(tmp_path))
+
+    with open(ruta, 'r', encoding='utf-8') as archivo:
+        lineas = archivo.read().splitlines()
+    assert 'fullset_etapa_segundos{etapa="enviar",medida="total"} 1.5' in lineas
+    assert 'fullset_etapa_cantidad{etapa="enviar"} 1' in lineas
+    assert 'fullset_correos 2' in lineas
+    assert os.listdir(tmp_path) == ['metricas.prom']
+
+def test_escrituras_simultaneas_de_prometheus(tmp_path):
+    actuales = Metricas()
+    actuales.sumar('correos', 1)
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        list(executor.map(lambda _: actuales.escribir_prometheus(str(tmp_path)), range(40)))
+
+    assert os.listdir(tmp_path) == ['metricas.prom']
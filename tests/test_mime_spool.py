@@ -0,0 +1,59 @@
+import os
+import base64
+from email import policy
+from email.parser import BytesParser
+from modules.email_sender.mime_spool import cabecera, escribir_base64, mensaje_en_spool, tamaño_base64
+
+ASUNTO = 'FULL SET OF DOCS OE232400596 - MAERSK BULAN - EXPORTADORA ÑANDÚ Y CÍA (ETA 01-05-2024)'
+
+def leer(spool):
+    with spool:
+        return spool.read()
+
+def test_mensaje_en_spool_se_puede_leer(tmp_path):
+    adjunto = tmp_path / 'factura.pdf'
+    adjunto.write_bytes(os.urandom(5000))
+    spool, tamaño = mensaje_en_spool({'To': 'cliente@example.com', 'Subject': 'Documentos'}, '<p>Adjuntos</p>', [str(adjunto)])
+    datos = leer(spool)
+
+    assert len(datos) == tamaño
+    mensaje = BytesParser(policy=policy.default).parsebytes(datos)
+    assert mensaje['Subject'] == 'Documentos'
+    partes = list(mensaje.iter_attachments())
+    assert partes[0].get_filename() == adjunto.name
+    assert partes[0].get_content() == adjunto.read_bytes()
+
+def test_cabecera_no_ascii_usa_encoded_words():
+    linea = cabecera('Subject', 'Envío España')
+    linea.decode('ascii')
+    assert b'=?utf-8?' in linea
+    assert linea.endswith(b'\r\n')
+
+def test_mensaje_con_asunto_no_ascii(tmp_path):
+    adjunto = tmp_path / 'FULL SET OE232400596.pdf'
+    adjunto.write_bytes(os.urandom(5000))
+    spool, tamaño = mensaje_en_spool({'To': 'José Peña <jose@example.com>', 'Subject': ASUNTO}, '<p>Señores</p>', [str(adjunto)])
+    datos = leer(spool)
+
+    assert len(datos) == tamaño
+    cabeceras = datos.split(b'\r\n\r\n', 1)[0]
+    cabeceras.decode('ascii')  # sin bytes de 8 bits en las cabeceras
+    mensaje = BytesParser(policy=policy.default).parsebytes(datos)
+    assert mensaje['Subject'] == ASUNTO
+    assert mensaje['To'].addresses[0].display_name == 'José Peña'
+    partes = list(mensaje.iter_attachments())
+    assert partes[0].get_filename() == adjunto.name
+    assert partes[0].get_content() == adjunto.read_bytes()
+
+def test_base64_por_bloques_coincide_con_el_tamaño_estimado(tmp_path):
+    for tamaño in (0, 1, 56, 57, 58, 1024 * 1024 + 3):
+        origen = tmp_path / f'{tamaño}.bin'
+        contenido = os.urandom(tamaño)
+        origen.write_bytes(contenido)
+        destino = tmp_path / f'{tamaño}.b64'
+        with open(destino, 'wb') as archivo:
+            escribir_base64(str(origen), archivo)
+        codificado = destino.read_bytes()
+        assert len(codificado) == tamaño_base64(tamaño)
+        assert all(len(linea) <= 76 for linea in codificado.split(b'\r\n'))
+        assert base64.b64decode(codificado.replace(b'\r\n', b'')) == contenido
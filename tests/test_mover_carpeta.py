@@ -0,0 +1,51 @@
+import os
+from modules.mover_carpeta import main as mover_carpeta
+
+def crear_carpeta(ruta, archivos):
+    os.makedirs(ruta)
+    for nombre, tamaño in archivos.items():
+        with open(os.path.join(ruta, nombre), 'wb') as archivo:
+            archivo.write(b'x' * tamaño)
+
+def test_rename_usa_el_tamaño_del_escaneo(tmp_path, monkeypatch):
+    origen = tmp_path / 'FULL SET 1'
+    crear_carpeta(origen, {'a.pdf': 10, 'b.xls': 20})
+
+    def sin_recorrido(ruta):
+        raise AssertionError('el rename no debería recorrer el árbol')
+
+    monkeypatch.setattr(mover_carpeta, 'tamaño_arbol', sin_recorrido)
+    resultado = mover_carpeta.mover_elemento(str(origen), str(tmp_path / 'destino'), 30)
+    assert resultado['estado'] and resultado['metodo'] == 'rename' and resultado['bytes'] == 30
+    assert sorted(os.listdir(tmp_path / 'destino')) == ['a.pdf', 'b.xls']
+
+def test_copia_verificada_cuenta_y_elimina_el_origen(tmp_path):
+    origen = tmp_path / 'origen'
+    crear_carpeta(origen, {'a.pdf': 10, 'b.xls': 20})
+    assert mover_carpeta.copiar_verificado(str(origen), str(tmp_path / 'destino')) == 30
+    assert not origen.exists()
+    assert not (tmp_path / 'destino.parcial').exists()
+
+def test_entre_dispositivos_usa_la_copia_verificada(tmp_path, monkeypatch):
+    origen = tmp_path / 'FULL SET 1'
+    crear_carpeta(origen, {'a.pdf': 10})
+    monkeypatch.setattr(mover_carpeta, 'mismo_dispositivo', lambda origen, destino: False)
+    resultado = mover_carpeta.mover_elemento(str(origen), str(tmp_path / 'destino'))
+    assert resultado['estado'] and resultado['metodo'] == 'copia' and resultado['bytes'] == 10
+    assert not origen.exists()
+
+def test_mover_todo_vacia_en_proceso(tmp_path):
+    en_proceso = tmp_path / 'En Proceso'
+    crear_carpeta(en_proceso / 'FULL SET 1', {'a.pdf': 5})
+    crear_carpeta(en_proceso / 'FULL SET 2', {'b.pdf': 7})
+    resultados = mover_carpeta.mover_todo(str(tmp_path), 2, tamaños={'FULL SET 1': 5, 'FULL SET 2': 7})
+    assert sorted((resultado['elemento'], resultado['bytes']) for resultado in resultados) == [('FULL SET 1', 5), ('FULL SET 2', 7)]
+    assert os.listdir(en_proceso) == []
+
+def test_mover_todo_conserva_las_pendientes(tmp_path):
+    en_proceso = tmp_path / 'En Proceso'
+    crear_carpeta(en_proceso / 'enviada', {'a.pdf': 5})
+    crear_carpeta(en_proceso / 'pendiente', {'b.pdf': 7})
+    resultados = mover_carpeta.mover_todo(str(tmp_path), 2, {'pendiente'}, {'enviada': 5})
+    assert [(resultado['elemento'], resultado['bytes']) for resultado in resultados] == [('enviada', 5)]
+    assert os.listdir(en_proceso) == ['pendiente']
@@ -0,0 +1,45 @@
+import time
+import threading
+from modules.pipeline.main import Etapa, ejecutar_pipeline
+
+def test_conserva_el_orden_de_entrada():
+    def lenta(registro):
+        time.sleep(0.01 * (5 - registro['indice']))
+        registro['visto'] = True
+        return registro
+
+    resultados = ejecutar_pipeline(({'indice': indice} for indice in range(5)), [Etapa('lenta', lenta, 3)])
+    assert [registro['indice'] for registro in resultados] == list(range(5))
+    assert all(registro['visto'] for registro in resultados)
+
+def test_error_en_una_etapa_salta_las_siguientes():
+    def validar(registro):
+        if registro['indice'] == 1:
+            raise ValueError('archivo dañado')
+        return registro
+
+    def enviar(registro):
+        registro['enviado'] = True
+        return registro
+
+    resultados = ejecutar_pipeline([{'indice': indice} for indice in range(3)], [Etapa('validar', validar), Etapa('enviar', enviar)])
+    assert resultados[1]['error'] == {'etapa': 'validar', 'descripcion': 'archivo dañado'}
+    assert 'enviado' not in resultados[1]
+    assert resultados[0]['enviado'] and resultados[2]['enviado']
+
+def test_las_etapas_se_solapan():
+    activas = set()
+    solapadas = threading.Event()
+
+    def etapa(nombre):
+        def funcion(registro):
+            activas.add(nombre)
+            if len(activas) > 1:
+                solapadas.set()
+            time.sleep(0.02)
+            activas.discard(nombre)
+            return registro
+        return funcion
+
+    ejecutar_pipeline([{'indice': indice} for indice in range(4)], [Etapa('validar', etapa('validar')), Etapa('enviar', etapa('enviar'))])
+    assert solapadas.is_set()
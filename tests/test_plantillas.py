@@ -0,0 +1,32 @@
+import os
+from modules.email_sender.plantillas import RegistroPlantillas
+
+HTML = '<style>p { color: red; }</style><p>{saludo}, {nombre}. {sin_valor}</p>'
+
+def test_renderizar_equivale_a_replace(tmp_path):
+    ruta = tmp_path / 'plantilla.html'
+    ruta.write_text(HTML, encoding='utf-8')
+    registro = RegistroPlantillas()
+
+    esperado = HTML.replace('{saludo}', 'Dear').replace('{nombre}', 'DIVINE')
+    assert registro.renderizar(str(ruta), saludo='Dear', nombre='DIVINE') == esperado
+
+def test_recarga_la_plantilla_si_cambia_el_mtime(tmp_path):
+    ruta = tmp_path / 'plantilla.html'
+    ruta.write_text('<p>{nombre}</p>', encoding='utf-8')
+    registro = RegistroPlantillas()
+    assert registro.renderizar(str(ruta), nombre='uno') == '<p>uno</p>'
+
+    ruta.write_text('<b>{nombre}</b>', encoding='utf-8')
+    estado = os.stat(ruta)
+    os.utime(ruta, ns=(estado.st_atime_ns, estado.st_mtime_ns + 10 ** 9))
+    assert registro.renderizar(str(ruta), nombre='uno') == '<b>uno</b>'
+
+def test_renderizados_con_desalojo_lru(tmp_path):
+    ruta = tmp_path / 'plantilla.html'
+    ruta.write_text('{nombre}', encoding='utf-8')
+    registro = RegistroPlantillas(max_renderizados=2)
+    for nombre in ('a', 'b', 'a', 'c'):
+        registro.renderizar(str(ruta), nombre=nombre)
+
+    assert [dict(clave[2])['nombre'] for clave in registro.renderizados] == ['a', 'c']
@@ -0,0 +1,27 @@
+import os
+from email import policy
+from email.parser import BytesParser
+from modules.email_sender.mime_spool import mensaje_en_archivo
+from modules.pipeline.procesos import cerrar_procesos, configurar_procesos, ejecutar_en_proceso, procesos_activos
+
+def test_sin_workers_ejecuta_en_el_hilo_actual():
+    assert configurar_procesos(0) is None
+    assert not procesos_activos()
+    assert ejecutar_en_proceso(os.getpid) == os.getpid()
+
+def test_mensaje_en_archivo_desde_un_proceso(tmp_path):
+    adjunto = tmp_path / 'factura.pdf'
+    adjunto.write_bytes(os.urandom(3000))
+    configurar_procesos(1)
+    try:
+        assert ejecutar_en_proceso(os.getpid) != os.getpid()
+        ruta, tamaño = ejecutar_en_proceso(mensaje_en_archivo, {'To': 'cliente@example.com', 'Subject': 'Documentos'}, '<p>Adjuntos</p>', [str(adjunto)], str(tmp_path))
+    finally:
+        cerrar_procesos()
+
+    assert not procesos_activos()
+    assert os.path.getsize(ruta) == tamaño
+    with open(ruta, 'rb') as archivo:
+        mensaje = BytesParser(policy=policy.default).parse(archivo)
+    os.remove(ruta)
+    assert next(mensaje.iter_attachments()).get_content() == adjunto.read_bytes()
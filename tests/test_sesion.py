@@ -0,0 +1,92 @@
+import threading
+import pytest
+from concurrent.futures import ThreadPoolExecutor
+from google.oauth2.credentials import Credentials
+from modules.email_sender import sesion as modulo_sesion
+
+@pytest.fixture
+def autenticaciones(monkeypatch):
+    llamadas = []
+
+    def autenticar(*args, **kwargs):
+        llamadas.append(args)
+        return Credentials(token='prueba')
+
+    monkeypatch.setattr(modulo_sesion, 'autenticar', autenticar)
+    modulo_sesion.cerrar_sesion()
+    yield llamadas
+    modulo_sesion.cerrar_sesion()
+
+class ClientesFalsos:
+    abiertos = 0
+
+    def __init__(self, creds, ruta_cache, root_url):
+        ClientesFalsos.abiertos += 1
+        self.gmail = object()
+        self.cerrado = False
+
+    def cerrar(self):
+        if not self.cerrado:
+            self.cerrado = True
+            ClientesFalsos.abiertos -= 1
+
+def usar_en_pool(sesion, hilos):
+    barrera = threading.Barrier(hilos)
+
+    def usar(_):
+        sesion.gmail
+        barrera.wait()  # cada tarea queda en un hilo distinto del pool
+
+    with ThreadPoolExecutor(max_workers=hilos) as executor:
+        list(executor.map(usar, range(hilos)))
+
+def test_una_sola_sesion_por_proceso(autenticaciones):
+    sesion = modulo_sesion.obtener_sesion()
+    assert modulo_sesion.obtener_sesion() is sesion
+    assert sesion.gmail is sesion.gmail and sesion.drive is sesion.drive
+    assert len(autenticaciones) == 1
+
+def test_cerrar_sesion_crea_una_nueva_en_el_siguiente_uso(autenticaciones):
+    sesion = modulo_sesion.obtener_sesion()
+    modulo_sesion.cerrar_sesion()
+    assert modulo_sesion.obtener_sesion() is not sesion
+    assert len(autenticaciones) == 2
+
+def test_cada_hilo_tiene_sus_clientes(autenticaciones):
+    sesion = modulo_sesion.obtener_sesion()
+    servicios = {}
+
+    def usar(nombre):
+        servicios[nombre] = sesion.gmail
+
+    hilos = [threading.Thread(target=usar, args=(nombre,)) for nombre in ('a', 'b')]
+    for hilo in hilos:
+        hilo.start()
+    for hilo in hilos:
+        hilo.join()
+    assert servicios['a'] is not servicios['b']
+    assert sesion.gmail is not servicios['a']
+    assert len(autenticaciones) == 1
+
+def test_clientes_de_hilos_terminados_se_cierran(monkeypatch):
+    monkeypatch.setattr(modulo_sesion, 'ClientesHilo', ClientesFalsos)
+    ClientesFalsos.abiertos = 0
+    sesion = modulo_sesion.SesionCorreo(creds=object())
+    for _ in range(5):  # un pool nuevo por lote, como en modo daemon
+        usar_en_pool(sesion, 3)
+    sesion.gmail  # el hilo principal crea los suyos y poda los de los pools terminados
+    assert ClientesFalsos.abiertos == 1
+    assert len(sesion._clientes) == 1
+    sesion.cerrar()
+    assert ClientesFalsos.abiertos == 0
+
+def test_subidor_de_drive_se_reutiliza_hasta_cerrar_la_sesion(monkeypatch):
+    monkeypatch.setattr(modulo_sesion, 'ClientesHilo', ClientesFalsos)
+    sesion = modulo_sesion.SesionCorreo(creds=object())
+    subidor = sesion.subidor(None, 8, 2)
+    assert sesion.subidor(None, 8, 2) is subidor
+    assert sesion.subidor(None, 8, 4) is not subidor
+    sesion.cerrar()
+    with pytest.raises(RuntimeError):
+        subidor.executor.submit(print)
+    assert sesion.subidor(None, 8, 2) is not subidor
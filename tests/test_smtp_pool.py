@@ -0,0 +1,113 @@
+import io
+import smtplib
+import threading
+import socketserver
+import pytest
+from modules.email_sender.smtp_pool import ConexionSMTP, TransporteSMTP, error_conexion
+
+class ManejadorPrueba(socketserver.StreamRequestHandler):
+    """
+    Servidor SMTP mínimo que guarda cada mensaje recibido, ya sin el dot-stuffing.
+    """
+
+    def responder(self, linea):
+        self.wfile.write(f'{linea}\r\n'.encode('ascii'))
+
+    def handle(self):
+        servidor = self.server
+        servidor.conexiones += 1
+        self.responder('220 prueba')
+        while True:
+            linea = self.rfile.readline()
+            if not linea:
+                return
+            verbo = linea[:4].upper()
+            if verbo == b'EHLO':
+                self.wfile.write(b'250-prueba\r\n250-AUTH PLAIN\r\n250 SIZE 100000000\r\n')
+            elif verbo == b'AUTH':
+                self.responder('235 ok')
+            elif verbo == b'MAIL':
+                servidor.mail.append(linea)
+                self.responder('250 ok')
+            elif verbo == b'RCPT':
+                self.responder('550 no existe' if b'rechazado' in linea else '250 ok')
+            elif verbo == b'DATA':
+                self.responder('354 adelante')
+                datos = b''
+                while True:
+                    linea = self.rfile.readline()
+                    if linea == b'.\r\n':
+                        break
+                    datos += linea[1:] if linea.startswith(b'.') else linea
+                servidor.mensajes.append(datos)
+                self.responder('250 ok')
+            elif verbo == b'QUIT':
+                self.responder('221 adios')
+                return
+            else:
+                self.responder('250 ok')
+
+class ServidorPrueba(socketserver.ThreadingMixIn, socketserver.TCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+@pytest.fixture
+def servidor():
+    servidor = ServidorPrueba(('127.0.0.1', 0), ManejadorPrueba)
+    servidor.conexiones = 0
+    servidor.mail = []
+    servidor.mensajes = []
+    threading.Thread(target=servidor.serve_forever, args=(0.05,), daemon=True).start()
+    yield servidor
+    servidor.shutdown()
+    servidor.server_close()
+
+@pytest.fixture
+def conexion(servidor):
+    conexion = ConexionSMTP('127.0.0.1', servidor.server_address[1], 'usuario', 'clave', timeout=5, starttls=False)
+    conexion.abrir()
+    yield conexion
+    conexion.cerrar()
+
+def test_reutiliza_la_conexion_y_la_renueva_al_llegar_al_maximo(servidor):
+    transporte = TransporteSMTP('127.0.0.1', servidor.server_address[1], 'usuario', 'clave', tamaño=1, max_mensajes=2, starttls=False)
+    for numero in range(3):
+        transporte.enviar('usuario', ['a@example.com'], f'Subject: {numero}\r\n\r\nhola\r\n')
+    transporte.cerrar()
+    assert len(servidor.mensajes) == 3
+    assert servidor.conexiones == 2
+
+MENSAJES = [
+    b'.inicio\r\n..doble\r\nmedio\r\n.',
+    b'x\r\n.\r\n.y\r\n',
+    b'Subject: prueba\r\n\r\n' + b'linea\r\n.punto\r\n' * 300
+]
+
+@pytest.mark.parametrize('mensaje', MENSAJES)
+@pytest.mark.parametrize('bloque', [1, 2, 3, 7, 1024])
+def test_dot_stuffing_en_los_bordes_de_bloque(conexion, servidor, mensaje, bloque):
+    conexion.enviar_archivo('usuario', ['a@example.com'], io.BytesIO(mensaje), len(mensaje), bloque)
+    esperado = mensaje if mensaje.endswith(b'\r\n') else mensaje + b'\r\n'
+    assert servidor.mensajes[-1] == esperado
+    assert f'size={len(mensaje)}'.encode() in servidor.mail[-1]
+
+def test_destinatarios_rechazados(conexion):
+    with pytest.raises(smtplib.SMTPRecipientsRefused):
+        conexion.enviar_archivo('usuario', ['rechazado@example.com'], io.BytesIO(b'a\r\n'))
+    assert conexion.enviar_archivo('usuario', ['rechazado@example.com', 'b@example.com'], io.BytesIO(b'a\r\n')) == {'rechazado@example.com': (550, b'no existe')}
+
+def test_rechazo_del_servidor_no_reconecta_ni_reenvia(servidor):
+    transporte = TransporteSMTP('127.0.0.1', servidor.server_address[1], 'usuario', 'clave', starttls=False)
+    archivo = io.BytesIO(b'Subject: prueba\r\n\r\nhola\r\n')
+    with pytest.raises(smtplib.SMTPRecipientsRefused):
+        transporte.enviar_archivo('usuario', ['rechazado@example.com'], archivo)
+    assert servidor.conexiones == 1 and len(servidor.mail) == 1
+    transporte.enviar_archivo('usuario', ['a@example.com'], archivo)
+    assert servidor.mensajes == [b'Subject: prueba\r\n\r\nhola\r\n']
+    transporte.cerrar()
+
+def test_error_conexion():
+    assert error_conexion(smtplib.SMTPServerDisconnected())
+    assert error_conexion(ConnectionResetError())
+    assert not error_conexion(smtplib.SMTPRecipientsRefused({}))
+    assert not error_conexion(smtplib.SMTPDataError(552, b'demasiado grande'))
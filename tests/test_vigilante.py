@@ -0,0 +1,48 @@
+import os
+from modules.vigilante.main import Vigilante, firma_carpeta
+
+def test_firma_ignora_archivos_del_sistema(tmp_path):
+    (tmp_path / 'a.pdf').write_bytes(b'%PDF')
+    (tmp_path / 'desktop.ini').write_bytes(b'')
+    assert [nombre for nombre, _, _ in firma_carpeta(str(tmp_path))] == ['a.pdf']
+    assert firma_carpeta(str(tmp_path / 'no existe')) == ()
+
+def test_entrega_la_carpeta_cuando_deja_de_cambiar(tmp_path):
+    carpeta = tmp_path / 'FULL SET A'
+    carpeta.mkdir()
+    (tmp_path / 'En Proceso').mkdir()
+    (carpeta / 'a.pdf').write_bytes(b'%PDF-1')
+    vigilante = Vigilante(str(tmp_path), silencio=60, modo='poll')
+
+    assert vigilante.revisar(ahora=0) == []
+    assert vigilante.revisar(ahora=30) == []
+    (carpeta / 'b.xls').write_bytes(b'todavia llegando')
+    assert vigilante.revisar(ahora=70) == []
+    assert vigilante.revisar(ahora=120) == []
+    assert vigilante.revisar(ahora=130) == ['FULL SET A']
+    vigilante.cerrar()
+
+def test_olvida_las_carpetas_que_desaparecen(tmp_path):
+    carpeta = tmp_path / 'FULL SET A'
+    carpeta.mkdir()
+    (carpeta / 'a.pdf').write_bytes(b'%PDF-1')
+    vigilante = Vigilante(str(tmp_path), silencio=60, modo='poll')
+    vigilante.revisar(ahora=0)
+    os.rename(carpeta, tmp_path / 'En Proceso')
+
+    assert vigilante.revisar(ahora=100) == []
+    assert vigilante.vistas == {}
+    vigilante.cerrar()
+
+def test_entrega_las_carpetas_vacias_tras_el_silencio(tmp_path):
+    (tmp_path / 'FULL SET VACIO').mkdir()
+    vigilante = Vigilante(str(tmp_path), silencio=60, modo='poll')
+
+    assert vigilante.revisar(ahora=0) == []
+    assert vigilante.revisar(ahora=60) == ['FULL SET VACIO']
+    vigilante.cerrar()
+
+def test_lotes_entrega_un_lote_vacio_para_reintentar(tmp_path):
+    vigilante = Vigilante(str(tmp_path), silencio=60, intervalo=0.05, modo='poll', reintento=0.2)
+    assert next(vigilante.lotes()) == []
+    vigilante.cerrar()